@@ -3,7 +3,10 @@ API模塊 - 提供對外接口
 """
 from .logger import setup_project_logger  # 導入日誌設置函數
 from .progress_manager import ProgressManager  # 導入進度管理器
-from .config import Config, MinerUConfig, TranslatorConfig, DocumentProcessorConfig, EmbeddingServiceConfig, ChromaDBConfig, RAGConfig, MarkdownReconstructorConfig  # 導入配置管理
+from .job_scheduler import JobScheduler  # 導入工作排程器
+from .document_registry import DocumentRegistry  # 導入文件登錄表
+from .document_state import DocumentStateIndex  # 導入文件狀態索引
+from .config import Config, MinerUConfig, TranslatorConfig, DocumentProcessorConfig, EmbeddingServiceConfig, ChromaDBConfig, RAGConfig, MarkdownReconstructorConfig, RateLimitConfig, ConcurrencyConfig, ProviderRouterConfig, SchedulerConfig, DocumentRegistryConfig, DocumentStateConfig  # 導入配置管理
 
 __all__ = [
     "Config",
@@ -14,7 +17,16 @@ __all__ = [
     "ChromaDBConfig",
     "RAGConfig",
     "MarkdownReconstructorConfig",
+    "RateLimitConfig",
+    "ConcurrencyConfig",
+    "ProviderRouterConfig",
+    "SchedulerConfig",
+    "DocumentRegistryConfig",
+    "DocumentStateConfig",
     
     "setup_project_logger",
-    "ProgressManager"
+    "ProgressManager",
+    "JobScheduler",
+    "DocumentRegistry",
+    "DocumentStateIndex"
 ]
\ No newline at end of file
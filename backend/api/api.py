@@ -1,6 +1,6 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from threading import Lock, Thread
+from threading import Lock
 import os
 import json
 
@@ -36,6 +36,7 @@ from backend.api.pdf_helper import PDFHelper
 from backend.api import Config, MinerUConfig, TranslatorConfig, EmbeddingServiceConfig, RAGConfig
 
 from backend.api import ProgressManager  # 導入進度管理器
+from backend.api import JobScheduler  # 導入工作排程器
 
 app = Flask(__name__)
 CORS(app)
@@ -46,6 +47,7 @@ current_progress = {
     "progress": float(0),
     "stage": "idle",  # 初始階段為 idle
     "message": "",
+    "eta_seconds": None,  # 目前階段預估剩餘秒數
     "error": None,
     "result": None
 }
@@ -65,7 +67,16 @@ pdf_helper = PDFHelper(
 
 # 初始化進度管理器 （單例模式，不需要保存實例引用）
 progress_lock = Lock()
-ProgressManager(current_progress, progress_lock)
+ProgressManager(current_progress, progress_lock, max_finished_jobs=pdf_helper.config.scheduler_config.max_finished_jobs)
+
+# 工作排程器 - 各處理階段使用獨立工作池
+job_scheduler = JobScheduler(
+    pipeline=pdf_helper,
+    mineru_workers=pdf_helper.config.scheduler_config.mineru_workers,
+    translation_workers=pdf_helper.config.scheduler_config.translation_workers,
+    embedding_workers=pdf_helper.config.scheduler_config.embedding_workers,
+    verbose=pdf_helper.config.scheduler_config.verbose
+)
 
 # ==================== API 端點 ====================
 
@@ -77,30 +88,41 @@ def get_progress_endpoint():
 
 @app.route('/api/full-process-async', methods=['POST'])
 def full_process_async_endpoint():
-    """非同步處理 PDF 到 RAG 的完整流程"""
-    allow = ProgressManager.progress_start()
-    if not allow:
-        logger.warning("[WARNING] Full Process 目前已有任務在處理中")
-        return jsonify({"success": False, "message": "已有任務在處理中，請稍後再試"}), 429  # Too Many Requests
-
+    """非同步處理 PDF 到 RAG 的完整流程 (提交至工作排程器)"""
     data = request.json
     pdf_name = data.get('pdf_name')
     method = data.get('method')
     lang = data.get('lang')
     logger.info(f"[full_process_async_endpoint] 收到請求: pdf_name={pdf_name}, method={method}, lang={lang}")
+
+    if not pdf_name:
+        return jsonify({"success": False, "message": "缺少 pdf_name 參數"}), 400
     logger.debug(json.dumps(pdf_helper.get_system_health().data, indent=2, ensure_ascii=False, sort_keys=True))  # 預先檢查系統健康狀態
 
-    # 在這裡啟動一個新線程來處理請求
-    Thread(
-        target=pdf_helper.from_pdf_to_rag,
-        args=(
-            pdf_name,
-            method,
-            lang
-        ),
-        daemon=True
-    ).start()
-    return jsonify({"success": True, "message": "任務已受理，正在處理中"})
+    job_id = job_scheduler.submit(pdf_name, method, lang)
+    if job_id is None:
+        return jsonify({"success": False, "message": "ProgressManager 未初始化"}), 500
+    return jsonify({"success": True, "message": "任務已受理，正在排隊處理", "data": {"job_id": job_id}})
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs_endpoint():
+    """列出所有工作的進度及各階段工作池狀態"""
+    return jsonify({
+        "success": True,
+        "message": "工作列表獲取完成",
+        "data": {
+            "jobs": ProgressManager.list_jobs(),
+            "scheduler": job_scheduler.get_status()
+        }
+    })
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_endpoint(job_id: str):
+    """獲取單一工作的進度"""
+    job = ProgressManager.get_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": f"找不到工作: {job_id}"}), 404
+    return jsonify({"success": True, "message": "工作進度獲取完成", "data": job})
 
 @app.route('/api/process-pdf', methods=['POST'])
 def process_pdf_endpoint():
@@ -261,6 +283,7 @@ def system_health_endpoint():
     """獲取系統健康狀態"""
     try:
         result = pdf_helper.get_system_health()
+        result.data["scheduler"] = job_scheduler.get_status()
         
         return jsonify({
             'success': result.success,
@@ -292,6 +315,71 @@ def update_api_key_endpoint():
     except Exception as e:
         return jsonify({"success": False, "message": f"錯誤: {str(e)}"}), 500
 
+@app.route('/api/update-llm-routing', methods=['POST'])
+def update_llm_routing_endpoint():
+    """設定服務使用的多個LLM服務提供者 (對沖請求及失敗切換)"""
+    try:
+        data = request.json
+        service = data.get('service')
+        providers = data.get('providers')
+
+        if not service or not isinstance(providers, list) or not providers:
+            return jsonify({"success": False, "message": "缺少 service 或 providers 參數"}), 400
+        if any(not entry.get('provider') or not entry.get('model_name') for entry in providers):
+            return jsonify({"success": False, "message": "每個提供者皆需包含 provider 及 model_name"}), 400
+
+        result = pdf_helper.update_llm_routing(service, providers)
+
+        return jsonify({
+            'success': result.success,
+            'message': result.message,
+            'data': result.data
+        })
+    except Exception as e:
+        return jsonify({"success": False, "message": f"錯誤: {str(e)}"}), 500
+
+@app.route('/api/request-translation-pages', methods=['POST'])
+def request_translation_pages_endpoint():
+    """閱讀介面請求優先翻譯的頁面"""
+    try:
+        data = request.json
+        file_name = data.get('file_name')
+        pages = data.get('pages')
+        if pages is None and data.get('page_start') is not None:
+            pages = list(range(int(data.get('page_start')), int(data.get('page_end', data.get('page_start'))) + 1))
+
+        if not file_name or not isinstance(pages, list) or not pages:
+            return jsonify({"success": False, "message": "缺少 file_name 或 pages (或 page_start、page_end) 參數"}), 400
+
+        result = pdf_helper.request_translation_pages(file_name, pages)
+
+        return jsonify({
+            'success': result.success,
+            'message': result.message,
+            'data': result.data
+        })
+    except Exception as e:
+        return jsonify({"success": False, "message": f"錯誤: {str(e)}"}), 500
+
+@app.route('/api/translation-page-status', methods=['GET'])
+def translation_page_status_endpoint():
+    """獲取文件各頁面的翻譯狀態"""
+    try:
+        file_name = request.args.get('file_name')
+
+        if not file_name:
+            return jsonify({"success": False, "message": "缺少 file_name 參數"}), 400
+
+        result = pdf_helper.get_translation_page_status(file_name)
+
+        return jsonify({
+            'success': result.success,
+            'message': result.message,
+            'data': result.data
+        })
+    except Exception as e:
+        return jsonify({"success": False, "message": f"錯誤: {str(e)}"}), 500
+
 @app.route('/api/remove-file', methods=['POST'])
 def remove_file_endpoint():
     """從系統中移除檔案及其相關資料"""
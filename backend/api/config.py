@@ -2,8 +2,8 @@
 PDFHelper Config 模塊 - 統一管理PDFHelper的設定選項。
 """
 import os
-from typing import List
-from dataclasses import dataclass
+from typing import List, Dict, Optional
+from dataclasses import dataclass, field
 import json
 
 from pathlib import Path
@@ -29,9 +29,25 @@ class MinerUConfig:
 
     Args:
         output_dirname (str): 輸出文件目錄名稱
+        worker_mode (bool): 是否使用常駐工作程序處理PDF (模型保持載入，失敗時改用命令列)
+        num_workers (int): 常駐工作程序數量 (每個工作程序各自載入一份模型)
+        shard_pages (int): 分段處理時每段的頁數 (0 表示不分段；頁數較多的PDF拆分後平行處理)
+        shard_workers (int): 分段處理時平行處理的段數 (每段各需一份模型，請依CPU核心數及記憶體調整)
+        preflight (bool): 是否在處理前抽樣分析PDF文字層，自動選擇 txt 或 ocr (原生數位PDF略過OCR模型)
+        preflight_methods (List[str]): 可由預檢分析結果取代的請求解析方法
+        preflight_sample_pages (int): 預檢分析抽樣的頁數
+        link_mode (str): 建立短檔名PDF副本的方式 (auto 依序嘗試硬連結、reflink、符號連結，皆不支援時完整複製)
         verbose (bool): 是否啟用詳細日誌
     """
     output_dirname: str = "mineru_outputs"
+    worker_mode: bool = True
+    num_workers: int = 1
+    shard_pages: int = 0
+    shard_workers: int = 2
+    preflight: bool = True
+    preflight_methods: List[str] = field(default_factory=lambda: ["auto", "ocr"])
+    preflight_sample_pages: int = 8
+    link_mode: str = "auto"
     verbose: bool = False
 
 @dataclass
@@ -40,8 +56,40 @@ class TranslatorConfig:
     翻譯器設定
     
     Args:
+        max_workers (Dict[str, int]): 各服務提供者的並行翻譯數量 (1 表示使用多輪對話逐段翻譯)
+        batch_token_budget (Dict[str, int]): 各服務提供者每次請求合併翻譯的段落Token上限 (0 表示不合併)
+        batch_max_items (int): 每次請求合併翻譯的段落數量上限
+        history_window (Optional[int]): 多輪對話翻譯時保留的最近輪數 (None 表示保留全部對話紀錄)
+        pinned_turns (int): 多輪對話翻譯時固定保留的最初輪數 (通常為建立術語的標題與摘要)
+        translation_memory (bool): 是否使用翻譯記憶庫 (相同段落不再重複請求LLM服務)
+        translation_memory_max_entries (int): 翻譯記憶庫保存的譯文數量上限
+        content_filter (bool): 是否在翻譯前過濾不需翻譯的段落 (純公式、數字殘留、網址、DOI、頁碼、已是目標語言的文字)，直接沿用原文
+        reference_fast_path (bool): 是否在本地解析參考文獻條目，僅將標題合併為少數幾次請求翻譯 (無法解析的條目仍完整翻譯)
+        reference_batch_size (int): 每次請求批次翻譯的參考文獻標題數量上限
+        glossary (bool): 是否在翻譯前建立文件術語表 (擷取標題、摘要、章節標題及高頻詞組並翻譯一次)，以附帶術語表的獨立請求並行翻譯，取代多輪對話逐段翻譯
+        glossary_max_terms (int): 術語表的術語數量上限
+        glossary_min_frequency (int): 正文詞組列入術語表至少需要的出現次數
+        journal_fsync_batch (int): 翻譯進度日誌累積多少筆紀錄後寫入磁碟 (每個段落完成後皆附加紀錄)
+        journal_fsync_interval (float): 翻譯進度日誌距上次寫入磁碟超過多少秒後寫入磁碟
+        journal_compact_threshold (int): 翻譯進度日誌超過多少筆紀錄後合併回基底快照 (0 表示只在翻譯結束時合併)
         verbose (bool): 是否啟用詳細日誌
     """
+    max_workers: Dict[str, int] = field(default_factory=lambda: {"ollama": 1, "google": 8, "openai": 8})
+    batch_token_budget: Dict[str, int] = field(default_factory=lambda: {"ollama": 0, "google": 2000, "openai": 2000})
+    batch_max_items: int = 20
+    history_window: Optional[int] = 6
+    pinned_turns: int = 2
+    translation_memory: bool = True
+    translation_memory_max_entries: int = 100000
+    content_filter: bool = True
+    reference_fast_path: bool = True
+    reference_batch_size: int = 40
+    glossary: bool = True
+    glossary_max_terms: int = 80
+    glossary_min_frequency: int = 3
+    journal_fsync_batch: int = 20
+    journal_fsync_interval: float = 1.0
+    journal_compact_threshold: int = 500
     verbose: bool = False
 
 @dataclass
@@ -67,10 +115,14 @@ class EmbeddingServiceConfig:
     Args:
         max_retries (int): 最大重試次數
         retry_delay (int): 重試延遲時間（秒）
+        cache (bool): 是否使用Embedding快取 (重新加入文件或重複查詢時不再請求LLM服務)
+        cache_max_entries (int): Embedding快取保存的向量數量上限
         verbose (bool): 是否啟用詳細日誌
     """
     max_retries: int = 3
     retry_delay: int = 1  # 秒
+    cache: bool = True
+    cache_max_entries: int = 200000
     verbose: bool = False
 
 @dataclass
@@ -95,8 +147,126 @@ class RAGConfig:
     RAG 引擎設定
 
     Args:
+        streaming_ingest (bool): 完整流程中是否邊翻譯邊向量化並寫入向量資料庫 (失敗時改為翻譯完成後一次性寫入)
+        stream_batch_size (int): 串流寫入時每批次向量化的片段數量
+        stream_flush_interval (float): 串流寫入時未滿一批的最長等待秒數
         verbose (bool): 是否啟用詳細日誌
     """
+    streaming_ingest: bool = True
+    stream_batch_size: int = 32
+    stream_flush_interval: float = 2.0
+    verbose: bool = False
+
+@dataclass
+class SchedulerConfig:
+    """
+    工作排程器設定
+
+    Args:
+        mineru_workers (int): PDF解析工作池大小 (GPU/CPU密集，建議為1)
+        translation_workers (int): 翻譯工作池大小 (翻譯器共用多輪對話狀態，使用多輪對話時需為1)
+        embedding_workers (int): 向量化工作池大小
+        max_finished_jobs (int): 保留的已結束工作數量上限
+        verbose (bool): 是否啟用詳細日誌
+    """
+    mineru_workers: int = 1
+    translation_workers: int = 1
+    embedding_workers: int = 1
+    max_finished_jobs: int = 200
+    verbose: bool = False
+
+@dataclass
+class RateLimitConfig:
+    """
+    LLM服務速率限制設定 (同一提供者與模型的所有服務共享配額)
+
+    Args:
+        limits (Dict[str, Dict[str, int]]): 各服務提供者的限制，鍵可為 "provider" 或 "provider/model"
+            - requests_per_minute: 每分鐘最大請求數
+            - tokens_per_minute: 每分鐘最大Token數
+    """
+    limits: Dict[str, Dict[str, int]] = field(default_factory=lambda: {
+        "google": {"requests_per_minute": 15, "tokens_per_minute": 250000},
+        "openai": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+    })
+
+@dataclass
+class ConcurrencyConfig:
+    """
+    LLM服務自適應併發控制設定 (AIMD：請求順利時逐步增加同時請求數量，收到429、5xx或逾時時減半)
+
+    Args:
+        enabled (bool): 是否啟用 (停用時並行翻譯使用固定的 max_workers，Embedding批次逐一請求)
+        initial_limit (int): 初始併發上限
+        min_limit (int): 併發上限的最小值
+        max_limit (Dict[str, int]): 各服務提供者的併發上限最大值，鍵可為 "provider"、"provider/model" 或 "default"
+        increase_step (float): 每輪增加的併發數量
+        decrease_factor (float): 壅塞時併發上限的乘數
+        latency_tolerance (float): 延遲超過基準延遲多少倍時停止增加
+        decrease_cooldown (float): 兩次減少之間的最短秒數
+    """
+    enabled: bool = True
+    initial_limit: int = 4
+    min_limit: int = 1
+    max_limit: Dict[str, int] = field(default_factory=lambda: {
+        "ollama": 2,
+        "google": 16,
+        "openai": 32,
+        "default": 8,
+    })
+    increase_step: float = 1.0
+    decrease_factor: float = 0.5
+    latency_tolerance: float = 2.0
+    decrease_cooldown: float = 2.0
+
+@dataclass
+class ProviderRouterConfig:
+    """
+    LLM服務路由設定 (翻譯或RAG服務設定多個提供者時使用)
+
+    Args:
+        hedge_percentile (float): 發送對沖請求前等待的延遲百分位數 (依提供者近期成功請求的延遲計算)
+        hedge_initial_delay (float): 延遲紀錄不足時發送對沖請求前等待的秒數
+        hedge_min_delay (float): 發送對沖請求前等待的最短秒數
+        hedge_max_delay (float): 發送對沖請求前等待的最長秒數
+        failure_threshold (int): 連續失敗多少次後暫停使用該提供者
+        cooldown (float): 暫停使用提供者的秒數
+        verbose (bool): 是否啟用詳細日誌
+    """
+    hedge_percentile: float = 0.9
+    hedge_initial_delay: float = 10.0
+    hedge_min_delay: float = 1.0
+    hedge_max_delay: float = 30.0
+    failure_threshold: int = 3
+    cooldown: float = 60.0
+    verbose: bool = False
+
+@dataclass
+class DocumentRegistryConfig:
+    """
+    文件登錄表設定
+
+    Args:
+        enabled (bool): 是否以PDF內容雜湊值辨識重複上傳的文件 (不同檔名的相同PDF共用處理結果)
+        db_name (str): 資料庫檔案名稱
+        verbose (bool): 是否啟用詳細日誌
+    """
+    enabled: bool = True
+    db_name: str = "document_registry.db"
+    verbose: bool = False
+
+@dataclass
+class DocumentStateConfig:
+    """
+    文件狀態索引設定
+
+    Args:
+        enabled (bool): 是否以SQLite索引記錄文件處理階段 (查詢階段時不需逐一檢查檔案系統及列出所有集合)
+        db_name (str): 資料庫檔案名稱
+        verbose (bool): 是否啟用詳細日誌
+    """
+    enabled: bool = True
+    db_name: str = "document_state.db"
     verbose: bool = False
 
 @dataclass
@@ -106,8 +276,10 @@ class MarkdownReconstructorConfig:
 
     Args:
         instance_path (str): 實例路徑
+        link_mode (str): 圖片放入重組目錄的方式 (auto 依序嘗試硬連結、reflink、符號連結，皆不支援時完整複製)
         verbose (bool): 是否啟用詳細日誌
     """
+    link_mode: str = "auto"
     verbose: bool = False
 
 class Config:
@@ -123,6 +295,12 @@ class Config:
             chromadb_config: ChromaDBConfig = None,
             rag_config: RAGConfig = None,
             markdown_reconstructor_config: MarkdownReconstructorConfig = None,
+            rate_limit_config: RateLimitConfig = None,
+            concurrency_config: ConcurrencyConfig = None,
+            provider_router_config: ProviderRouterConfig = None,
+            scheduler_config: SchedulerConfig = None,
+            document_registry_config: DocumentRegistryConfig = None,
+            document_state_config: DocumentStateConfig = None,
         ):
         """
         初始化配置管理
@@ -135,6 +313,13 @@ class Config:
             embedding_service_config (EmbeddingServiceConfig): Embedding服務設定 (可選)
             chromadb_config (ChromaDBConfig): ChromaDB設定 (可選)
             rag_config (RAGConfig): RAG引擎設定 (可選)
+            markdown_reconstructor_config (MarkdownReconstructorConfig): Markdown重組器設定 (可選)
+            rate_limit_config (RateLimitConfig): LLM服務速率限制設定 (可選)
+            concurrency_config (ConcurrencyConfig): LLM服務自適應併發控制設定 (可選)
+            provider_router_config (ProviderRouterConfig): LLM服務路由設定 (可選)
+            scheduler_config (SchedulerConfig): 工作排程器設定 (可選)
+            document_registry_config (DocumentRegistryConfig): 文件登錄表設定 (可選)
+            document_state_config (DocumentStateConfig): 文件狀態索引設定 (可選)
         """
         # 所有文件統一的儲存路徑
         self.instance_path: str = instance_path or os.path.join(str(find_project_root()), "backend", "instance")
@@ -153,6 +338,18 @@ class Config:
 
         self.markdown_reconstructor_config: MarkdownReconstructorConfig = markdown_reconstructor_config or MarkdownReconstructorConfig()
 
+        self.rate_limit_config: RateLimitConfig = rate_limit_config or RateLimitConfig()
+
+        self.concurrency_config: ConcurrencyConfig = concurrency_config or ConcurrencyConfig()
+
+        self.provider_router_config: ProviderRouterConfig = provider_router_config or ProviderRouterConfig()
+
+        self.scheduler_config: SchedulerConfig = scheduler_config or SchedulerConfig()
+
+        self.document_registry_config: DocumentRegistryConfig = document_registry_config or DocumentRegistryConfig()
+
+        self.document_state_config: DocumentStateConfig = document_state_config or DocumentStateConfig()
+
     def __repr__(self) -> List[str]:
         info = [
             f"Instance Path: {self.instance_path}",
@@ -162,6 +359,12 @@ class Config:
             f"Embedding Service Config: {json.dumps(self.embedding_service_config.__dict__, indent=4)}",
             f"ChromaDB Config: {json.dumps(self.chromadb_config.__dict__, indent=4)}",
             f"RAG Config: {json.dumps(self.rag_config.__dict__, indent=4)}",
-            f"Markdown Reconstructor Config: {json.dumps(self.markdown_reconstructor_config.__dict__, indent=4)}"
+            f"Markdown Reconstructor Config: {json.dumps(self.markdown_reconstructor_config.__dict__, indent=4)}",
+            f"Rate Limit Config: {json.dumps(self.rate_limit_config.__dict__, indent=4)}",
+            f"Concurrency Config: {json.dumps(self.concurrency_config.__dict__, indent=4)}",
+            f"Provider Router Config: {json.dumps(self.provider_router_config.__dict__, indent=4)}",
+            f"Scheduler Config: {json.dumps(self.scheduler_config.__dict__, indent=4)}",
+            f"Document Registry Config: {json.dumps(self.document_registry_config.__dict__, indent=4)}",
+            f"Document State Config: {json.dumps(self.document_state_config.__dict__, indent=4)}"
         ]
         return info
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+文件登錄表 - 以PDF內容的雜湊值識別文件，不同檔名的相同PDF共用同一份處理結果
+"""
+import os
+import time
+import sqlite3
+import hashlib
+from threading import Lock
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+import logging
+from .logger import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+class DocumentRegistry:
+    """
+    ### 文件登錄表
+
+    每份PDF內容 (SHA-256) 對應一個正式名稱 (第一次處理時的檔名)，處理結果 (MinerU輸出、譯文、向量資料庫集合) 皆以正式名稱保存；
+    之後以其他檔名上傳的相同PDF皆登記為別名，解析至同一份處理結果。
+    檔案大小與修改時間未變時沿用已計算的雜湊值，不重新讀取檔案。
+
+    正式名稱必須是內容雜湊值與該文件相同的別名: 正式名稱被移除或以不同內容重新上傳時，
+    由最早登記的其他別名接替 (無其他別名時刪除該文件)，並透過 `on_canonical_change` 通知呼叫端搬移或清除處理結果。
+    """
+    HASH_CHUNK_SIZE = 1024 * 1024  # 串流計算雜湊值時每次讀取的位元組數
+
+    def __init__(self, 
+            instance_path: str, 
+            db_name: str = "document_registry.db", 
+            on_canonical_change: Optional[Callable[[str, Optional[str]], None]] = None,
+            verbose: bool = False
+        ):
+        """
+        初始化文件登錄表
+
+        Args:
+            instance_path: 資料庫存放路徑
+            db_name: 資料庫檔案名稱
+            on_canonical_change: 正式名稱變更時的回呼函數 (舊正式名稱, 新正式名稱)，
+                新正式名稱為 None 表示該內容已無別名，處理結果應刪除
+            verbose: 是否啟用詳細日誌
+        """
+        os.makedirs(instance_path, exist_ok=True)
+        self.db_path = os.path.join(instance_path, db_name)
+        self.on_canonical_change = on_canonical_change
+        self.verbose = verbose
+
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                content_hash TEXT PRIMARY KEY,
+                canonical_name TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS aliases (
+                alias TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                file_mtime REAL NOT NULL,
+                registered_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_aliases_content_hash ON aliases (content_hash)")
+        self._conn.commit()
+
+        if self.verbose:
+            count = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            logger.info(f"文件登錄表初始化完成: {self.db_path} (已登記 {count} 份文件)")
+
+    @classmethod
+    def hash_file(cls, file_path: str) -> str:
+        """
+        串流計算檔案的SHA-256雜湊值 (不將整個檔案載入記憶體)
+
+        Args:
+            file_path: 檔案路徑
+
+        Returns:
+            str: 十六進位雜湊值
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(cls.HASH_CHUNK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def register(self, alias: str, pdf_path: str) -> str:
+        """
+        登記PDF並取得其正式名稱 (內容第一次出現時，以此檔名作為正式名稱)
+
+        Args:
+            alias: 檔案名稱 (不含副檔名)
+            pdf_path: PDF檔案路徑
+
+        Returns:
+            str: 正式名稱 (PDF不存在或無法讀取時返回原檔名)
+        """
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return self.resolve(alias)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, file_size, file_mtime FROM aliases WHERE alias = ?", (alias,)
+            ).fetchone()
+        if row and row[1] == stat.st_size and row[2] == stat.st_mtime:
+            content_hash = row[0]
+        else:
+            try:
+                content_hash = self.hash_file(pdf_path)
+            except OSError as e:
+                logger.error(f"計算檔案雜湊值失敗: {pdf_path}, {e}")
+                return alias
+
+        now = time.time()
+        handover = None  # 以不同內容重新上傳正式名稱時的交接 (舊正式名稱, 新正式名稱)
+        with self._lock:
+            try:
+                previous = self._conn.execute(
+                    "SELECT aliases.content_hash, documents.canonical_name FROM aliases "
+                    "JOIN documents ON aliases.content_hash = documents.content_hash WHERE aliases.alias = ?",
+                    (alias,)
+                ).fetchone()
+                if previous and previous[0] != content_hash and previous[1] == alias:
+                    # 舊內容的處理結果以此檔名保存，改由其他別名接替
+                    handover = (alias, self._reassign_canonical(previous[0], alias))
+
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO documents (content_hash, canonical_name, created_at) VALUES (?, ?, ?)",
+                    (content_hash, alias, now)
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO aliases (alias, content_hash, file_size, file_mtime, registered_at) VALUES (?, ?, ?, ?, "
+                    "COALESCE((SELECT registered_at FROM aliases WHERE alias = ? AND content_hash = ?), ?))",
+                    (alias, content_hash, stat.st_size, stat.st_mtime, alias, content_hash, now)    # 內容未變時保留原登記時間
+                )
+                canonical_name, canonical_hash = self._conn.execute(
+                    "SELECT documents.canonical_name, aliases.content_hash FROM documents "
+                    "LEFT JOIN aliases ON aliases.alias = documents.canonical_name WHERE documents.content_hash = ?",
+                    (content_hash,)
+                ).fetchone()
+                if canonical_hash != content_hash:
+                    # 正式名稱已指向其他內容 (舊版資料)，不可沿用其處理結果
+                    logger.warning(f"正式名稱 {canonical_name} 的內容已變更，改以 {alias} 作為正式名稱")
+                    self._conn.execute(
+                        "UPDATE documents SET canonical_name = ? WHERE content_hash = ?", (alias, content_hash)
+                    )
+                    canonical_name = alias
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"登記文件時出錯: {e}")
+                return alias
+
+        if handover:
+            self._notify_canonical_change(*handover)
+        if canonical_name != alias:
+            logger.info(f"文件內容與已處理的文件相同: {alias} → {canonical_name}")
+        return canonical_name
+
+    def _reassign_canonical(self, content_hash: str, removed_alias: str) -> Optional[str]:
+        """
+        將文件的正式名稱交接給最早登記的其他別名 (無其他別名時刪除該文件，需在持有鎖時呼叫)
+
+        Args:
+            content_hash: 文件內容雜湊值
+            removed_alias: 不再參照此內容的正式名稱
+
+        Returns:
+            str: 新的正式名稱 (無其他別名時返回 None)
+        """
+        row = self._conn.execute(
+            "SELECT alias FROM aliases WHERE content_hash = ? AND alias != ? ORDER BY registered_at, alias LIMIT 1",
+            (content_hash, removed_alias)
+        ).fetchone()
+        if row is None:
+            self._conn.execute("DELETE FROM documents WHERE content_hash = ?", (content_hash,))
+            return None
+        self._conn.execute("UPDATE documents SET canonical_name = ? WHERE content_hash = ?", (row[0], content_hash))
+        return row[0]
+
+    def _notify_canonical_change(self, old_name: str, new_name: Optional[str]):
+        """通知呼叫端正式名稱已變更 (於釋放鎖後呼叫)"""
+        if new_name:
+            logger.info(f"正式名稱變更: {old_name} → {new_name}")
+        else:
+            logger.info(f"文件已無別名參照: {old_name}")
+        if self.on_canonical_change is None:
+            return
+        try:
+            self.on_canonical_change(old_name, new_name)
+        except Exception as e:
+            logger.error(f"處理正式名稱變更時出錯: {old_name} → {new_name}, {e}")
+
+    def resolve(self, alias: str) -> str:
+        """
+        取得檔名對應的正式名稱
+
+        Args:
+            alias: 檔案名稱 (不含副檔名)
+
+        Returns:
+            str: 正式名稱 (未登記時返回原檔名)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT documents.canonical_name FROM aliases "
+                "JOIN documents ON aliases.content_hash = documents.content_hash WHERE aliases.alias = ?",
+                (alias,)
+            ).fetchone()
+        return row[0] if row else alias
+
+    def get_content_hash(self, alias: str) -> Optional[str]:
+        """
+        取得檔名對應的PDF內容雜湊值
+
+        Args:
+            alias: 檔案名稱 (不含副檔名)
+
+        Returns:
+            str: 內容雜湊值 (未登記時返回 None)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash FROM aliases WHERE alias = ?", (alias,)).fetchone()
+        return row[0] if row else None
+
+    def unregister(self, alias: str) -> Tuple[str, List[str]]:
+        """
+        移除別名 (移除的是正式名稱且仍有其他別名時，由最早登記的別名接替為正式名稱)
+
+        Args:
+            alias: 檔案名稱 (不含副檔名)
+
+        Returns:
+            Tuple(canonical_name, remaining_aliases): 移除前的正式名稱及仍參照同一內容的其他別名 (依登記時間排序)
+                (remaining_aliases 為空時表示處理結果已無人使用，可以刪除)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT aliases.content_hash, documents.canonical_name FROM aliases "
+                "JOIN documents ON aliases.content_hash = documents.content_hash WHERE aliases.alias = ?",
+                (alias,)
+            ).fetchone()
+            if row is None:
+                return alias, []
+
+            content_hash, canonical_name = row
+            self._conn.execute("DELETE FROM aliases WHERE alias = ?", (alias,))
+            remaining = [
+                name for (name,) in self._conn.execute(
+                    "SELECT alias FROM aliases WHERE content_hash = ? ORDER BY registered_at, alias", (content_hash,)
+                ).fetchall()
+            ]
+            handover = None
+            if not remaining:
+                self._conn.execute("DELETE FROM documents WHERE content_hash = ?", (content_hash,))
+            elif canonical_name == alias:
+                handover = (alias, self._reassign_canonical(content_hash, alias))
+            self._conn.commit()
+
+        if handover:
+            self._notify_canonical_change(*handover)
+        return canonical_name, remaining
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        獲取文件登錄表統計資料
+
+        Returns:
+            Dict: 文件數量及別名數量
+        """
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            aliases = self._conn.execute("SELECT COUNT(*) FROM aliases").fetchone()[0]
+        return {
+            "documents": documents,
+            "aliases": aliases,
+            "db_path": self.db_path
+        }
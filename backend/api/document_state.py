@@ -0,0 +1,202 @@
+"""
+文件狀態索引 - 以SQLite記錄各文件的處理階段、產出路徑、內容雜湊值、使用的模型及各階段耗時，
+查詢處理階段時不需逐一檢查檔案系統及列出所有向量資料庫集合
+"""
+import os
+import json
+import time
+import sqlite3
+from threading import Lock
+from typing import Optional, Dict, Any, List, Iterable
+
+import logging
+from .logger import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+class DocumentStateIndex:
+    """
+    ### 文件狀態索引
+
+    以 (文件名稱, 解析方法) 為鍵保存處理階段及相關資料，每次更新皆為單一交易。
+    索引內容可由 `backend.api.reconcile` 命令依檔案系統及向量資料庫重新建立。
+    """
+    FIELDS = (
+        "stage", "stage_data", "pdf_path", "mineru_path", "translated_path", "collection_name",
+        "content_hash", "parse_method", "llm_model", "embedding_model"
+    )
+
+    def __init__(self, instance_path: str, db_name: str = "document_state.db", verbose: bool = False):
+        """
+        初始化文件狀態索引
+
+        Args:
+            instance_path: 資料庫存放路徑
+            db_name: 資料庫檔案名稱
+            verbose: 是否啟用詳細日誌
+        """
+        os.makedirs(instance_path, exist_ok=True)
+        self.db_path = os.path.join(instance_path, db_name)
+        self.verbose = verbose
+
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS document_states (
+                name TEXT NOT NULL,
+                method TEXT NOT NULL,
+                stage INTEGER NOT NULL,
+                stage_data TEXT,
+                pdf_path TEXT,
+                mineru_path TEXT,
+                translated_path TEXT,
+                collection_name TEXT,
+                content_hash TEXT,
+                parse_method TEXT,
+                llm_model TEXT,
+                embedding_model TEXT,
+                timings TEXT NOT NULL DEFAULT '{}',
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (name, method)
+            )
+        """)
+        self._conn.commit()
+
+        if self.verbose:
+            count = self._conn.execute("SELECT COUNT(*) FROM document_states").fetchone()[0]
+            logger.info(f"文件狀態索引初始化完成: {self.db_path} (已記錄 {count} 筆狀態)")
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """將資料列轉為字典 (解析耗時紀錄)"""
+        record = dict(row)
+        record["timings"] = json.loads(record.get("timings") or "{}")
+        return record
+
+    def get(self, name: str, method: str) -> Optional[Dict[str, Any]]:
+        """
+        查詢文件狀態
+
+        Args:
+            name: 文件名稱 (處理用的檔名，不含副檔名)
+            method: 解析方法
+
+        Returns:
+            Dict ([str, Any]): 文件狀態 (未記錄時返回 None)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM document_states WHERE name = ? AND method = ?", (name, method)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def update(self, 
+            name: str, 
+            method: str, 
+            stage: int, 
+            timings: Optional[Dict[str, float]] = None, 
+            clear: Iterable[str] = (),
+            **fields
+        ):
+        """
+        更新文件狀態 (值為 None 或未提供的欄位保留原值，耗時紀錄合併)
+
+        Args:
+            name: 文件名稱
+            method: 解析方法
+            stage: 處理階段 (ProgressStage枚舉值)
+            timings: 本次更新的階段耗時 (秒)，例如 {"translation": 120.5}
+            clear: 要清除 (設為 NULL) 的欄位，例如退回較早階段時清除 ["collection_name"]
+            **fields: 其他欄位 (stage_data, pdf_path, mineru_path, translated_path, collection_name,
+                content_hash, parse_method, llm_model, embedding_model)
+        """
+        clear = set(clear)
+        unknown = (set(fields) | clear) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"未知的文件狀態欄位: {', '.join(sorted(unknown))}")
+
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM document_states WHERE name = ? AND method = ?", (name, method)
+                ).fetchone()
+                record = self._row_to_dict(row) if row else {"timings": {}}
+                record.update({key: None for key in clear})
+                record.update({key: value for key, value in fields.items() if value is not None})
+                record["stage"] = stage
+                record["timings"].update({key: round(value, 3) for key, value in (timings or {}).items()})
+
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO document_states (name, method, {', '.join(self.FIELDS)}, timings, updated_at) "
+                    f"VALUES (?, ?, {', '.join('?' * len(self.FIELDS))}, ?, ?)",
+                    (name, method, *[record.get(key) for key in self.FIELDS], json.dumps(record["timings"]), time.time())
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"更新文件狀態時出錯: {e}")
+
+    def remove(self, name: str):
+        """
+        移除文件的所有狀態紀錄
+
+        Args:
+            name: 文件名稱
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM document_states WHERE name = ?", (name,))
+            self._conn.commit()
+
+    def replace_all(self, records: List[Dict[str, Any]]):
+        """
+        以新的紀錄取代整個索引 (單一交易，重新建立索引時使用)
+
+        Args:
+            records: 文件狀態列表 (需包含 name, method, stage)
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM document_states")
+                self._conn.executemany(
+                    f"INSERT INTO document_states (name, method, {', '.join(self.FIELDS)}, timings, updated_at) "
+                    f"VALUES (?, ?, {', '.join('?' * len(self.FIELDS))}, ?, ?)",
+                    [
+                        (record["name"], record["method"], *[record.get(key) for key in self.FIELDS],
+                         json.dumps(record.get("timings") or {}), now)
+                        for record in records
+                    ]
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"重新建立文件狀態索引時出錯: {e}")
+                raise
+
+    def list_states(self) -> List[Dict[str, Any]]:
+        """
+        列出所有文件狀態
+
+        Returns:
+            List[Dict]: 文件狀態列表
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM document_states ORDER BY name, method").fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        獲取文件狀態索引統計資料
+
+        Returns:
+            Dict: 紀錄數量及各處理階段的文件數量
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, COUNT(*) FROM document_states GROUP BY stage").fetchall()
+        return {
+            "records": sum(count for _, count in rows),
+            "stages": {str(stage): count for stage, count in rows},
+            "db_path": self.db_path
+        }
@@ -0,0 +1,152 @@
+"""
+工作排程模組
+將完整處理流程 (PDF解析 → 翻譯 → 向量化) 拆分為各階段的工作池，讓不同文件可同時位於不同階段
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, Any, Optional, Tuple
+
+from .progress_manager import ProgressManager
+
+import logging
+from .logger import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+class JobScheduler:
+    """
+    ### 多工作排程器
+
+    每份提交的文件會取得一個工作ID，依序經過各階段的工作池：
+    - mineru: PDF解析 (GPU/CPU密集)
+    - translation: JSON翻譯 (網路密集)
+    - embedding: 向量化並加入RAG (網路密集)
+
+    流程物件 (pipeline) 需提供 `prepare_pipeline(pdf_name, method, lang)` 及
+    `run_pipeline_stage(stage, context)`，後者返回 None 表示進入下一階段，否則為最終結果。
+    """
+    STAGES: Tuple[str, ...] = ("mineru", "translation", "embedding")
+    STAGE_LABELS = {
+        "mineru": "PDF解析",
+        "translation": "翻譯",
+        "embedding": "向量化"
+    }
+
+    def __init__(self,
+            pipeline: Any,
+            mineru_workers: int = 1,
+            translation_workers: int = 1,
+            embedding_workers: int = 1,
+            verbose: bool = False
+        ):
+        """
+        初始化工作排程器
+
+        Args:
+            pipeline: 提供各處理階段的流程物件 (通常為 PDFHelper)
+            mineru_workers: PDF解析工作池大小
+            translation_workers: 翻譯工作池大小
+            embedding_workers: 向量化工作池大小
+            verbose: 是否啟用詳細日誌
+        """
+        self.pipeline = pipeline
+        self.verbose = verbose
+
+        worker_counts = {
+            "mineru": mineru_workers,
+            "translation": translation_workers,
+            "embedding": embedding_workers
+        }
+        self._executors: Dict[str, ThreadPoolExecutor] = {
+            stage: ThreadPoolExecutor(max_workers=max(count, 1), thread_name_prefix=f"job-{stage}")
+            for stage, count in worker_counts.items()
+        }
+        self._worker_counts = {stage: max(count, 1) for stage, count in worker_counts.items()}
+
+        # 各階段的排隊與執行中數量
+        self._counter_lock = Lock()
+        self._queued = {stage: 0 for stage in self.STAGES}
+        self._active = {stage: 0 for stage in self.STAGES}
+
+        if self.verbose:
+            logger.info(f"工作排程器初始化完成，工作池大小: {self._worker_counts}")
+
+    def submit(self, pdf_name: str, method: str, lang: str) -> Optional[str]:
+        """
+        提交一份文件的完整處理工作
+
+        Args:
+            pdf_name: PDF檔案名稱
+            method: 解析方法 (auto/txt/ocr)
+            lang: 語言設定
+
+        Returns:
+            str: 工作ID (ProgressManager未初始化時返回None)
+        """
+        job_id = ProgressManager.create_job({"pdf_name": pdf_name, "method": method, "lang": lang})
+        if job_id is None:
+            return None
+
+        context = {"pdf_name": pdf_name, "method": method, "lang": lang}
+        self._enqueue(job_id, self.STAGES[0], context)
+        logger.info(f"[JobScheduler] 已受理工作 {job_id}: {pdf_name}")
+        return job_id
+
+    def _enqueue(self, job_id: str, stage: str, context: Dict[str, Any]):
+        """將工作放入指定階段的工作池"""
+        with self._counter_lock:
+            self._queued[stage] += 1
+        ProgressManager.set_job_status(job_id, "waiting" if stage != self.STAGES[0] else "queued", stage, f"排隊中: 等待{self.STAGE_LABELS[stage]}")
+        self._executors[stage].submit(self._run_stage, job_id, stage, context)
+
+    def _run_stage(self, job_id: str, stage: str, context: Dict[str, Any]):
+        """在工作池中執行單一階段，完成後交給下一階段"""
+        with self._counter_lock:
+            self._queued[stage] -= 1
+            self._active[stage] += 1
+
+        ProgressManager.bind_job(job_id)
+        ProgressManager.set_job_status(job_id, "running", stage)
+        next_stage = None
+        try:
+            if stage == self.STAGES[0]:
+                context.update(self.pipeline.prepare_pipeline(context["pdf_name"], context["method"], context["lang"]))
+
+            result = self.pipeline.run_pipeline_stage(stage, context)
+            if result is None:
+                next_stage = self.STAGES[self.STAGES.index(stage) + 1]
+            elif self.verbose:
+                logger.info(f"[JobScheduler] 工作 {job_id} 結束於 {stage} 階段: {result.message}")
+        except Exception as e:
+            logger.error(f"[JobScheduler] 工作 {job_id} 在 {stage} 階段發生錯誤: {e}")
+            ProgressManager.progress_fail(f"{self.STAGE_LABELS[stage]}階段發生錯誤: {e}")
+        finally:
+            ProgressManager.bind_job(None)
+            with self._counter_lock:
+                self._active[stage] -= 1
+
+        if next_stage is not None:
+            self._enqueue(job_id, next_stage, context)
+
+    def get_status(self) -> Dict[str, Dict[str, int]]:
+        """
+        獲取各階段工作池狀態
+
+        Returns:
+            Dict: {stage: {"workers": 工作池大小, "queued": 排隊數量, "active": 執行中數量}}
+        """
+        with self._counter_lock:
+            return {
+                stage: {
+                    "workers": self._worker_counts[stage],
+                    "queued": self._queued[stage],
+                    "active": self._active[stage]
+                }
+                for stage in self.STAGES
+            }
+
+    def shutdown(self, wait: bool = True):
+        """關閉所有工作池"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
@@ -1,7 +1,7 @@
 """
 PDFHelper API 模塊 - 統一導出所有Service功能和設定，提供簡潔的接口給外部使用。
 """
-from typing import Literal, Dict, Any, Optional
+from typing import Literal, Dict, Any, Optional, Callable, Set, Tuple, List
 from enum import Enum, auto
 import time
 import os
@@ -11,11 +11,13 @@ import json
 
 import backend.services.llm_service as llm_services  # 導入所有LLM服務
 from backend.services.pdf_service import MinerUProcessor, MarkdownReconstructor  # 導入PDF處理器和Markdown重建器
-from backend.services.translation_service import Translator  # 導入翻譯器
-from backend.services.rag_service import DocumentProcessor, EmbeddingService, ChromaVectorStore, RAGEngine  # 導入RAG引擎相關模塊
+from backend.services.translation_service import Translator, TranslationMemory, ContentFilter, ReferenceParser, GlossaryExtractor  # 導入翻譯器、翻譯記憶庫、翻譯前內容過濾器、參考文獻解析器及候選術語擷取器
+from backend.services.rag_service import DocumentProcessor, EmbeddingCache, EmbeddingService, ChromaVectorStore, RAGEngine  # 導入RAG引擎相關模塊
 
 from backend.api.config import Config # 導入配置管理
 from backend.api import ProgressManager # 導入進度管理器
+from backend.api import DocumentRegistry # 導入文件登錄表
+from backend.api import DocumentStateIndex # 導入文件狀態索引
 
 import logging
 from backend.api.logger import setup_project_logger  # 導入日誌設置函數
@@ -60,17 +62,68 @@ class PDFHelper:
         if self.verbose:
             logger.info(f"instance_path 已確認: {self.config.instance_path}")
 
+        # 設定所有LLM服務共享的速率限制
+        llm_services.RateLimiterRegistry.configure(self.config.rate_limit_config.limits)
+
+        # 設定所有LLM服務共享的自適應併發控制
+        concurrency_config = self.config.concurrency_config
+        llm_services.ConcurrencyControllerRegistry.configure(
+            settings={
+                "enabled": concurrency_config.enabled,
+                "initial_limit": concurrency_config.initial_limit,
+                "min_limit": concurrency_config.min_limit,
+                "increase_step": concurrency_config.increase_step,
+                "decrease_factor": concurrency_config.decrease_factor,
+                "latency_tolerance": concurrency_config.latency_tolerance,
+                "decrease_cooldown": concurrency_config.decrease_cooldown
+            },
+            max_limits=concurrency_config.max_limit
+        )
+
         self.pdf_processor = MinerUProcessor(
             instance_path=self.config.instance_path,
             output_dirname=self.config.mineru_config.output_dirname,
+            worker_mode=self.config.mineru_config.worker_mode,
+            num_workers=self.config.mineru_config.num_workers,
+            shard_pages=self.config.mineru_config.shard_pages,
+            shard_workers=self.config.mineru_config.shard_workers,
+            preflight=self.config.mineru_config.preflight,
+            preflight_methods=self.config.mineru_config.preflight_methods,
+            preflight_sample_pages=self.config.mineru_config.preflight_sample_pages,
+            link_mode=self.config.mineru_config.link_mode,
             verbose=self.config.mineru_config.verbose
         )
         if self.verbose:
             logger.info("PDF處理器初始化完成")
 
+        translation_memory = None
+        if self.config.translator_config.translation_memory:
+            translation_memory = TranslationMemory(
+                instance_path=self.config.instance_path,
+                max_entries=self.config.translator_config.translation_memory_max_entries,
+                verbose=self.config.translator_config.verbose
+            )
+
         self.translator = Translator(
             instance_path=self.config.instance_path, 
             llm_service_obj=None,
+            max_workers=self.config.translator_config.max_workers,
+            batch_token_budget=self.config.translator_config.batch_token_budget,
+            batch_max_items=self.config.translator_config.batch_max_items,
+            history_window=self.config.translator_config.history_window,
+            pinned_turns=self.config.translator_config.pinned_turns,
+            translation_memory=translation_memory,
+            content_filter=ContentFilter(verbose=self.config.translator_config.verbose) if self.config.translator_config.content_filter else None,
+            reference_parser=ReferenceParser(verbose=self.config.translator_config.verbose) if self.config.translator_config.reference_fast_path else None,
+            reference_batch_size=self.config.translator_config.reference_batch_size,
+            glossary_extractor=GlossaryExtractor(
+                max_terms=self.config.translator_config.glossary_max_terms,
+                min_frequency=self.config.translator_config.glossary_min_frequency,
+                verbose=self.config.translator_config.verbose
+            ) if self.config.translator_config.glossary else None,
+            journal_fsync_batch=self.config.translator_config.journal_fsync_batch,
+            journal_fsync_interval=self.config.translator_config.journal_fsync_interval,
+            journal_compact_threshold=self.config.translator_config.journal_compact_threshold,
             verbose=self.config.translator_config.verbose
         )
         if self.verbose:
@@ -86,10 +139,19 @@ class PDFHelper:
         if self.verbose:
             logger.info("文件處理器初始化完成")
 
+        embedding_cache = None
+        if self.config.embedding_service_config.cache:
+            embedding_cache = EmbeddingCache(
+                instance_path=self.config.instance_path,
+                max_entries=self.config.embedding_service_config.cache_max_entries,
+                verbose=self.config.embedding_service_config.verbose
+            )
+
         embedding_service = EmbeddingService(
             llm_service_obj=None,
             max_retries=self.config.embedding_service_config.max_retries,
             retry_delay=self.config.embedding_service_config.retry_delay,
+            embedding_cache=embedding_cache,
             verbose=self.config.embedding_service_config.verbose
         )
         if self.verbose:
@@ -109,13 +171,37 @@ class PDFHelper:
             embedding_service_obj=embedding_service,
             chromadb_obj=vector_store,
             llm_service_obj=None,
+            stream_batch_size=self.config.rag_config.stream_batch_size,
+            stream_flush_interval=self.config.rag_config.stream_flush_interval,
             verbose=self.config.rag_config.verbose
         )
         if self.verbose:
             logger.info("RAG引擎初始化完成")
 
+        self.document_registry = None
+        if self.config.document_registry_config.enabled:
+            self.document_registry = DocumentRegistry(
+                instance_path=self.config.instance_path,
+                db_name=self.config.document_registry_config.db_name,
+                on_canonical_change=self._transfer_document_artifacts,
+                verbose=self.config.document_registry_config.verbose
+            )
+            if self.verbose:
+                logger.info("文件登錄表初始化完成")
+
+        self.document_state = None
+        if self.config.document_state_config.enabled:
+            self.document_state = DocumentStateIndex(
+                instance_path=self.config.instance_path,
+                db_name=self.config.document_state_config.db_name,
+                verbose=self.config.document_state_config.verbose
+            )
+            if self.verbose:
+                logger.info("文件狀態索引初始化完成")
+
         self.md_constructor = MarkdownReconstructor(
             instance_path=self.config.instance_path,
+            link_mode=self.config.markdown_reconstructor_config.link_mode,
             verbose=self.config.markdown_reconstructor_config.verbose
         )
         if self.verbose:
@@ -184,6 +270,7 @@ class PDFHelper:
         """
         logger.info(f"[update_llm_service] {service}, {provider}, {model_name}")
         if service == "translator":
+            self._shutdown_router(self.translator.llm_service)
             self.translator.llm_service = self._create_llm_service(
                 provider=provider, 
                 model_name=model_name, 
@@ -196,6 +283,7 @@ class PDFHelper:
                 message="翻譯服務API金鑰更新成功" if success else "翻譯服務API金鑰更新失敗，請檢查金鑰或模型名稱是否正確"
             )
         elif service == "embedding":
+            self._shutdown_router(self.rag_engine.embedding_service.llm_service)
             self.rag_engine.embedding_service.llm_service = self._create_llm_service(
                 provider=provider, 
                 model_name=model_name, 
@@ -208,6 +296,7 @@ class PDFHelper:
                 message="Embedding服務API金鑰更新成功" if success else "Embedding服務API金鑰更新失敗，請檢查金鑰或模型名稱是否正確"
             )
         elif service == "rag":
+            self._shutdown_router(self.rag_engine.llm_service)
             self.rag_engine.llm_service = self._create_llm_service(
                 provider=provider, 
                 model_name=model_name, 
@@ -225,6 +314,77 @@ class PDFHelper:
                 message="不支援的服務類型"
             )
 
+    @staticmethod
+    def _shutdown_router(llm_service: Any):
+        """停用即將被取代的LLM服務路由 (進行中的請求完成後關閉其執行緒池)"""
+        if isinstance(llm_service, llm_services.ProviderRouter):
+            llm_service.shutdown()
+
+    def update_llm_routing(self, 
+            service: Literal['translator', 'rag'], 
+            providers: List[Dict[str, str]]
+        ) -> HelperResult:
+        """
+        設定服務使用的多個LLM服務提供者 (依順序對沖請求及失敗切換)
+
+        Args:
+            service: 要設定的服務 (translator/rag，嵌入服務的向量空間需一致，不支援多提供者)
+            providers: 依優先順序排列的提供者列表，每項包含 provider、model_name、api_key
+
+        Returns:
+            HelperResult: 包含是否設定成功及各提供者可用狀態的統一格式
+        """
+        logger.info(f"[update_llm_routing] {service}, {[(p.get('provider'), p.get('model_name')) for p in providers]}")
+        if service == "translator":
+            target = self.translator
+        elif service == "rag":
+            target = self.rag_engine
+        else:
+            return HelperResult(success=False, message="不支援的服務類型 (僅翻譯及RAG服務支援多提供者)")
+
+        if not providers:
+            return HelperResult(success=False, message="提供者列表不可為空")
+
+        services = []
+        for entry in providers:
+            llm_service = self._create_llm_service(
+                provider=entry.get("provider"),
+                model_name=entry.get("model_name"),
+                api_key=entry.get("api_key"),
+                verbose=target.verbose
+            )
+            if llm_service is None:
+                return HelperResult(success=False, message=f"不支援的LLM服務: {entry.get('provider')}")
+            services.append(llm_service)
+
+        availability = [
+            {"name": f"{llm_service.provider}/{llm_service.model_name}", "available": llm_service.check_available()}
+            for llm_service in services
+        ]
+
+        self._shutdown_router(target.llm_service)
+        if len(services) == 1:
+            target.llm_service = services[0]
+        else:
+            router_config = self.config.provider_router_config
+            target.llm_service = llm_services.ProviderRouter(
+                services=services,
+                hedge_percentile=router_config.hedge_percentile,
+                hedge_initial_delay=router_config.hedge_initial_delay,
+                hedge_min_delay=router_config.hedge_min_delay,
+                hedge_max_delay=router_config.hedge_max_delay,
+                failure_threshold=router_config.failure_threshold,
+                cooldown=router_config.cooldown,
+                verbose=router_config.verbose
+            )
+
+        success = any(entry["available"] for entry in availability)
+        return HelperResult(
+            success=success,
+            message="LLM服務路由設定成功" if success else "LLM服務路由設定失敗，所有提供者皆不可用",
+            data={"providers": availability}
+        )
+
     def process_pdf_to_json(self, 
             pdf_name: str, 
             method: Literal["auto", "txt", "ocr"] = "auto", 
@@ -265,13 +425,18 @@ class PDFHelper:
             data=mineru_results if mineru_results["success"] else None
         )
 
-    def translate_json_content(self, json_path: str, lang: str) -> HelperResult:
+    def translate_json_content(self, 
+            json_path: str, 
+            lang: str, 
+            on_item_translated: Optional[Callable[[int, Dict], None]] = None
+        ) -> HelperResult:
         """
         使用LLM服務翻譯JSON內容
         
         Args:
             json_path: JSON檔案路徑
             lang: 目標語言
+            on_item_translated: 段落確定後的回呼函式 (依文件順序呼叫，用於串流寫入向量資料庫)
         
         Returns:
             HelperResult: 包含翻譯後的JSON檔案路徑的統一格式
@@ -289,7 +454,8 @@ class PDFHelper:
             translated_file_path = self.translator.translate_content_list(
                 content_list_path=json_path,
                 target_lang=lang,
-                buffer_time=1.8 if hasattr(self.translator.llm_service, 'api_key') else 0
+                buffer_time=0,  # 請求頻率由共享的 RateLimiter 控制
+                on_item_translated=on_item_translated
             )
             if self.verbose:
                 logger.info(f"JSON '{json_path}' 翻譯完成，輸出路徑: {translated_file_path}")
@@ -307,6 +473,57 @@ class PDFHelper:
                 message=f"JSON翻譯失敗: {e}"
             )
 
+    def request_translation_pages(self, file_name: str, pages: List[int]) -> HelperResult:
+        """
+        閱讀介面請求優先翻譯的頁面 (包含這些頁面段落的翻譯請求移至佇列最前方)
+
+        Args:
+            file_name: 檔案名稱 (支援有無副檔名)
+            pages: 頁碼 (從1開始，依優先順序排列，例如目前閱讀的頁面及其後數頁)
+
+        Returns:
+            HelperResult: 包含是否已套用於進行中翻譯的統一格式
+                - data(applied): 是否已套用 (False 表示文件尚未進入並行翻譯；翻譯中的文件將於進入時優先處理，未在翻譯中則忽略)
+        """
+        file_name = self._resolve_document_name(file_name)
+        file_name, _ = self.pdf_processor._check_hashed_filename(file_name)
+
+        page_indices = [int(page) - 1 for page in pages if int(page) >= 1]
+        if not page_indices:
+            return HelperResult(success=False, message="頁碼需為1以上的整數")
+
+        applied = self.translator.request_pages(file_name, page_indices)
+        return HelperResult(
+            success=True,
+            message="已優先翻譯指定頁面" if applied else "文件尚未進入並行翻譯，翻譯中的文件將於並行翻譯開始時優先處理指定頁面",
+            data={"applied": applied}
+        )
+
+    def get_translation_page_status(self, file_name: str) -> HelperResult:
+        """
+        獲取文件各頁面的翻譯狀態 (閱讀介面可在頁面就緒後立即顯示譯文)
+
+        Args:
+            file_name: 檔案名稱 (支援有無副檔名)
+
+        Returns:
+            HelperResult: 包含各頁面翻譯狀態的統一格式
+                - data(state, pages): 翻譯狀態 (translating/completed/interrupted/pending) 及
+                  頁碼 (從1開始) → total、translated、failed、ready
+        """
+        file_name = self._resolve_document_name(file_name)
+        file_name, _ = self.pdf_processor._check_hashed_filename(file_name)
+
+        status = self.translator.get_page_status(file_name)
+        return HelperResult(
+            success=True,
+            message="頁面翻譯狀態獲取完成",
+            data={
+                "state": status["state"],
+                "pages": {page_idx + 1: page for page_idx, page in status["pages"].items()}
+            }
+        )
+
     def add_json_to_rag(self, json_name: str) -> HelperResult:
         """
         將JSON內容加入RAG引擎的向量資料庫
@@ -334,6 +551,8 @@ class PDFHelper:
             data={"collection_name": collection_name}
         )
 
+    PIPELINE_STAGES = ("mineru", "translation", "embedding")
+
     def from_pdf_to_rag(self, 
             pdf_name: str, 
             method: Literal["auto", "txt", "ocr"] = "auto", 
@@ -350,6 +569,29 @@ class PDFHelper:
         Returns:
             HelperResult: 包含是否成功加入向量資料庫及加入資料庫集合名稱的統一格式
         """
+        context = self.prepare_pipeline(pdf_name, method, lang)
+        for stage_name in self.PIPELINE_STAGES:
+            result = self.run_pipeline_stage(stage_name, context)
+            if result is not None:
+                return result
+
+    def prepare_pipeline(self, pdf_name: str, method: str, lang: str) -> Dict[str, Any]:
+        """
+        確認檔案目前的處理階段，建立完整流程所需的上下文
+
+        Args:
+            pdf_name: PDF檔案名稱
+            method: 解析方法 (auto/txt/ocr)
+            lang: 語言設定
+
+        Returns:
+            Dict[str, Any]: 流程上下文 (pdf_name, method, lang, stage, stage_data, file_name)
+        """
+        # 相同內容的PDF以正式名稱處理，共用已完成的處理結果
+        canonical_name = self._resolve_document_name(pdf_name)
+        if canonical_name != os.path.splitext(pdf_name)[0]:
+            pdf_name = canonical_name + ".pdf"
+
         status = self._check_progress_status(pdf_name, method).data
         stage = status.get('stage', -1)
         stage_data = status.get('stage_data', None)
@@ -357,8 +599,42 @@ class PDFHelper:
             raise ValueError("無法確認檔案處理階段，請確保PDF已上傳")
 
         logger.info(f"[from_pdf_to_rag] 檔案當前處理階段: {ProgressStage(stage).name} ({stage})")
-        
-        if stage <= ProgressStage.UPLOADED_PDF.value:
+
+        file_name, _ = self.pdf_processor._check_hashed_filename(pdf_name)
+        return {
+            "pdf_name": pdf_name,
+            "method": method,
+            "lang": lang,
+            "stage": stage,
+            "stage_data": stage_data,
+            "file_name": file_name
+        }
+
+    def run_pipeline_stage(self, stage_name: str, context: Dict[str, Any]) -> Optional[HelperResult]:
+        """
+        執行完整流程中的單一階段
+
+        Args:
+            stage_name: 階段名稱 (mineru/translation/embedding)
+            context: 由 prepare_pipeline 建立的流程上下文 (各階段會寫入後續階段需要的路徑)
+
+        Returns:
+            Optional[HelperResult]: None 表示繼續下一階段，否則為流程的最終結果
+        """
+        if stage_name == "mineru":
+            return self._run_pdf_stage(context)
+        elif stage_name == "translation":
+            return self._run_translation_stage(context)
+        elif stage_name == "embedding":
+            return self._run_rag_stage(context)
+        else:
+            raise ValueError(f"未知的處理階段: {stage_name}")
+
+    def _run_pdf_stage(self, context: Dict[str, Any]) -> Optional[HelperResult]:
+        """PDF解析階段：使用MinerU將PDF轉為JSON"""
+        pdf_name, method, lang = context["pdf_name"], context["method"], context["lang"]
+
+        if context["stage"] <= ProgressStage.UPLOADED_PDF.value:
             from torch import cuda
             device = "cuda" if cuda.is_available() else "cpu"
 
@@ -374,18 +650,30 @@ class PDFHelper:
             if not mineru_results.success:
                 ProgressManager.progress_fail("PDF處理失敗")
                 return mineru_results
+            context["json_path"] = mineru_results.data.get("output_file_paths").get("json")
+            self._record_document_state(
+                context, 
+                ProgressStage.PROCESSED_PDF, 
+                stage_data=os.path.dirname(context["json_path"]) if context["json_path"] else None,
+                parse_method=mineru_results.data.get("parse_method"),
+                timings={"mineru": mineru_results.data.get("processing_time", 0)}
+            )
         else:
             ProgressManager.progress_update(27, "已跳過PDF處理階段，準備翻譯JSON內容", "translating-json")
+        return None
+
+    def _run_translation_stage(self, context: Dict[str, Any]) -> Optional[HelperResult]:
+        """翻譯階段：翻譯MinerU輸出的JSON內容"""
+        stage, stage_data, file_name = context["stage"], context["stage_data"], context["file_name"]
 
-        file_name, pdf_path = self.pdf_processor._check_hashed_filename(pdf_name)
         if stage <= ProgressStage.PROCESSED_PDF.value:
             # 獲取生成的JSON檔案路徑
             if stage < ProgressStage.PROCESSED_PDF.value:
-                json_path = mineru_results.data.get("output_file_paths").get("json")
+                json_path = context["json_path"]
             else:
-                json_path = os.path.join(stage_data, method, file_name + "_content_list.json")
+                json_path = os.path.join(stage_data, file_name + "_content_list.json")
             
-            if not os.path.exists(json_path):
+            if not json_path or not os.path.exists(json_path):
                 logger.error(f"生成的JSON檔案不存在: {json_path}，無法進行後續操作")
                 ProgressManager.progress_fail("生成的JSON檔案不存在")
                 return HelperResult(
@@ -393,60 +681,106 @@ class PDFHelper:
                     message="生成的JSON檔案不存在"
                 )
             ProgressManager.progress_update(30, "開始翻譯JSON內容", "translating-json")
+
+            # 串流模式：翻譯完成的段落同時向量化並寫入向量資料庫
+            ingest_stream = None
+            if self.config.rag_config.streaming_ingest:
+                ingest_stream = self.rag_engine.open_ingest_stream(file_name)
+                context["ingest_stream"] = ingest_stream
             
             # 翻譯JSON內容
-            translated_path = self.translate_json_content(json_path, lang=lang)
+            start = time.time()
+            translated_path = self.translate_json_content(
+                json_path, 
+                lang=context["lang"],
+                on_item_translated=ingest_stream.feed if ingest_stream else None
+            )
             if not translated_path.success:
+                if ingest_stream:
+                    ingest_stream.abort()
                 ProgressManager.progress_fail("翻譯JSON內容遇到錯誤")
                 return HelperResult(
                     success=False,
                     message="翻譯JSON內容失敗"
                 )
+            context["translated_json_path"] = translated_path.data.get("translated_file_path")
+            self._record_document_state(
+                context, 
+                ProgressStage.TRANSLATED, 
+                stage_data=context["translated_json_path"],
+                llm_model=self._model_name(self.translator),
+                timings={"translation": time.time() - start}
+            )
             ProgressManager.progress_update(67, "JSON內容翻譯完成，開始加入RAG引擎", "adding-to-rag")
         else:
             ProgressManager.progress_update(67, "已跳過JSON翻譯階段，準備加入RAG引擎", "adding-to-rag")
-        
-        if stage <= ProgressStage.TRANSLATED.value:
-            if stage < ProgressStage.TRANSLATED.value:
-                translated_json_path = translated_path.data.get("translated_file_path")
-            else:
-                translated_json_path = stage_data
+        return None
 
-            if not os.path.exists(translated_json_path):
-                ProgressManager.progress_fail("未找到翻譯後的JSON檔案")
-                logger.error(f"未找到翻譯後的JSON檔案 {translated_json_path}，無法進行後續操作")
-                return HelperResult(
-                    success=False,
-                    message="未找到翻譯後的JSON檔案"
-                )
-            ProgressManager.progress_update(70, "已獲取翻譯後的JSON檔案，開始加入RAG引擎", "adding-to-rag")
-
-            # 將翻譯後的JSON加入RAG引擎
-            translated_json_name = Path(translated_json_path).name
-            rag_result = self.add_json_to_rag(translated_json_name)
-            if not rag_result.success:
-                ProgressManager.progress_fail("加入RAG引擎遇到錯誤")
-                logger.error(f"加入RAG引擎失敗: {rag_result.message}")
-            else:
-                ProgressManager.progress_complete({
-                    "collection_name": rag_result.data.get("collection_name"),
-                    "translated_json_name": translated_json_name
-                })
-                logger.info(f"文件成功加入RAG引擎: {translated_json_name}, 集合名稱: {rag_result.data.get('collection_name')}")
+    def _run_rag_stage(self, context: Dict[str, Any]) -> HelperResult:
+        """向量化階段：將翻譯後的JSON加入RAG引擎"""
+        stage, stage_data, file_name = context["stage"], context["stage_data"], context["file_name"]
 
         if stage == ProgressStage.RAG_ADDED.value:
             ProgressManager.progress_complete({
                 "collection_name": file_name,
                 "translated_json_name": stage_data
             })
-
-            rag_result = HelperResult(
+            logger.info(f"文件已存在於RAG引擎中: {file_name}")
+            return HelperResult(
                 success=True,
                 message="文件已存在於RAG引擎中",
                 data={"collection_name": file_name}
             )
-            logger.info(f"文件已存在於RAG引擎中: {file_name}")
 
+        if stage < ProgressStage.TRANSLATED.value:
+            translated_json_path = context["translated_json_path"]
+        else:
+            translated_json_path = stage_data
+
+        if not os.path.exists(translated_json_path):
+            ProgressManager.progress_fail("未找到翻譯後的JSON檔案")
+            logger.error(f"未找到翻譯後的JSON檔案 {translated_json_path}，無法進行後續操作")
+            return HelperResult(
+                success=False,
+                message="未找到翻譯後的JSON檔案"
+            )
+        ProgressManager.progress_update(70, "已獲取翻譯後的JSON檔案，開始加入RAG引擎", "adding-to-rag")
+
+        # 將翻譯後的JSON加入RAG引擎
+        translated_json_name = Path(translated_json_path).name
+        start = time.time()
+        ingest_stream = context.pop("ingest_stream", None)
+        if ingest_stream is not None:
+            # 串流模式：等待剩餘片段寫入完成
+            ProgressManager.progress_update(73, "等待串流向量化完成", "adding-to-rag")
+            if ingest_stream.close():
+                rag_result = HelperResult(
+                    success=True,
+                    message="JSON已加入向量資料庫",
+                    data={"collection_name": ingest_stream.collection_name}
+                )
+            else:
+                logger.warning("串流寫入向量資料庫失敗，改為一次性重新寫入")
+                rag_result = self.add_json_to_rag(translated_json_name)
+        else:
+            rag_result = self.add_json_to_rag(translated_json_name)
+        if not rag_result.success:
+            ProgressManager.progress_fail("加入RAG引擎遇到錯誤")
+            logger.error(f"加入RAG引擎失敗: {rag_result.message}")
+        else:
+            self._record_document_state(
+                context, 
+                ProgressStage.RAG_ADDED, 
+                stage_data=translated_json_name,
+                collection_name=rag_result.data.get("collection_name"),
+                embedding_model=self._model_name(self.rag_engine.embedding_service),
+                timings={"embedding": time.time() - start}
+            )
+            ProgressManager.progress_complete({
+                "collection_name": rag_result.data.get("collection_name"),
+                "translated_json_name": translated_json_name
+            })
+            logger.info(f"文件成功加入RAG引擎: {translated_json_name}, 集合名稱: {rag_result.data.get('collection_name')}")
         return rag_result
 
     def ask_question(self, 
@@ -534,36 +868,37 @@ class PDFHelper:
                 - stage: 當前處理階段 (ProgressStage枚舉值)
                 - stage_data: 與當前階段相關的資料 (例如檔案路徑)
         """
-        # 確保只保留檔案名稱，不包含副檔名
-        if file_name.find(".") != -1:
-            file_name = file_name[:file_name.rfind(".")]
+        # 確保只保留檔案名稱，不包含副檔名，並透過文件登錄表取得正式名稱
+        canonical_name = self._resolve_document_name(file_name)
+        content_hash = self.document_registry.get_content_hash(canonical_name) if self.document_registry else None
 
         # 檢查是否會生成雜湊檔名
-        file_name, pdf_path = self.pdf_processor._check_hashed_filename(file_name)
-        
-        # 依照檔案結構組合完整路徑
-        translated_name = file_name + "_translated.json"
+        file_name, pdf_path = self.pdf_processor._check_hashed_filename(canonical_name)
 
-        mineru_path = os.path.join(self.config.instance_path, "mineru_outputs", file_name, method)
-        translated_path = os.path.join(self.config.instance_path, "translated_files", translated_name)
+        # 優先使用文件狀態索引，紀錄不存在或已失效時才檢查檔案系統
+        record = self.document_state.get(file_name, method) if self.document_state else None
+        if record is not None and content_hash and record["content_hash"] and record["content_hash"] != content_hash:
+            # PDF內容已變更，先前的處理結果屬於舊內容，從上傳階段重新處理
+            logger.warning(f"文件內容已變更，捨棄先前的處理結果: {file_name}")
+            self._discard_document_artifacts(file_name)
+            record = None
 
-        stage: ProgressStage = None
-        stage_data = None
-        if not os.path.exists(pdf_path):
-            stage = None
-            stage_data = None
-        elif not os.path.exists(mineru_path) or not os.listdir(mineru_path):
-            stage = ProgressStage.UPLOADED_PDF
-            stage_data = pdf_path
-        elif not os.path.exists(translated_path):
-            stage = ProgressStage.PROCESSED_PDF
-            stage_data = mineru_path
-        elif file_name not in self.rag_engine.vector_store.list_collections():
-            stage = ProgressStage.TRANSLATED
-            stage_data = translated_path
+        if record is not None and self._verify_document_state(record):
+            stage, stage_data = ProgressStage(record["stage"]), record["stage_data"]
         else:
-            stage = ProgressStage.RAG_ADDED
-            stage_data = translated_name
+            stage, stage_data = self._probe_progress_status(file_name, pdf_path, method)
+            if self.document_state and stage:
+                artifacts = self._artifact_paths(file_name, method)
+                self.document_state.update(
+                    file_name, method, stage.value,
+                    stage_data=stage_data,
+                    pdf_path=pdf_path,
+                    mineru_path=artifacts["mineru_path"],
+                    translated_path=artifacts["translated_path"],
+                    collection_name=file_name if stage == ProgressStage.RAG_ADDED else None,
+                    content_hash=content_hash,
+                    clear=self._later_stage_fields(stage)
+                )
         
         return HelperResult(
             success=True,
@@ -574,6 +909,185 @@ class PDFHelper:
             }
         )
 
+    @staticmethod
+    def _later_stage_fields(stage: ProgressStage) -> List[str]:
+        """
+        取得在指定階段之後才產生的文件狀態欄位 (退回較早階段時需清除，避免保留失效的集合名稱或模型名稱)
+
+        Args:
+            stage: 目前的處理階段
+
+        Returns:
+            List[str]: 文件狀態欄位名稱
+        """
+        stage_fields = {
+            ProgressStage.PROCESSED_PDF: ["parse_method"],
+            ProgressStage.TRANSLATED: ["llm_model"],
+            ProgressStage.RAG_ADDED: ["collection_name", "embedding_model"]
+        }
+        return [field for later, fields in stage_fields.items() if later.value > stage.value for field in fields]
+
+    def _artifact_paths(self, file_name: str, method: str) -> Dict[str, str]:
+        """組合文件各階段產出的路徑 (mineru_path, translated_path)"""
+        return {
+            "mineru_path": os.path.join(self.config.instance_path, "mineru_outputs", file_name, method),
+            "translated_path": os.path.join(self.config.instance_path, "translated_files", file_name + "_translated.json")
+        }
+
+    def _probe_progress_status(self, 
+            file_name: str, 
+            pdf_path: str, 
+            method: str, 
+            collections: Optional[Set[str]] = None
+        ) -> Tuple[Optional[ProgressStage], Optional[str]]:
+        """
+        檢查檔案系統及向量資料庫以確認處理階段
+
+        Args:
+            file_name: 處理用的檔名 (不含副檔名)
+            pdf_path: PDF檔案路徑
+            method: 處理方法
+            collections: 已列出的集合名稱 (批量檢查時使用，None 表示逐一查詢集合是否存在)
+
+        Returns:
+            Tuple(stage, stage_data): 處理階段 (PDF不存在時為 None) 及與階段相關的資料
+        """
+        artifacts = self._artifact_paths(file_name, method)
+        mineru_path, translated_path = artifacts["mineru_path"], artifacts["translated_path"]
+
+        if collections is not None:
+            rag_added = file_name in collections
+        else:
+            rag_added = self.rag_engine.vector_store.has_collection(file_name)
+
+        if not os.path.exists(pdf_path):
+            return None, None
+        elif not os.path.exists(mineru_path) or not os.listdir(mineru_path):
+            return ProgressStage.UPLOADED_PDF, pdf_path
+        elif not os.path.exists(translated_path):
+            return ProgressStage.PROCESSED_PDF, mineru_path
+        elif not rag_added:
+            return ProgressStage.TRANSLATED, translated_path
+        else:
+            return ProgressStage.RAG_ADDED, os.path.basename(translated_path)
+
+    def _verify_document_state(self, record: Dict[str, Any]) -> bool:
+        """
+        以固定次數的檢查確認索引紀錄仍然有效 (該階段的產出存在，且下一階段未在索引之外完成)
+
+        Args:
+            record: 文件狀態索引紀錄
+
+        Returns:
+            bool: 紀錄是否有效
+        """
+        stage = record["stage"]
+        exists = lambda path: bool(path) and os.path.exists(path)
+        has_collection = lambda: self.rag_engine.vector_store.has_collection(record["name"])
+
+        if stage == ProgressStage.UPLOADED_PDF.value:
+            return exists(record["pdf_path"]) and not (exists(record["mineru_path"]) and os.listdir(record["mineru_path"]))
+        if stage == ProgressStage.PROCESSED_PDF.value:
+            return exists(record["mineru_path"]) and not exists(record["translated_path"])
+        if stage == ProgressStage.TRANSLATED.value:
+            return exists(record["translated_path"]) and not has_collection()
+        if stage == ProgressStage.RAG_ADDED.value:
+            return exists(record["translated_path"]) and has_collection()
+        return False
+
+    def _record_document_state(self, context: Dict[str, Any], stage: ProgressStage, **fields):
+        """
+        於完整流程的階段完成後更新文件狀態索引
+
+        Args:
+            context: 流程上下文
+            stage: 完成的處理階段
+            **fields: 文件狀態欄位 (stage_data、產出路徑、模型名稱、timings 等)
+        """
+        if not self.document_state:
+            return
+        content_hash = None
+        if self.document_registry:
+            content_hash = self.document_registry.get_content_hash(os.path.splitext(context["pdf_name"])[0])
+        self.document_state.update(
+            context["file_name"], 
+            context["method"], 
+            stage.value, 
+            content_hash=content_hash, 
+            **self._artifact_paths(context["file_name"], context["method"]),
+            **fields
+        )
+
+    @staticmethod
+    def _model_name(service: Any) -> Optional[str]:
+        """取得服務使用的模型名稱 (provider/model)"""
+        llm_service = getattr(service, "llm_service", None)
+        if llm_service is None:
+            return None
+        return f"{getattr(llm_service, 'provider', 'base')}/{llm_service.model_name}"
+
+    def reconcile_document_states(self) -> HelperResult:
+        """
+        依檔案系統及向量資料庫重新建立文件狀態索引 (離線維護使用，集合只列出一次)
+
+        Returns:
+            HelperResult: 包含重建的紀錄數量及各階段文件數量的統一格式
+        """
+        if not self.document_state:
+            return HelperResult(success=False, message="文件狀態索引未啟用")
+
+        import re
+        pdf_dir = os.path.join(self.config.instance_path, "pdfs")
+        collections = set(self.rag_engine.vector_store.list_collections())
+        records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+        for pdf_file in sorted(os.listdir(pdf_dir)) if os.path.isdir(pdf_dir) else []:
+            name, ext = os.path.splitext(pdf_file)
+            if ext.lower() != ".pdf" or re.match(r"^doc_[0-9a-f]{8}$", name):
+                continue  # 略過非PDF檔案及雜湊檔名副本
+
+            canonical_name = self._resolve_document_name(name)
+            file_name, pdf_path = self.pdf_processor._check_hashed_filename(canonical_name)
+            document_dir = os.path.join(self.config.instance_path, "mineru_outputs", file_name)
+            methods = [
+                method for method in ("auto", "txt", "ocr")
+                if os.path.isdir(os.path.join(document_dir, method))
+            ] or ["auto"]
+
+            content_hash = self.document_registry.get_content_hash(canonical_name) if self.document_registry else None
+            for method in methods:
+                if (file_name, method) in records:
+                    continue
+                stage, stage_data = self._probe_progress_status(file_name, pdf_path, method, collections=collections)
+                if stage is None:
+                    continue
+                previous = self.document_state.get(file_name, method) or {}
+                records[(file_name, method)] = {
+                    **{key: previous.get(key) for key in ("parse_method", "llm_model", "embedding_model", "timings")},
+                    "name": file_name,
+                    "method": method,
+                    "stage": stage.value,
+                    "stage_data": stage_data,
+                    "pdf_path": pdf_path,
+                    "content_hash": content_hash,
+                    "collection_name": file_name if stage == ProgressStage.RAG_ADDED else None,
+                    **self._artifact_paths(file_name, method),
+                    **{key: None for key in self._later_stage_fields(stage)}
+                }
+
+        try:
+            self.document_state.replace_all(list(records.values()))
+        except Exception as e:
+            return HelperResult(success=False, message=f"文件狀態索引重建失敗: {e}")
+
+        stats = self.document_state.stats()
+        logger.info(f"文件狀態索引重建完成: {stats['records']} 筆紀錄")
+        return HelperResult(
+            success=True,
+            message="文件狀態索引重建完成",
+            data=stats
+        )
+
     def remove_file_from_system(self, file_name: str) -> HelperResult:
         """
         從系統中移除指定的檔案
@@ -588,20 +1102,39 @@ class PDFHelper:
         if file_name.find(".") != -1:
             file_name = file_name[:file_name.rfind(".")]
 
+        if self.document_registry:
+            # 移除的是正式名稱且仍有其他別名時，登錄表會將處理結果交接給接替的別名 (見 _transfer_document_artifacts)
+            canonical_name, remaining_aliases = self.document_registry.unregister(file_name)
+            if canonical_name != file_name or remaining_aliases:
+                # 移除此檔名上傳的PDF，處理結果以正式名稱保存
+                alias_pdf_path = os.path.join(self.config.instance_path, "pdfs", file_name + ".pdf")
+                if os.path.exists(alias_pdf_path):
+                    os.remove(alias_pdf_path)
+                    logger.info(f"已移除檔案: {alias_pdf_path}")
+            if remaining_aliases:
+                canonical_name = self.document_registry.resolve(remaining_aliases[0])
+                logger.info(f"處理結果仍由其他檔案使用，保留: {canonical_name} ({', '.join(remaining_aliases)})")
+                return HelperResult(
+                    success=True,
+                    message="檔案移除完成 (處理結果仍由其他檔案使用)",
+                    data={"shared_with": remaining_aliases, "canonical_name": canonical_name}
+                )
+            file_name = canonical_name
+
         pdf_name = file_name + ".pdf"
 
         # 檢查是否會生成雜湊檔名
         file_name, pdf_path = self.pdf_processor._check_hashed_filename(file_name)
 
         # 依照檔案結構組合完整路徑
-        progress_name = file_name + "_progress.json"
-        translated_name = file_name + "_translated.json"
-
+        artifacts = self._document_artifacts(file_name)
         original_pdf_path = os.path.join(self.config.instance_path, "pdfs", pdf_name)
-        mineru_path = os.path.join(self.config.instance_path, "mineru_outputs", file_name)
-        translate_progress_path = os.path.join(self.config.instance_path, "translated_files", "unfinished_file", progress_name)
-        translated_path = os.path.join(self.config.instance_path, "translated_files", translated_name)
-        reconstruct_path = os.path.join(self.config.instance_path, "reconstructed_files", file_name)
+        mineru_path = artifacts["mineru"]
+        translate_progress_path = artifacts["progress"]
+        translate_journal_path = artifacts["journal"]
+        translate_glossary_path = artifacts["glossary"]
+        translated_path = artifacts["translated"]
+        reconstruct_path = artifacts["reconstructed"]
 
         try:
             import shutil
@@ -630,6 +1163,14 @@ class PDFHelper:
             else:
                 logger.warning(f"檔案不存在，無法移除: {translate_progress_path}")
 
+            if os.path.exists(translate_journal_path):
+                os.remove(translate_journal_path)
+                logger.info(f"已移除檔案: {translate_journal_path}")
+
+            if os.path.exists(translate_glossary_path):
+                os.remove(translate_glossary_path)
+                logger.info(f"已移除檔案: {translate_glossary_path}")
+
             if os.path.exists(translated_path):
                 os.remove(translated_path)
                 logger.info(f"已移除檔案: {translated_path}")
@@ -643,6 +1184,8 @@ class PDFHelper:
                 logger.warning(f"資料夾還未生成，無法移除: {reconstruct_path}")
             
             self.rag_engine.vector_store.delete_collection(file_name)
+            if self.document_state:
+                self.document_state.remove(file_name)
         except Exception as e:
             logger.error(f"檔案移除失敗: {e}")
             return HelperResult(
@@ -657,6 +1200,114 @@ class PDFHelper:
             data=None
         )
 
+    def _document_artifacts(self, file_name: str) -> Dict[str, str]:
+        """
+        組合以處理用檔名保存的所有產出路徑 (PDF除外)
+
+        Args:
+            file_name: 處理用的檔名 (不含副檔名)
+
+        Returns:
+            Dict ([str, str]): 產出路徑 (mineru, progress, journal, glossary, translated, reconstructed)
+        """
+        translated_dir = os.path.join(self.config.instance_path, "translated_files")
+        unfinished_dir = os.path.join(translated_dir, "unfinished_file")
+        return {
+            "mineru": os.path.join(self.config.instance_path, "mineru_outputs", file_name),
+            "progress": os.path.join(unfinished_dir, file_name + "_progress.json"),
+            "journal": os.path.join(unfinished_dir, file_name + "_progress.jsonl"),
+            "glossary": os.path.join(unfinished_dir, file_name + "_glossary.json"),
+            "translated": os.path.join(translated_dir, file_name + "_translated.json"),
+            "reconstructed": os.path.join(self.config.instance_path, "reconstructed_files", file_name)
+        }
+
+    def _discard_document_artifacts(self, file_name: str):
+        """
+        刪除處理用檔名的所有產出、向量資料庫集合及文件狀態紀錄 (保留PDF)
+
+        Args:
+            file_name: 處理用的檔名 (不含副檔名)
+        """
+        import shutil
+        for path in self._document_artifacts(file_name).values():
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+            else:
+                continue
+            logger.info(f"已移除: {path}")
+        if self.rag_engine.vector_store.has_collection(file_name):
+            self.rag_engine.vector_store.delete_collection(file_name)
+        if self.document_state:
+            self.document_state.remove(file_name)
+
+    def _transfer_document_artifacts(self, old_name: str, new_name: Optional[str]):
+        """
+        正式名稱變更時搬移處理結果 (由文件登錄表回呼)
+
+        舊正式名稱的產出 (MinerU輸出、翻譯進度、譯文、重組檔案及向量資料庫集合) 改以新正式名稱保存；
+        新正式名稱為 None 時表示該內容已無別名參照，刪除所有產出。
+        舊正式名稱的PDF不在此處理 (可能已被新內容覆蓋)，文件狀態紀錄於下次檢查進度時重新建立。
+
+        Args:
+            old_name: 舊正式名稱 (不含副檔名)
+            new_name: 新正式名稱 (不含副檔名，None 表示刪除)
+        """
+        import shutil
+        remove_path = lambda path: shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+
+        old_file, old_pdf_path = self.pdf_processor._check_hashed_filename(old_name)
+        if old_file != old_name and os.path.exists(old_pdf_path):
+            os.remove(old_pdf_path)     # 雜湊檔名副本連結至舊內容的PDF
+            logger.info(f"已移除檔案: {old_pdf_path}")
+        if self.document_state:
+            self.document_state.remove(old_file)
+
+        if new_name is None:
+            self._discard_document_artifacts(old_file)
+            return
+
+        new_file, _ = self.pdf_processor._check_hashed_filename(new_name)
+        if self.document_state:
+            self.document_state.remove(new_file)
+        new_artifacts = self._document_artifacts(new_file)
+        for key, old_path in self._document_artifacts(old_file).items():
+            if not os.path.exists(old_path):
+                continue
+            new_path = new_artifacts[key]
+            if os.path.exists(new_path):
+                remove_path(new_path)   # 接替的別名不會有自己的產出，殘留的檔案已失效
+            shutil.move(old_path, new_path)
+
+            # MinerU輸出及重組檔案的資料夾內，檔名同樣以處理用檔名開頭 (例如 `{file_name}_content_list.json`)
+            for root, _, files in os.walk(new_path) if os.path.isdir(new_path) else []:
+                for name in files:
+                    if name.startswith((old_file + "_", old_file + ".")):
+                        os.replace(os.path.join(root, name), os.path.join(root, new_file + name[len(old_file):]))
+            logger.info(f"已搬移: {old_path} → {new_path}")
+
+        if self.rag_engine.vector_store.has_collection(old_file):
+            self.rag_engine.vector_store.rename_collection(old_file, new_file)
+
+    def _resolve_document_name(self, file_name: str) -> str:
+        """
+        透過文件登錄表取得檔案的正式名稱 (計算PDF內容雜湊值，相同內容的PDF對應同一個正式名稱)
+
+        Args:
+            file_name: 檔案名稱 (支援有無副檔名)
+
+        Returns:
+            str: 正式名稱 (不含副檔名，未啟用文件登錄表時返回原檔名)
+        """
+        if file_name.find(".") != -1:
+            file_name = file_name[:file_name.rfind(".")]
+        if not self.document_registry:
+            return file_name
+
+        pdf_path = os.path.join(self.config.instance_path, "pdfs", file_name + ".pdf")
+        return self.document_registry.register(file_name, pdf_path)
+
     def get_system_health(self) -> HelperResult:
         """
         獲取系統健康狀態
@@ -669,6 +1320,17 @@ class PDFHelper:
             "pdf_processor": True,  # 假設PDF處理器總是可用
             "translator": self.translator.is_available() if self.translator.llm_service else "未設定",
             "rag_engine": self.rag_engine.get_system_info(),
+            "rate_limiters": llm_services.RateLimiterRegistry.snapshot(),
+            "concurrency": llm_services.ConcurrencyControllerRegistry.snapshot(),
+            "llm_routers": {
+                name: llm_service.get_status()
+                for name, llm_service in (("translator", self.translator.llm_service), ("rag", self.rag_engine.llm_service))
+                if isinstance(llm_service, llm_services.ProviderRouter)
+            } or "未啟用",
+            "translation_memory": self.translator.translation_memory.stats() if self.translator.translation_memory else "未啟用",
+            "mineru_workers": self.pdf_processor.get_worker_status() or "未啟用",
+            "document_registry": self.document_registry.stats() if self.document_registry else "未啟用",
+            "document_state": self.document_state.stats() if self.document_state else "未啟用",
         }
         return HelperResult(
             success=True,
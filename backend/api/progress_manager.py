@@ -2,8 +2,10 @@
 進度管理模組
 用於管理非同步任務的進度狀態，避免循環導入問題
 """
-from threading import Lock
-from typing import Dict, Any, Optional, Literal
+from threading import Lock, local
+from typing import Dict, Any, Optional, Literal, List
+import time
+import uuid
 
 import logging
 from backend.api import setup_project_logger  # 導入日誌設置函數
@@ -12,15 +14,147 @@ setup_project_logger(verbose=True)  # 設置全局日誌記錄器
 logger = logging.getLogger(__name__)
 
 class ProgressManager:
-    """進度管理器類別，封裝進度管理功能"""
+    """
+    進度管理器類別，封裝進度管理功能
+
+    除了全域進度狀態外，也支援多個工作 (job) 各自的進度：
+    工作執行緒呼叫 `bind_job` 後，該執行緒上的 progress_* 呼叫都會更新對應工作的狀態；
+    最新提交的工作會同步到全域進度狀態，以相容只查詢 `/api/get-progress` 的前端。
+    """
     
     _instance = None  # 單例實例
-    def __init__(self, state_dict: Dict[str, Any], lock: Lock):
+    _local = local()  # 執行緒區域變數 (保存目前綁定的工作ID)
+    # 同步到全域狀態的進度欄位 (工作專屬欄位如 job_id、status 不寫入全域狀態)
+    _PROGRESS_FIELDS = ("is_processing", "progress", "stage", "message", "eta_seconds", "error", "result")
+    def __init__(self, state_dict: Dict[str, Any], lock: Lock, max_finished_jobs: int = 200):
         self._state = state_dict
         self._lock = lock
+        self._jobs: Dict[str, Dict[str, Any]] = {}  # 各工作的進度狀態 (工作ID, 狀態)
+        self._latest_job_id: Optional[str] = None   # 最新提交的工作 (同步到全域狀態)
+        self._max_finished_jobs = max_finished_jobs
         ProgressManager._instance = self  # 保存到類變數 (全部類共享)
         logger.info("[ProgressManager] 進度狀態已初始化")
 
+    @classmethod
+    def _target_state(cls) -> Dict[str, Any]:
+        """獲取當前執行緒應更新的進度狀態 (綁定工作則為工作狀態，否則為全域狀態)"""
+        job_id = getattr(cls._local, "job_id", None)
+        if job_id is not None and job_id in cls._instance._jobs:
+            return cls._instance._jobs[job_id]
+        return cls._instance._state
+
+    @classmethod
+    def _sync_latest(cls, state: Dict[str, Any]):
+        """若更新的是最新工作，將其狀態同步到全域狀態 (需在持有鎖時呼叫)"""
+        if state is cls._instance._state:
+            return
+        if state.get("job_id") == cls._instance._latest_job_id:
+            cls._instance._state.update({field: state.get(field) for field in cls._PROGRESS_FIELDS})
+
+    @classmethod
+    def create_job(cls, metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        建立新工作並成為最新工作
+
+        Args:
+            metadata: 工作附加資料 (例如 {"pdf_name": "example.pdf"})
+
+        Returns:
+            str: 工作ID (未初始化則返回None)
+        """
+        if cls._instance is None:
+            logger.error("[建立工作] ProgressManager 未初始化！")
+            return None
+
+        job_id = uuid.uuid4().hex[:12]
+        with cls._instance._lock:
+            cls._instance._jobs[job_id] = {
+                "job_id": job_id,
+                "status": "queued",         # queued/running/waiting/completed/failed
+                "pipeline_stage": None,     # 目前所在的工作池階段
+                "is_processing": True,
+                "progress": float(0),
+                "stage": "idle",
+                "message": "排隊中",
+                "eta_seconds": None,        # 目前階段預估剩餘秒數 (無法預估時為None)
+                "error": None,
+                "result": None,
+                "metadata": metadata or {},
+                "submitted_at": time.time(),
+                "finished_at": None
+            }
+            cls._instance._latest_job_id = job_id
+            cls._sync_latest(cls._instance._jobs[job_id])
+            cls._prune_jobs()
+
+        logger.info(f"[建立工作] job_id={job_id}, metadata={metadata}")
+        return job_id
+
+    @classmethod
+    def _prune_jobs(cls):
+        """移除過舊的已結束工作 (需在持有鎖時呼叫)"""
+        finished = [
+            job for job in cls._instance._jobs.values()
+            if job["status"] in ("completed", "failed")
+        ]
+        overflow = len(finished) - cls._instance._max_finished_jobs
+        if overflow <= 0:
+            return
+        finished.sort(key=lambda job: job["finished_at"] or 0)
+        for job in finished[:overflow]:
+            del cls._instance._jobs[job["job_id"]]
+
+    @classmethod
+    def bind_job(cls, job_id: Optional[str]):
+        """將當前執行緒綁定到指定工作 (傳入None解除綁定)"""
+        cls._local.job_id = job_id
+
+    @classmethod
+    def current_job_id(cls) -> Optional[str]:
+        """獲取當前執行緒綁定的工作ID"""
+        return getattr(cls._local, "job_id", None)
+
+    @classmethod
+    def set_job_status(cls, job_id: str, status: str, pipeline_stage: Optional[str] = None, message: Optional[str] = None):
+        """
+        更新工作的排程狀態
+
+        Args:
+            job_id: 工作ID
+            status: 排程狀態 (queued/running/waiting)
+            pipeline_stage: 所在工作池階段 (mineru/translation/embedding)
+            message: 狀態訊息 (可選)
+        """
+        if cls._instance is None:
+            return
+        with cls._instance._lock:
+            job = cls._instance._jobs.get(job_id)
+            if job is None or job["status"] in ("completed", "failed"):
+                return
+            job["status"] = status
+            job["pipeline_stage"] = pipeline_stage
+            if message:
+                job["message"] = message
+            cls._sync_latest(job)
+
+    @classmethod
+    def get_job(cls, job_id: str) -> Optional[Dict[str, Any]]:
+        """獲取指定工作的進度狀態 (不存在返回None)"""
+        if cls._instance is None:
+            return None
+        with cls._instance._lock:
+            job = cls._instance._jobs.get(job_id)
+            return dict(job) if job else None
+
+    @classmethod
+    def list_jobs(cls) -> List[Dict[str, Any]]:
+        """列出所有工作的進度狀態 (依提交時間排序)"""
+        if cls._instance is None:
+            return []
+        with cls._instance._lock:
+            jobs = [dict(job) for job in cls._instance._jobs.values()]
+        return sorted(jobs, key=lambda job: job["submitted_at"])
+
     @classmethod
     def get_state(cls) -> Optional[Dict[str, Any]]:
         """獲取當前進度狀態"""
@@ -51,6 +185,7 @@ class ProgressManager:
             cls._instance._state["progress"] = 0
             cls._instance._state["stage"] = "idle"
             cls._instance._state["message"] = "開始處理"
+            cls._instance._state["eta_seconds"] = None
             cls._instance._state["error"] = None
             cls._instance._state["result"] = None
 
@@ -70,11 +205,17 @@ class ProgressManager:
             return
         
         with cls._instance._lock:
-            cls._instance._state["is_processing"] = False
-            cls._instance._state["progress"] = 100
-            cls._instance._state["message"] = "處理完成"
-            cls._instance._state["stage"] = "idle"
-            cls._instance._state["result"] = result
+            state = cls._target_state()
+            state["is_processing"] = False
+            state["progress"] = 100
+            state["message"] = "處理完成"
+            state["eta_seconds"] = None
+            state["stage"] = "idle"
+            state["result"] = result
+            if state is not cls._instance._state:
+                state["status"] = "completed"
+                state["finished_at"] = time.time()
+            cls._sync_latest(state)
         
         logger.info("[進度完成] 處理完成")
 
@@ -83,7 +224,8 @@ class ProgressManager:
             cls, 
             progress: float, 
             message: str, 
-            stage: Literal["idle", "processing-pdf", "translating-json", "adding-to-rag"]
+            stage: Literal["idle", "processing-pdf", "translating-json", "adding-to-rag"],
+            eta_seconds: Optional[float] = None
         ):
         """
         更新進度
@@ -92,10 +234,12 @@ class ProgressManager:
             progress: 進度百分比 (0-100)
             message: 狀態訊息
             stage: 當前階段 ("idle", "processing-pdf", "translating-json", "adding-to-rag")
+            eta_seconds: 目前階段預估剩餘秒數 (可選，無法預估時為None)
         """
         if cls._instance is None:
             return  # 未初始化不更新
-        if cls._instance._state["is_processing"] is False:
+        state = cls._target_state()
+        if state["is_processing"] is False:
             logger.warning(f"[進度更新被拒絕] 當前沒有任務在處理中，無法更新進度")
             return
         if not (0 <= progress <= 100):
@@ -104,18 +248,22 @@ class ProgressManager:
         if stage not in ["idle", "processing-pdf", "translating-json", "adding-to-rag"]:
             logger.error(f"[進度更新被拒絕] 無效的階段值: {stage}")
             return
-        if progress < cls._instance._state["progress"]:
+        if progress < state["progress"]:
             return  # 不允許進度回退
-        if progress == cls._instance._state["progress"] and message == cls._instance._state["message"] and stage == cls._instance._state["stage"]:
+        if progress == state["progress"] and message == state["message"] and stage == state["stage"]:
             return  # 無變化不更新
 
         progress = round(progress, 2)
         with cls._instance._lock:
-            cls._instance._state["progress"] = progress
-            cls._instance._state["message"] = message
-            cls._instance._state["stage"] = stage
+            state["progress"] = progress
+            state["message"] = message
+            state["stage"] = stage
+            state["eta_seconds"] = round(eta_seconds, 1) if eta_seconds is not None else None
+            cls._sync_latest(state)
 
-        logger.info(f"[進度更新] progress={progress}%, stage={stage}, message={message}")
+        job_id = state.get("job_id")
+        eta_info = f", eta={eta_seconds:.0f}s" if eta_seconds is not None else ""
+        logger.info(f"[進度更新] {f'job_id={job_id}, ' if job_id else ''}progress={progress}%, stage={stage}, message={message}{eta_info}")
 
     @classmethod
     def progress_fail(cls, error_message: str):
@@ -130,11 +278,15 @@ class ProgressManager:
             return
         
         with cls._instance._lock:
-            cls._instance._state["is_processing"] = False
-            cls._instance._state["message"] = "處理遇到錯誤"
-            cls._instance._state["stage"] = "idle"
-            cls._instance._state["error"] = error_message
-
-        logger.error(f"[進度失敗] {error_message}")
+            state = cls._target_state()
+            state["is_processing"] = False
+            state["message"] = "處理遇到錯誤"
+            state["eta_seconds"] = None
+            state["stage"] = "idle"
+            state["error"] = error_message
+            if state is not cls._instance._state:
+                state["status"] = "failed"
+                state["finished_at"] = time.time()
+            cls._sync_latest(state)
 
         logger.error(f"[進度失敗] {error_message}")
@@ -0,0 +1,24 @@
+"""
+文件狀態索引重建命令 - 依檔案系統及向量資料庫重新建立文件狀態索引 (索引遺失、損毀或手動搬移檔案後使用)
+
+使用方式: python -m backend.api.reconcile [--instance-path PATH] [--verbose]
+"""
+import json
+import argparse
+
+from backend.api.config import Config
+from backend.api.pdf_helper import PDFHelper
+
+def main():
+    parser = argparse.ArgumentParser(description="重新建立文件狀態索引")
+    parser.add_argument("--instance-path", default=None, help="實例路徑 (預設為 backend/instance)")
+    parser.add_argument("--verbose", action="store_true", help="是否輸出詳細日誌")
+    args = parser.parse_args()
+
+    pdf_helper = PDFHelper(config=Config(instance_path=args.instance_path), verbose=args.verbose)
+    result = pdf_helper.reconcile_document_states()
+    print(json.dumps({"success": result.success, "message": result.message, "data": result.data}, indent=2, ensure_ascii=False))
+    raise SystemExit(0 if result.success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,19 @@
 from .base_service import BaseLLMService
+from .rate_limiter import RateLimiter, RateLimiterRegistry
+from .concurrency_controller import AdaptiveConcurrencyController, ConcurrencyControllerRegistry
 from .ollama_service import OllamaService
 from .google_service import GoogleService
 from .openai_service import OpenAIService
+from .provider_router import ProviderRouter
 
 __all__ = [
     "BaseLLMService",
+    "RateLimiter",
+    "RateLimiterRegistry",
+    "AdaptiveConcurrencyController",
+    "ConcurrencyControllerRegistry",
     "OllamaService",
     "GoogleService",
-    "OpenAIService"
+    "OpenAIService",
+    "ProviderRouter"
 ]
\ No newline at end of file
@@ -1,5 +1,11 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Any
 from dataclasses import dataclass
+import asyncio
+import time
+import httpx
+
+from .rate_limiter import RateLimiter, RateLimiterRegistry, estimate_tokens
+from .concurrency_controller import AdaptiveConcurrencyController, ConcurrencyControllerRegistry
 
 @dataclass
 class StreamResponse:
@@ -17,11 +23,170 @@ class BaseLLMService:
     """
     LLM服務的基類，定義了所有LLM服務應該實現的接口。
     """
+    provider: str = "base"  # 服務提供者名稱 (用於依提供者區分設定)
+
+    availability_ttl: float = 60.0      # 服務可用的快取時間 (秒)
+    unavailability_ttl: float = 5.0     # 服務不可用的快取時間 (秒)，較短以便盡快恢復
+
+    async_max_connections: int = 256            # 非同步HTTP連線池的連線數量上限
+    async_max_keepalive_connections: int = 64   # 非同步HTTP連線池保持連線 (keep-alive) 的數量上限
+
     def __init__(self, model_name: str, api_key: str, verbose: bool = False):
         self.model_name = model_name
         self.api_key = api_key
         self.verbose = verbose
 
+        self._available: Optional[bool] = None  # 快取的可用狀態 (None 表示需重新檢查)
+        self._available_checked_at = 0.0
+
+        self.history_window: Optional[int] = None  # 多輪對話保留的最近輪數 (None 表示不限制)
+        self.pinned_turns: int = 0                  # 多輪對話固定保留的最初輪數 (例如建立術語的標題與摘要)
+
+        self._async_http_client = None  # 非同步HTTP客戶端 (綁定建立時的事件迴圈)
+        self._async_http_loop = None
+
+    def set_history_window(self, max_turns: Optional[int], pinned_turns: int = 0):
+        """
+        設定多輪對話的上下文視窗，使每次請求的Token用量不隨對話長度增加
+
+        Args:
+            max_turns: 保留的最近輪數 (None 表示保留全部對話紀錄)
+            pinned_turns: 固定保留的最初輪數
+        """
+        self.history_window = max(max_turns, 0) if max_turns is not None else None
+        self.pinned_turns = max(pinned_turns, 0)
+
+    def _trim_history(self, turns: List[Any]) -> List[Any]:
+        """
+        依上下文視窗裁剪多輪對話紀錄 (不含系統提示)
+
+        Args:
+            turns: 對話訊息列表，依序為成對的使用者訊息與模型回覆
+
+        Returns:
+            List: 保留最初 pinned_turns 輪及最近 history_window 輪的訊息列表
+        """
+        if self.history_window is None:
+            return turns
+
+        pairs = [turns[index:index + 2] for index in range(0, len(turns), 2)]
+        if len(pairs) <= self.pinned_turns + self.history_window:
+            return turns
+
+        recent = pairs[-self.history_window:] if self.history_window > 0 else []
+        kept = pairs[:self.pinned_turns] + recent
+        return [message for pair in kept for message in pair]
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """當前提供者與模型共享的速率限制器"""
+        return RateLimiterRegistry.get(self.provider, self.model_name)
+
+    @property
+    def concurrency(self) -> AdaptiveConcurrencyController:
+        """當前提供者與模型共享的自適應併發控制器"""
+        return ConcurrencyControllerRegistry.get(self.provider, self.model_name)
+
+    def _report_congestion(self, retry_after: Optional[float] = None):
+        """
+        回報壅塞 (429、5xx或逾時)：減少併發上限，附帶等待時間時同時暫停速率限制器
+
+        Args:
+            retry_after: 伺服器要求的等待秒數 (None 表示未指定)
+        """
+        if retry_after:
+            self.rate_limiter.backoff(retry_after)
+        self.concurrency.on_congestion(retry_after)
+
+    def _throttle(self, text: Union[str, List[str], None]) -> float:
+        """
+        在發送請求前取得速率限制配額
+
+        Args:
+            text: 此次請求將送出的文本 (用於估算Token數量)
+
+        Returns:
+            float: 等待的秒數
+        """
+        return self.rate_limiter.acquire(tokens=estimate_tokens(text))
+
+    async def _throttle_async(self, text: Union[str, List[str], None]) -> float:
+        """在發送非同步請求前取得速率限制配額 (等待時不阻塞事件迴圈)"""
+        return await self.rate_limiter.acquire_async(tokens=estimate_tokens(text))
+
+    def _get_async_http_client(self, timeout: float = 90.0):
+        """
+        取得共用連線池的非同步HTTP客戶端 (同一事件迴圈內的所有請求共用連線並保持連線)
+
+        Args:
+            timeout: 預設的請求逾時秒數
+
+        Returns:
+            httpx.AsyncClient: 非同步HTTP客戶端
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_http_client
+        if client is None or client.is_closed or self._async_http_loop is not loop:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.async_max_connections,
+                    max_keepalive_connections=self.async_max_keepalive_connections
+                ),
+                timeout=timeout
+            )
+            self._async_http_client = client
+            self._async_http_loop = loop
+        return client
+
+    async def aclose(self):
+        """關閉非同步HTTP客戶端的連線池"""
+        if self._async_http_client is not None and not self._async_http_client.is_closed:
+            await self._async_http_client.aclose()
+        self._async_http_client = None
+        self._async_http_loop = None
+
+    def check_available(self) -> bool:
+        """
+        檢查服務是否可用 (使用快取結果，過期後才重新發送檢查請求)
+
+        Returns:
+            bool: 服務是否可用
+        """
+        if self._available is not None:
+            ttl = self.availability_ttl if self._available else self.unavailability_ttl
+            if time.monotonic() - self._available_checked_at < ttl:
+                return self._available
+        return self.refresh_availability()
+
+    def refresh_availability(self) -> bool:
+        """
+        立即重新檢查服務可用性並更新快取
+
+        Returns:
+            bool: 服務是否可用
+        """
+        available = bool(self.is_available())
+        self._available = available
+        self._available_checked_at = time.monotonic()
+        return available
+
+    async def check_available_async(self) -> bool:
+        """
+        非同步檢查服務是否可用 (快取過期時於執行緒中重新檢查，不阻塞事件迴圈)
+
+        Returns:
+            bool: 服務是否可用
+        """
+        if self._available is not None:
+            ttl = self.availability_ttl if self._available else self.unavailability_ttl
+            if time.monotonic() - self._available_checked_at < ttl:
+                return self._available
+        return await asyncio.to_thread(self.refresh_availability)
+
+    def invalidate_availability(self):
+        """使快取的可用狀態失效 (連線錯誤或更新設定後呼叫)"""
+        self._available = None
+
     def is_available(self, model_name: str = None) -> bool:
         """檢查服務是否可用"""
         raise NotImplementedError("子類別必須實現此方法。")
@@ -49,4 +214,25 @@ class BaseLLMService:
         將文本轉換為嵌入向量。
         這是一個抽象方法，具體實現應由子類完成。
         """
-        raise NotImplementedError("子類別必須實現此方法。")
\ No newline at end of file
+        raise NotImplementedError("子類別必須實現此方法。")
+
+    async def async_send_single_request(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """
+        非同步發送單次請求 (不支援流式回應)。
+        預設於執行緒中呼叫同步方法，子類可改以非同步客戶端實現。
+        """
+        return await asyncio.to_thread(self.send_single_request, prompt, system_prompt=system_prompt)
+
+    async def async_send_multi_request(self, prompt: str, system_prompt: Optional[str] = None, end_chat: bool = False) -> Optional[str]:
+        """
+        非同步發送多輪請求 (與同步方法共用對話紀錄，同一服務的多輪對話需依序呼叫)。
+        預設於執行緒中呼叫同步方法，子類可改以非同步客戶端實現。
+        """
+        return await asyncio.to_thread(self.send_multi_request, prompt, system_prompt, end_chat)
+
+    async def async_send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
+        """
+        非同步將文本轉換為嵌入向量。
+        預設於執行緒中呼叫同步方法，子類可改以非同步客戶端實現。
+        """
+        return await asyncio.to_thread(self.send_embedding_request, text, store)
\ No newline at end of file
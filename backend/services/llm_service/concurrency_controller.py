@@ -0,0 +1,253 @@
+"""
+自適應併發控制 - 以AIMD (加法增加、乘法減少) 依延遲及限流回應調整各LLM服務提供者的同時請求數量
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Any
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ConcurrencySlot:
+    """
+    併發配額 (由 `AdaptiveConcurrencyController.slot` 提供)
+
+    Args:
+        success: 請求是否成功 (呼叫端在請求失敗時設為 False，失敗的請求不增加併發數量)
+    """
+    success: bool = True
+
+class AdaptiveConcurrencyController:
+    """
+    ### 自適應併發控制器
+
+    - 請求成功且延遲未超過基準延遲 (近期成功請求延遲的中位數) 的容許倍數時，併發上限每輪增加 `increase_step`
+      (每次成功增加 `increase_step / limit`)
+    - 延遲超過容許倍數時維持上限 (排隊現象，不再增加)
+    - 收到429、5xx或逾時 (`on_congestion`) 時上限乘以 `decrease_factor`，冷卻時間內的多次回報只減少一次；
+      附帶 Retry-After 時在該時間內暫停發出新請求
+    """
+    def __init__(self,
+            initial_limit: int = 4,
+            min_limit: int = 1,
+            max_limit: int = 16,
+            increase_step: float = 1.0,
+            decrease_factor: float = 0.5,
+            latency_tolerance: float = 2.0,
+            decrease_cooldown: float = 2.0,
+            latency_window: int = 50,
+            enabled: bool = True
+        ):
+        """
+        初始化自適應併發控制器
+
+        Args:
+            initial_limit: 初始併發上限
+            min_limit: 併發上限的最小值
+            max_limit: 併發上限的最大值
+            increase_step: 每輪 (約 limit 次成功請求) 增加的併發數量
+            decrease_factor: 壅塞時併發上限的乘數 (0~1)
+            latency_tolerance: 延遲超過基準延遲多少倍時停止增加
+            decrease_cooldown: 兩次乘法減少之間的最短秒數 (避免同一波限流回應重複減少)
+            latency_window: 計算基準延遲保留的近期成功請求數量
+            enabled: 是否啟用 (停用時不限制併發，只記錄統計資料)
+        """
+        self.min_limit = max(int(min_limit), 1)
+        self.max_limit = max(int(max_limit), self.min_limit)
+        self.increase_step = increase_step
+        self.decrease_factor = min(max(decrease_factor, 0.05), 0.95)
+        self.latency_tolerance = latency_tolerance
+        self.decrease_cooldown = decrease_cooldown
+        self.enabled = enabled
+
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self._latencies = deque(maxlen=max(latency_window, 1))
+        self._blocked_until = 0.0       # Retry-After 指定的暫停時間點
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+        # 統計資料
+        self._total_requests = 0
+        self._total_failures = 0
+        self._congestion_count = 0
+        self._decrease_count = 0
+
+    def _baseline_latency(self) -> Optional[float]:
+        """近期成功請求延遲的中位數 (紀錄不足時返回 None)"""
+        if len(self._latencies) < 5:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[len(ordered) // 2]
+
+    def _wait_time(self, now: float) -> Optional[float]:
+        """可發出請求時返回 None，否則返回需等待的秒數 (0 表示等待其他請求歸還配額，需持有鎖)"""
+        if not self.enabled:
+            return None
+        if self._blocked_until > now:
+            return self._blocked_until - now
+        if self.in_flight >= int(self.limit):
+            return 0.0
+        return None
+
+    def acquire(self):
+        """取得一個併發配額，必要時阻塞等待"""
+        with self._condition:
+            while True:
+                wait_time = self._wait_time(time.monotonic())
+                if wait_time is None:
+                    break
+                self._condition.wait(timeout=wait_time or None)
+            self.in_flight += 1
+            self._total_requests += 1
+
+    async def acquire_async(self):
+        """取得一個併發配額，必要時以非阻塞方式等待 (不佔用事件迴圈)"""
+        while True:
+            with self._condition:
+                wait_time = self._wait_time(time.monotonic())
+                if wait_time is None:
+                    self.in_flight += 1
+                    self._total_requests += 1
+                    return
+            await asyncio.sleep(wait_time or 0.05)
+
+    def release(self, success: bool = True, latency: Optional[float] = None):
+        """
+        歸還併發配額並依結果調整上限
+
+        Args:
+            success: 請求是否成功
+            latency: 請求延遲秒數 (僅成功時用於調整上限)
+        """
+        with self._condition:
+            self.in_flight = max(self.in_flight - 1, 0)
+            if not success:
+                self._total_failures += 1
+            elif latency is not None:
+                baseline = self._baseline_latency()
+                self._latencies.append(latency)
+                if baseline is None or latency <= baseline * self.latency_tolerance:
+                    self.limit = min(self.limit + self.increase_step / self.limit, float(self.max_limit))
+            self._condition.notify_all()
+
+    def on_congestion(self, retry_after: Optional[float] = None):
+        """
+        回報壅塞 (429、5xx或逾時)，乘法減少併發上限
+
+        Args:
+            retry_after: 伺服器要求的等待秒數 (Retry-After)，期間暫停發出新請求
+        """
+        with self._condition:
+            now = time.monotonic()
+            self._congestion_count += 1
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            if now - self._last_decrease >= self.decrease_cooldown:
+                previous = self.limit
+                self.limit = max(self.limit * self.decrease_factor, float(self.min_limit))
+                self._last_decrease = now
+                self._decrease_count += 1
+                logger.warning(f"[ConcurrencyController] 偵測到壅塞，併發上限 {previous:.1f} → {self.limit:.1f}")
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """
+        以 with 區塊取得併發配額，結束時依 `ConcurrencySlot.success` 及經過時間歸還
+
+        Yields:
+            ConcurrencySlot: 併發配額 (請求失敗時將 success 設為 False)
+        """
+        self.acquire()
+        holder = ConcurrencySlot()
+        start = time.monotonic()
+        try:
+            yield holder
+        except BaseException:
+            holder.success = False
+            raise
+        finally:
+            self.release(holder.success, time.monotonic() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """獲取控制器當前狀態"""
+        with self._condition:
+            baseline = self._baseline_latency()
+            return {
+                "enabled": self.enabled,
+                "limit": round(self.limit, 2),
+                "window": int(self.limit),
+                "in_flight": self.in_flight,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "baseline_latency": round(baseline, 3) if baseline is not None else None,
+                "blocked_seconds": round(max(self._blocked_until - time.monotonic(), 0.0), 2),
+                "total_requests": self._total_requests,
+                "total_failures": self._total_failures,
+                "congestion_count": self._congestion_count,
+                "decrease_count": self._decrease_count
+            }
+
+class ConcurrencyControllerRegistry:
+    """
+    併發控制器註冊表 - 依 (服務提供者, 模型) 共享控制器
+
+    同一提供者與模型的所有服務實例 (翻譯、Embedding、RAG問答) 共用同一個併發上限。
+    併發上限最大值的鍵可為 "provider" 或 "provider/model"，後者優先，皆未設定時使用 "default"。
+    """
+    _settings: Dict[str, Any] = {}
+    _max_limits: Dict[str, int] = {}
+    _controllers: Dict[Tuple[str, str], AdaptiveConcurrencyController] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, settings: Dict[str, Any], max_limits: Dict[str, int]):
+        """
+        設定併發控制 (會重建所有控制器)
+
+        Args:
+            settings: 控制器參數，例如 {"enabled": True, "initial_limit": 4, "decrease_factor": 0.5}
+            max_limits: 各服務提供者的併發上限最大值，例如 {"ollama": 2, "google": 16, "default": 8}
+        """
+        with cls._lock:
+            cls._settings = dict(settings or {})
+            cls._max_limits = dict(max_limits or {})
+            cls._controllers = {}
+        logger.info(f"[ConcurrencyControllerRegistry] 併發控制設定完成: {cls._max_limits}")
+
+    @classmethod
+    def get(cls, provider: str, model_name: str) -> AdaptiveConcurrencyController:
+        """
+        獲取 (服務提供者, 模型) 對應的併發控制器，不存在則依設定建立
+
+        Args:
+            provider: 服務提供者名稱
+            model_name: 模型名稱
+
+        Returns:
+            AdaptiveConcurrencyController: 共享的併發控制器
+        """
+        key = (provider, model_name)
+        with cls._lock:
+            controller = cls._controllers.get(key)
+            if controller is None:
+                max_limit = cls._max_limits.get(f"{provider}/{model_name}", cls._max_limits.get(provider, cls._max_limits.get("default", 16)))
+                controller = AdaptiveConcurrencyController(max_limit=max_limit, **cls._settings)
+                cls._controllers[key] = controller
+            return controller
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Dict[str, Any]]:
+        """獲取所有控制器的狀態 (鍵為 "provider/model")"""
+        with cls._lock:
+            controllers = dict(cls._controllers)
+        return {f"{provider}/{model}": controller.snapshot() for (provider, model), controller in controllers.items()}
@@ -1,6 +1,6 @@
 from google import genai
-from google.genai import types
-import time
+from google.genai import types, errors
+import httpx
 from typing import Optional, List, Generator, Union
 
 from .base_service import BaseLLMService
@@ -15,6 +15,7 @@ class GoogleService(BaseLLMService):
     """
     ### Google LLM服務，使用Google Gemini API進行文本處理。
     """
+    provider: str = "google"
 
     def __init__(self, 
             model_name: str,
@@ -33,7 +34,8 @@ class GoogleService(BaseLLMService):
 
         self.client = None
         self._in_multi_turn = False  # 是否處於多輪對話中
-        self._chat_object = None     # 多輪對話物件
+        self._chat: List[types.Content] = []                        # 多輪對話紀錄 (自行管理以套用上下文視窗)
+        self._chat_config: Optional[types.GenerateContentConfig] = None  # 多輪對話設定
 
         if self.update_config(api_key=api_key, model_name=model_name):
             if self.verbose:
@@ -75,6 +77,7 @@ class GoogleService(BaseLLMService):
                 # 測試成功，更新配置
                 self.client = new_client
                 self.model_name = model_name
+                self.invalidate_availability()
                 if self.verbose:
                     logger.info(f"Gemini服務配置更新成功: 模型 {self.model_name}")
                 return True
@@ -126,7 +129,7 @@ class GoogleService(BaseLLMService):
         Returns:
             str: 模型回覆的文本
         """
-        if not self.is_available():
+        if not self.check_available():
             logger.warning("Gemini服務不可用，無法發送請求")
             return None
         else:
@@ -134,43 +137,29 @@ class GoogleService(BaseLLMService):
                 logger.info(f"Gemini發送請求，模型: {self.model_name}, 流式: {stream}")
 
         try:
+            self._throttle([system_prompt, prompt])
             if stream:
                 response = self.client.models.generate_content_stream(
                     model=self.model_name, 
                     contents=prompt,
-                    config=types.GenerateContentConfig(
-                        temperature=0.2,
-                        top_p=0.8,
-                        top_k=30,
-                        thinking_config=types.ThinkingConfig(thinking_budget=0),
-                        system_instruction=system_prompt
-                    )
+                    config=self._generation_config(system_prompt)
                 )
                 return self._handle_stream_response(response)
             else:
                 response = self.client.models.generate_content(
                     model=self.model_name, 
                     contents=prompt,
-                    config=types.GenerateContentConfig(
-                        temperature=0.2,
-                        top_p=0.8,
-                        top_k=30,
-                        thinking_config=types.ThinkingConfig(thinking_budget=0),
-                        system_instruction=system_prompt
-                    )
+                    config=self._generation_config(system_prompt)
                 )
 
-                if response.status_code == 200:
+                if response and response.text:
                     return response.text
-                elif response.status_code == 429:
-                    logger.warning("Gemini請求過多，請稍後再試")
-                    time.sleep(3)  # 簡單的重試機制，等待3秒
                 else:
-                    logger.error(f"Gemini請求失敗: {response.status_code} - {response.text}")
+                    logger.error(f"Gemini未獲取到回覆，響應數據: {response}")
                 return None
 
         except Exception as e:
-            logger.error(f"Gemini請求執行時出錯: {e}")
+            self._handle_api_error(e, "請求")
             return None
 
     def send_multi_request(self, 
@@ -189,7 +178,7 @@ class GoogleService(BaseLLMService):
         Returns:
             str: 模型回覆的文本
         """
-        if not self.is_available():
+        if not self.check_available():
             logger.warning("Gemini服務不可用，無法發送多輪請求")
             return None
         else:
@@ -201,31 +190,174 @@ class GoogleService(BaseLLMService):
             if self.verbose:
                 logger.info("結束多輪對話")
             self._in_multi_turn = False
-            self._chat_object = None
+            self._chat = []
+            self._chat_config = None
             return None
 
         if not self._in_multi_turn:
-            self._chat_object = self.client.chats.create(
-                model=self.model_name,
-                config=types.GenerateContentConfig(
-                    temperature=0.2,
-                    top_p=0.8,
-                    top_k=30,
-                    thinking_config=types.ThinkingConfig(thinking_budget=0),
-                    system_instruction=system_prompt
-                )
-            )
+            self._chat = []
+            self._chat_config = self._generation_config(system_prompt)
             self._in_multi_turn = True
             if self.verbose:
-                logger.info("初始化多輪對話物件")
+                logger.info("初始化多輪對話")
 
-        response = self._chat_object.send_message(prompt)
-        if response:
+        user_content = types.Content(role="user", parts=[types.Part(text=prompt)])
+        contents = self._chat + [user_content]
+        try:
+            self._throttle([system_prompt] + [part.text for content in contents for part in content.parts if part.text])
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=contents,
+                config=self._chat_config
+            )
+        except Exception as e:
+            self._handle_api_error(e, "多輪請求")
+            return None
+
+        if response and response.text:
+            self._chat = self._trim_history(
+                contents + [types.Content(role="model", parts=[types.Part(text=response.text)])]
+            )
             return response.text
         else:
             logger.error("多輪請求失敗")
             return None
 
+    def _generation_config(self, system_prompt: Optional[str]) -> types.GenerateContentConfig:
+        """建立文本生成設定"""
+        return types.GenerateContentConfig(
+            temperature=0.2,
+            top_p=0.8,
+            top_k=30,
+            thinking_config=types.ThinkingConfig(thinking_budget=0),
+            system_instruction=system_prompt
+        )
+
+    def _get_retry_after(self, error: errors.APIError, default: float = 3.0) -> float:
+        """從限流錯誤中取得建議的等待秒數 (錯誤詳情中 RetryInfo 的 retryDelay，或 Retry-After 標頭)"""
+        try:
+            details = error.details.get("error", error.details) if isinstance(error.details, dict) else {}
+            for detail in details.get("details", []) or []:
+                if str(detail.get("@type", "")).endswith("RetryInfo") and detail.get("retryDelay"):
+                    return float(str(detail["retryDelay"]).rstrip("s"))
+            return float(error.response.headers.get("retry-after", default))
+        except (AttributeError, TypeError, ValueError):
+            return default
+
+    def _handle_api_error(self, e: Exception, action: str):
+        """處理Gemini請求錯誤 (限流、伺服器錯誤及逾時時回報壅塞，伺服器錯誤時使可用狀態失效)"""
+        if isinstance(e, errors.APIError):
+            if e.code == 429:
+                logger.warning(f"Gemini{action}過多，請稍後再試")
+                self._report_congestion(self._get_retry_after(e))  # 暫停所有共享此配額的請求
+                return
+            logger.error(f"Gemini{action}失敗: {e.code} - {e.message}")
+            if e.code >= 500:
+                self.invalidate_availability()
+                self._report_congestion()
+            return
+        logger.error(f"Gemini{action}執行時出錯: {e}")
+        self.invalidate_availability()
+        if isinstance(e, httpx.TimeoutException):
+            self._report_congestion()
+
+    async def _async_generate(self, contents: Union[str, List[types.Content]], config: types.GenerateContentConfig, texts: List[Optional[str]]) -> Optional[str]:
+        """以非同步客戶端發送文本生成請求並取得回覆文本"""
+        try:
+            await self._throttle_async(texts)
+            response = await self.client.aio.models.generate_content(model=self.model_name, contents=contents, config=config)
+        except Exception as e:
+            self._handle_api_error(e, "請求")
+            return None
+
+        if response and response.text:
+            return response.text
+        logger.error(f"Gemini未獲取到回覆，響應數據: {response}")
+        return None
+
+    async def async_send_single_request(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """
+        非同步發送單次請求到Google服務
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示文本
+
+        Returns:
+            str: 模型回覆的文本 (若失敗則返回None)
+        """
+        if not await self.check_available_async():
+            logger.warning("Gemini服務不可用，無法發送請求")
+            return None
+        return await self._async_generate(prompt, self._generation_config(system_prompt), [system_prompt, prompt])
+
+    async def async_send_multi_request(self, prompt: str, system_prompt: Optional[str] = None, end_chat: bool = False) -> Optional[str]:
+        """
+        非同步發送多輪請求到Google服務 (與同步方法共用對話紀錄)
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示文本
+            end_chat: 是否立即結束多輪對話 (結束對話回傳 None)
+
+        Returns:
+            str: 模型回覆的文本 (若失敗則返回None)
+        """
+        if end_chat:
+            self._in_multi_turn = False
+            self._chat = []
+            self._chat_config = None
+            return None
+
+        if not await self.check_available_async():
+            logger.warning("Gemini服務不可用，無法發送多輪請求")
+            return None
+
+        if not self._in_multi_turn:
+            self._chat = []
+            self._chat_config = self._generation_config(system_prompt)
+            self._in_multi_turn = True
+
+        contents = self._chat + [types.Content(role="user", parts=[types.Part(text=prompt)])]
+        texts = [system_prompt] + [part.text for content in contents for part in content.parts if part.text]
+        response = await self._async_generate(contents, self._chat_config, texts)
+        if response:
+            self._chat = self._trim_history(contents + [types.Content(role="model", parts=[types.Part(text=response)])])
+        return response
+
+    async def async_send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
+        """
+        非同步發送embedding請求到Google服務
+
+        Args:
+            text: 需要向量化的字串
+            store: 是否為存儲用途 True: 存儲, False: 搜索
+
+        Returns:
+            List[List[float]]: 向量化結果 (出現錯誤則返回 None)
+        """
+        if not await self.check_available_async():
+            logger.warning("Gemini服務不可用，無法發送embedding請求")
+            return None
+
+        try:
+            await self._throttle_async(text)
+            response = await self.client.aio.models.embed_content(
+                model=self.model_name,
+                contents=text,
+                config=types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT" if store else "RETRIEVAL_QUERY")
+            )
+        except Exception as e:
+            self._handle_api_error(e, " embedding請求")
+            return None
+
+        if response and response.embeddings:
+            if self.verbose:
+                logger.info("Gemini獲取embedding成功")
+            return [embedding.values for embedding in response.embeddings]
+        logger.error(f"Gemini未獲取到embedding，響應數據: {response}")
+        return None
+
     def send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
         """
         發送embedding請求到Google服務
@@ -237,11 +369,12 @@ class GoogleService(BaseLLMService):
         Returns:
             Union (List[float] | List[List[float]]): 單個或多個向量化結果 (出現錯誤則返回 None)
         """
-        if not self.is_available():
+        if not self.check_available():
             logger.warning("Gemini服務不可用，無法發送embedding請求")
             return None
 
         try:
+            self._throttle(text)
             response = self.client.models.embed_content(
                 model=self.model_name,
                 contents=text,
@@ -257,5 +390,5 @@ class GoogleService(BaseLLMService):
                 logger.error(f"Gemini未獲取到embedding，響應數據: {response}")
                 return None
         except Exception as e:
-            logger.error(f"Gemini獲取embedding時出錯: {e}")
+            self._handle_api_error(e, " embedding請求")
             return None
\ No newline at end of file
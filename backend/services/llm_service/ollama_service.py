@@ -1,4 +1,5 @@
 import requests
+import httpx
 from typing import Optional, Generator, List, Union
 import os
 import json
@@ -15,6 +16,8 @@ class OllamaService(BaseLLMService):
     """
     ### Ollama LLM服務
     """
+    provider: str = "ollama"
+
     def __init__(self,
             model_name: str,
             verbose: bool = False
@@ -69,7 +72,7 @@ class OllamaService(BaseLLMService):
         Returns:
             bool: 配置是否更新成功且服務可用
         """
-        if self.is_available():
+        if self.refresh_availability():
             if model_name:
                 self.model_name = model_name
             if self.verbose:
@@ -98,10 +101,10 @@ class OllamaService(BaseLLMService):
                     data = json.loads(line.decode('utf-8'))
                     if data.get('done'):
                         break
-                    if 'response' in data:
-                        chunk = data['response']
-                        if chunk:
-                            yield chunk
+                    # /api/chat 的片段位於 message.content，/api/generate 則為 response
+                    chunk = data.get('message', {}).get('content') or data.get('response')
+                    if chunk:
+                        yield chunk
                 yield ""
             except Exception as e:
                 logger.error(f"處理流式回應時出錯: {e}")
@@ -124,7 +127,7 @@ class OllamaService(BaseLLMService):
         Returns:
             (str | Generator[OllamaStreamResponse, None, None]): 模型回覆的文本，若使用流式回應則返回生成器 (若失敗則返回None)
         """
-        if not self.is_available():
+        if not self.check_available():
             logger.warning("Ollama服務不可用，無法發送請求")
             return None
         else:
@@ -138,8 +141,9 @@ class OllamaService(BaseLLMService):
                 if system_prompt:
                     messages.append({"role": "system", "content": system_prompt})
                 messages.append({"role": "user", "content": prompt})
+                self._throttle([system_prompt, prompt])
                 response = self.session.post(
-                    f"{self.base_url}/api/generate",
+                    f"{self.base_url}/api/chat",
                     json={
                         "model": self.model_name,
                         "messages": messages,
@@ -150,6 +154,7 @@ class OllamaService(BaseLLMService):
                 )
             else:
                 self._chat.append({"role": "user", "content": prompt})
+                self._throttle(json.dumps(self._chat, ensure_ascii=False))
                 response = self.session.post(
                     f"{self.base_url}/api/chat",
                     json={
@@ -169,7 +174,8 @@ class OllamaService(BaseLLMService):
 
             if response.status_code == 200:
                 result = response.json()
-                respond_text = result.get("response", "").strip()
+                # /api/chat 的回覆位於 message.content，/api/generate 則為 response
+                respond_text = (result.get("message", {}).get("content") or result.get("response", "")).strip()
                 if respond_text:
                     if self.verbose:
                         logger.info("Ollama獲取回覆成功")
@@ -179,13 +185,19 @@ class OllamaService(BaseLLMService):
                     return None
             elif response.status_code == 429:
                 logger.warning("Ollama請求過於頻繁")
+                self._report_congestion(float(response.headers.get("Retry-After", 3)))
             else:
                 logger.error(f"Ollama請求錯誤: {response.status_code} - {response.text}")
+                if response.status_code >= 500:
+                    self._report_congestion()
 
         except requests.exceptions.Timeout:
             logger.error("Ollama請求超時")
+            self.invalidate_availability()
+            self._report_congestion()
         except requests.exceptions.RequestException as e:
             logger.error(f"Ollama請求錯誤: {e}")
+            self.invalidate_availability()
         except Exception as e:
             logger.error(f"Ollama未知錯誤: {e}")
 
@@ -206,7 +218,7 @@ class OllamaService(BaseLLMService):
         Returns:
             str: 模型回覆的文本 (若失敗則返回None)
         """
-        if not self.is_available():
+        if not self.check_available():
             logger.warning("Ollama服務不可用，無法發送請求")
             return None
         else:
@@ -221,7 +233,7 @@ class OllamaService(BaseLLMService):
             return None
 
         if not self._in_multi_turn:
-            self._chat = [system_prompt] if system_prompt else []
+            self._chat = [{"role": "system", "content": system_prompt}] if system_prompt else []
             self._in_multi_turn = True
             if self.verbose:
                 logger.info("開始多輪對話")
@@ -229,10 +241,146 @@ class OllamaService(BaseLLMService):
         response = self.send_single_request(prompt, stream=False)
         if response is not None:
             self._chat.append({"role": "assistant", "content": response})
+            self._trim_chat()
             return response
         else:
+            if self._chat and self._chat[-1]["role"] == "user":
+                self._chat.pop()  # 移除未獲得回覆的使用者訊息，保持對話成對
+            return None
+
+    async def _async_post(self, endpoint: str, payload: dict, timeout: float) -> Optional[dict]:
+        """
+        以共用連線池發送非同步請求到Ollama服務
+
+        Args:
+            endpoint: API路徑 (例如 /api/chat)
+            payload: 請求內容
+            timeout: 逾時秒數
+
+        Returns:
+            dict: 回應的JSON資料 (若失敗則返回None)
+        """
+        try:
+            response = await self._get_async_http_client().post(f"{self.base_url}{endpoint}", json=payload, timeout=timeout)
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 429:
+                logger.warning("Ollama請求過於頻繁")
+                self._report_congestion(float(response.headers.get("Retry-After", 3)))
+            else:
+                logger.error(f"Ollama請求錯誤: {response.status_code} - {response.text}")
+                if response.status_code >= 500:
+                    self._report_congestion()
+        except httpx.TimeoutException:
+            logger.error("Ollama請求超時")
+            self.invalidate_availability()
+            self._report_congestion()
+        except httpx.HTTPError as e:
+            logger.error(f"Ollama請求錯誤: {e}")
+            self.invalidate_availability()
+        except Exception as e:
+            logger.error(f"Ollama未知錯誤: {e}")
+        return None
+
+    async def _async_chat(self, messages: List[dict]) -> Optional[str]:
+        """非同步發送對話請求並取得回覆文本"""
+        await self._throttle_async(json.dumps(messages, ensure_ascii=False))
+        result = await self._async_post("/api/chat", {"model": self.model_name, "messages": messages, "stream": False}, timeout=90)
+        if result is None:
+            return None
+
+        respond_text = (result.get("message", {}).get("content") or result.get("response", "")).strip()
+        if not respond_text:
+            logger.error(f"Ollama未獲取到回覆，響應數據: {result}")
+            return None
+        if self.verbose:
+            logger.info("Ollama獲取回覆成功")
+        return respond_text
+
+    async def async_send_single_request(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """
+        非同步發送單次請求到Ollama服務 (不使用多輪對話紀錄)
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示文本
+
+        Returns:
+            str: 模型回覆的文本 (若失敗則返回None)
+        """
+        if not await self.check_available_async():
+            logger.warning("Ollama服務不可用，無法發送請求")
+            return None
+
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        return await self._async_chat(messages)
+
+    async def async_send_multi_request(self, 
+            prompt: str, 
+            system_prompt: Optional[str] = None,
+            end_chat: bool = False
+        ) -> Optional[str]:
+        """
+        非同步發送多輪請求到Ollama服務 (與同步方法共用對話紀錄)
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示文本
+            end_chat: 是否立即結束多輪對話 (結束對話回傳 None)
+
+        Returns:
+            str: 模型回覆的文本 (若失敗則返回None)
+        """
+        if end_chat:
+            self._in_multi_turn = False
+            self._chat = None
             return None
 
+        if not await self.check_available_async():
+            logger.warning("Ollama服務不可用，無法發送請求")
+            return None
+
+        if not self._in_multi_turn:
+            self._chat = [{"role": "system", "content": system_prompt}] if system_prompt else []
+            self._in_multi_turn = True
+
+        messages = self._chat + [{"role": "user", "content": prompt}]
+        response = await self._async_chat(messages)
+        if response is not None:
+            self._chat = messages + [{"role": "assistant", "content": response}]
+            self._trim_chat()
+        return response
+
+    async def async_send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
+        """
+        非同步發送embedding請求到Ollama服務
+
+        Args:
+            text: 需要向量化的字串 or 字串列表
+            store: 是否為存儲用途 (僅Gemini適用，Ollama忽略)
+
+        Returns:
+            List[List[float]]: 向量化結果 (出現錯誤則返回 None)
+        """
+        await self._throttle_async(text)
+        result = await self._async_post("/api/embed", {"model": self.model_name, "input": text, "stream": False}, timeout=30)
+        if result is None:
+            return None
+
+        embedding = result.get('embeddings')
+        if not embedding:
+            logger.error(f"Ollama未獲取到embedding，響應數據: {result}")
+            return None
+        if self.verbose:
+            logger.info("Ollama獲取embedding成功")
+        return embedding
+
+    def _trim_chat(self):
+        """依上下文視窗裁剪多輪對話紀錄 (保留系統提示)"""
+        head = 1 if self._chat and self._chat[0]["role"] == "system" else 0
+        self._chat = self._chat[:head] + self._trim_history(self._chat[head:])
+
     def send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
         """
         發送embedding請求到Ollama服務
@@ -246,6 +394,7 @@ class OllamaService(BaseLLMService):
 
         """
         try:
+            self._throttle(text)
             response = self.session.post(
                 f"{self.base_url}/api/embed",
                 json={
@@ -268,11 +417,16 @@ class OllamaService(BaseLLMService):
                     return None
             else:
                 logger.error(f"Ollama請求錯誤: {response.status_code} - {response.text}")
+                if response.status_code >= 500:
+                    self._report_congestion()
 
         except requests.exceptions.Timeout:
             logger.error("Ollama請求超時")
+            self.invalidate_availability()
+            self._report_congestion()
         except requests.exceptions.RequestException as e:
             logger.error(f"Ollama請求錯誤: {e}")
+            self.invalidate_availability()
         except Exception as e:
             logger.error(f"Ollama未知錯誤: {e}")
 
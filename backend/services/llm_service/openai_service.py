@@ -1,4 +1,4 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
 import requests
 from typing import Optional, List, Generator, Union
 
@@ -14,6 +14,7 @@ class OpenAIService(BaseLLMService):
     """
     ### OpenAI服務基類，使用OpenAI API進行文本處理。
     """
+    provider: str = "openai"
 
     def __init__(self, 
             model_name: str,
@@ -33,6 +34,8 @@ class OpenAIService(BaseLLMService):
         self._in_multi_turn = False  # 是否處於多輪對話中
         self._chat = None     # 多輪對話物件
         self.client = None
+        self._async_client: Optional[AsyncOpenAI] = None  # 非同步客戶端 (使用共用連線池)
+        self._async_client_http = None                    # 非同步客戶端使用的HTTP連線池
 
         if self.update_config(api_key=api_key, model_name=model_name):
             if self.verbose:
@@ -83,6 +86,7 @@ class OpenAIService(BaseLLMService):
                 # 測試成功，更新配置
                 self.client = new_client
                 self.model_name = model_name
+                self.invalidate_availability()
                 if self.verbose:
                     logger.info(f"OpenAI服務配置更新成功: 模型 {self.model_name}")
                 return True
@@ -93,6 +97,13 @@ class OpenAIService(BaseLLMService):
             logger.error(f"更新OpenAI服務配置時出錯: {e}")
             return False
 
+    def _get_retry_after(self, error: RateLimitError, default: float = 3.0) -> float:
+        """從限流錯誤的回應標頭中取得建議的等待秒數"""
+        try:
+            return float(error.response.headers.get("retry-after", default))
+        except (AttributeError, TypeError, ValueError):
+            return default
+
     def _handle_stream_response(self, response: Generator) -> Generator[str, None, None]:
         """
         處理Google的流式回應
@@ -134,7 +145,7 @@ class OpenAIService(BaseLLMService):
         Returns:
             str: 模型回覆的文本 (若失敗則返回None)
         """
-        if not self.is_available():
+        if not self.check_available():
             logger.warning("OpenAI服務不可用，無法發送請求")
             return None
         else:
@@ -150,6 +161,7 @@ class OpenAIService(BaseLLMService):
                 if system_prompt:
                     messages.append({"role": "system", "content": system_prompt})
                 messages.append({"role": "user", "content": prompt})
+                self._throttle([system_prompt, prompt])
                 response = self.client.chat.completions.create(
                     model=self.model_name,
                     messages=messages,
@@ -159,6 +171,7 @@ class OpenAIService(BaseLLMService):
                 )
             else:
                 self._chat.append({"role": "user", "content": prompt})
+                self._throttle([message["content"] for message in self._chat])
                 response = self.client.chat.completions.create(
                     model=self.model_name,
                     messages=self._chat,
@@ -186,6 +199,20 @@ class OpenAIService(BaseLLMService):
             else:
                 logger.error(f"OpenAI請求錯誤或無效響應: {response}")
 
+        except RateLimitError as e:
+            logger.warning(f"OpenAI請求過多，請稍後再試: {e}")
+            self._report_congestion(self._get_retry_after(e))
+            return None
+        except InternalServerError as e:
+            logger.error(f"OpenAI伺服器錯誤: {e}")
+            self._report_congestion()
+            return None
+        except APIConnectionError as e:
+            logger.error(f"OpenAI連線錯誤: {e}")
+            self.invalidate_availability()
+            if isinstance(e, APITimeoutError):
+                self._report_congestion()
+            return None
         except Exception as e:
             logger.error(f"OpenAI請求錯誤: {e}")
             return None
@@ -205,7 +232,7 @@ class OpenAIService(BaseLLMService):
         Returns:
             str: 模型回覆的文本 (若失敗則返回None)
         """
-        if not self.is_available():
+        if not self.check_available():
             logger.warning("OpenAI服務不可用，無法發送請求")
             return None
         else:
@@ -228,9 +255,162 @@ class OpenAIService(BaseLLMService):
         response = self.send_single_request(prompt, stream=False)
         if response is not None:
             self._chat.append({"role": "assistant", "content": response})
+            self._trim_chat()
             return response
         else:
+            if self._chat and self._chat[-1]["role"] == "user":
+                self._chat.pop()  # 移除未獲得回覆的使用者訊息，保持對話成對
+            return None
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """取得使用共用連線池的非同步客戶端 (事件迴圈或API金鑰改變時重新建立)"""
+        http_client = self._get_async_http_client()
+        client = self._async_client
+        if client is None or self._async_client_http is not http_client or client.api_key != self.client.api_key:
+            client = AsyncOpenAI(api_key=self.client.api_key, http_client=http_client)
+            self._async_client = client
+            self._async_client_http = http_client
+        return client
+
+    async def _async_chat(self, messages: List[dict]) -> Optional[str]:
+        """非同步發送對話請求並取得回覆文本"""
+        try:
+            await self._throttle_async([message["content"] for message in messages])
+            response = await self._get_async_client().chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                temperature=0.2,
+                max_tokens=1200,
+            )
+            if response.choices and response.choices[0].message.content:
+                content = response.choices[0].message.content.strip()
+                if content:
+                    if self.verbose:
+                        logger.info("OpenAI獲取回覆成功")
+                    return content
+            logger.error(f"OpenAI未獲取到回覆，響應數據: {response}")
+            return None
+        except RateLimitError as e:
+            logger.warning(f"OpenAI請求過多，請稍後再試: {e}")
+            self._report_congestion(self._get_retry_after(e))
+            return None
+        except InternalServerError as e:
+            logger.error(f"OpenAI伺服器錯誤: {e}")
+            self._report_congestion()
+            return None
+        except APIConnectionError as e:
+            logger.error(f"OpenAI連線錯誤: {e}")
+            self.invalidate_availability()
+            if isinstance(e, APITimeoutError):
+                self._report_congestion()
+            return None
+        except Exception as e:
+            logger.error(f"OpenAI請求錯誤: {e}")
+            return None
+
+    async def async_send_single_request(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """
+        非同步發送單次請求到OpenAI服務 (不使用多輪對話紀錄)
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示文本
+
+        Returns:
+            str: 模型回覆的文本 (若失敗則返回None)
+        """
+        if not await self.check_available_async():
+            logger.warning("OpenAI服務不可用，無法發送請求")
             return None
+        if not prompt.strip():
+            return ""
+
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        return await self._async_chat(messages)
+
+    async def async_send_multi_request(self, 
+            prompt: str, 
+            system_prompt: Optional[str] = None,
+            end_chat: bool = False
+        ) -> Optional[str]:
+        """
+        非同步發送多輪請求到OpenAI服務 (與同步方法共用對話紀錄)
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示文本
+            end_chat: 是否立即結束多輪對話 (結束對話回傳 None)
+
+        Returns:
+            str: 模型回覆的文本 (若失敗則返回None)
+        """
+        if end_chat:
+            self._in_multi_turn = False
+            self._chat = None
+            return None
+
+        if not await self.check_available_async():
+            logger.warning("OpenAI服務不可用，無法發送請求")
+            return None
+
+        if not self._in_multi_turn:
+            self._chat = [{"role": "system", "content": system_prompt}] if system_prompt else []
+            self._in_multi_turn = True
+
+        messages = self._chat + [{"role": "user", "content": prompt}]
+        response = await self._async_chat(messages)
+        if response is not None:
+            self._chat = messages + [{"role": "assistant", "content": response}]
+            self._trim_chat()
+        return response
+
+    async def async_send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
+        """
+        非同步發送embedding請求到OpenAI服務
+
+        Args:
+            text: 需要向量化的字串
+            store: 是否為存儲用途 (僅Gemini適用，OpenAI忽略)
+
+        Returns:
+            List[List[float]]: 向量化結果 (出現錯誤則返回 None)
+        """
+        if not await self.check_available_async():
+            logger.warning("OpenAI服務不可用，無法發送embedding請求")
+            return None
+
+        try:
+            await self._throttle_async(text)
+            response = await self._get_async_client().embeddings.create(model=self.model_name, input=text)
+            if response.data:
+                if self.verbose:
+                    logger.info("OpenAI獲取embedding成功")
+                return [embed.embedding for embed in response.data]
+            logger.error(f"OpenAI未獲取到embedding，響應數據: {response}")
+            return None
+        except RateLimitError as e:
+            logger.warning(f"OpenAI embedding請求過多，請稍後再試: {e}")
+            self._report_congestion(self._get_retry_after(e))
+            return None
+        except InternalServerError as e:
+            logger.error(f"OpenAI embedding伺服器錯誤: {e}")
+            self._report_congestion()
+            return None
+        except APIConnectionError as e:
+            logger.error(f"OpenAI embedding連線錯誤: {e}")
+            self.invalidate_availability()
+            if isinstance(e, APITimeoutError):
+                self._report_congestion()
+            return None
+        except Exception as e:
+            logger.error(f"OpenAI embedding請求錯誤: {e}")
+            return None
+
+    def _trim_chat(self):
+        """依上下文視窗裁剪多輪對話紀錄 (保留系統提示)"""
+        head = 1 if self._chat and self._chat[0]["role"] == "system" else 0
+        self._chat = self._chat[:head] + self._trim_history(self._chat[head:])
 
     def send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
         """
@@ -244,13 +424,14 @@ class OpenAIService(BaseLLMService):
             Union (List[float] | List[List[float]]): 單個或多個向量化結果 (出現錯誤則返回 None)
         """
         try:
-            if not self.is_available():
+            if not self.check_available():
                 logger.warning("OpenAI服務不可用，無法發送embedding請求")
                 return None
             else:
                 if self.verbose:
                     logger.info(f"OpenAI發送embedding請求，模型: {self.model_name}")
 
+            self._throttle(text)
             response = self.client.embeddings.create(
                 model=self.model_name,
                 input=text
@@ -269,6 +450,20 @@ class OpenAIService(BaseLLMService):
                 logger.error(f"OpenAI embedding請求錯誤或無效響應: {response}")
                 return None
 
+        except RateLimitError as e:
+            logger.warning(f"OpenAI embedding請求過多，請稍後再試: {e}")
+            self._report_congestion(self._get_retry_after(e))
+            return None
+        except InternalServerError as e:
+            logger.error(f"OpenAI embedding伺服器錯誤: {e}")
+            self._report_congestion()
+            return None
+        except APIConnectionError as e:
+            logger.error(f"OpenAI embedding連線錯誤: {e}")
+            self.invalidate_availability()
+            if isinstance(e, APITimeoutError):
+                self._report_congestion()
+            return None
         except Exception as e:
             logger.error(f"OpenAI embedding請求錯誤: {e}")
             return None
\ No newline at end of file
@@ -0,0 +1,413 @@
+"""
+LLM服務路由 - 依序組合多個LLM服務提供者，以對沖請求 (hedged request) 限制尾端延遲，並在連續失敗時自動切換提供者
+"""
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Optional, List, Dict, Any, Union, Tuple
+
+from .base_service import BaseLLMService
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+class _ProviderState:
+    """單一提供者的延遲紀錄及熔斷狀態"""
+    def __init__(self, service: BaseLLMService, history_size: int):
+        self.service = service
+        self.latencies: deque = deque(maxlen=history_size)
+        self.consecutive_failures = 0
+        self.open_until = 0.0       # 熔斷結束時間 (time.monotonic)
+        self.requests = 0
+        self.failures = 0
+        self.hedged_wins = 0        # 作為對沖請求先取得結果的次數
+
+    @property
+    def name(self) -> str:
+        """提供者名稱 (provider/model)"""
+        return f"{self.service.provider}/{self.service.model_name}"
+
+    def is_healthy(self, now: float) -> bool:
+        """是否未處於熔斷狀態"""
+        return now >= self.open_until
+
+class ProviderRouter(BaseLLMService):
+    """
+    ### LLM服務路由
+
+    以設定的順序組合多個LLM服務，對外提供與單一LLM服務相同的接口：
+    - 單次請求: 先送往第一個健康的提供者；超過該提供者近期延遲的百分位數仍未回應時，再對下一個提供者發送對沖請求，
+      採用最先取得的有效回應 (較慢的請求仍會在背景完成，只用於更新延遲紀錄)
+    - 失敗切換: 請求失敗時立即改送下一個提供者；連續失敗達上限的提供者進入熔斷，冷卻時間內排到最後
+    - 多輪對話: 對話紀錄保存在各提供者內，因此不對沖，僅在失敗時切換至下一個提供者 (新的提供者從空白對話開始)
+    - 嵌入向量: 不同模型的向量空間不相容，只使用第一個提供者
+    """
+    def __init__(self,
+            services: List[BaseLLMService],
+            hedge_percentile: float = 0.9,
+            hedge_initial_delay: float = 10.0,
+            hedge_min_delay: float = 1.0,
+            hedge_max_delay: float = 30.0,
+            failure_threshold: int = 3,
+            cooldown: float = 60.0,
+            history_size: int = 50,
+            max_concurrency: int = 32,
+            verbose: bool = False
+        ):
+        """
+        初始化LLM服務路由
+
+        Args:
+            services: 依優先順序排列的LLM服務實例
+            hedge_percentile: 發送對沖請求前等待的延遲百分位數 (0~1)
+            hedge_initial_delay: 延遲紀錄不足時發送對沖請求前等待的秒數
+            hedge_min_delay: 發送對沖請求前等待的最短秒數
+            hedge_max_delay: 發送對沖請求前等待的最長秒數
+            failure_threshold: 連續失敗多少次後熔斷該提供者
+            cooldown: 熔斷的冷卻秒數
+            history_size: 計算延遲百分位數時參考的最近成功請求數量
+            max_concurrency: 同時進行的請求數量上限 (含背景完成的對沖請求)
+            verbose: 是否啟用詳細日誌
+        """
+        if not services:
+            raise ValueError("LLM服務路由至少需要一個服務")
+
+        self._states: List[_ProviderState] = [_ProviderState(service, history_size) for service in services]
+        super().__init__(model_name=services[0].model_name, api_key=None, verbose=verbose)
+
+        self.hedge_percentile = min(max(hedge_percentile, 0.0), 1.0)
+        self.hedge_initial_delay = hedge_initial_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.failure_threshold = max(failure_threshold, 1)
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-router")
+        self._chat_state: Optional[_ProviderState] = None  # 目前多輪對話使用的提供者
+        self._background_tasks: set = set()                # 非同步對沖請求中未被採用、仍在背景完成的請求
+        self._active_requests = 0                          # 使用執行緒池的進行中請求數量
+        self._closing = False                              # 已呼叫 shutdown，待進行中的請求完成後關閉執行緒池
+
+        if self.verbose:
+            logger.info(f"LLM服務路由初始化完成: {' → '.join(state.name for state in self._states)}")
+
+    @property
+    def services(self) -> List[BaseLLMService]:
+        """依優先順序排列的LLM服務"""
+        return [state.service for state in self._states]
+
+    @property
+    def primary(self) -> BaseLLMService:
+        """目前的主要提供者 (第一個未熔斷的提供者)"""
+        return self._ordered_states()[0].service
+
+    @property
+    def provider(self) -> str:
+        """主要提供者名稱 (供依提供者區分的設定使用)"""
+        return self.primary.provider
+
+    @property
+    def model_name(self) -> str:
+        """主要提供者的模型名稱"""
+        return self.primary.model_name
+
+    @model_name.setter
+    def model_name(self, value: str):
+        # BaseLLMService 初始化時會設定模型名稱，實際名稱由各提供者決定
+        pass
+
+    def _ordered_states(self) -> List[_ProviderState]:
+        """依優先順序排列提供者 (熔斷中的提供者排到最後，作為最後手段)"""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [state for state in self._states if state.is_healthy(now)]
+            tripped = sorted((state for state in self._states if not state.is_healthy(now)), key=lambda state: state.open_until)
+        return healthy + tripped
+
+    def _hedge_delay(self, state: _ProviderState) -> float:
+        """提供者的對沖等待秒數 (近期成功請求延遲的百分位數)"""
+        with self._lock:
+            latencies = sorted(state.latencies)
+        if len(latencies) < 5:
+            delay = self.hedge_initial_delay
+        else:
+            delay = latencies[min(int(len(latencies) * self.hedge_percentile), len(latencies) - 1)]
+        return min(max(delay, self.hedge_min_delay), self.hedge_max_delay)
+
+    def _record(self, state: _ProviderState, success: bool, latency: float):
+        """記錄請求結果並更新熔斷狀態"""
+        with self._lock:
+            state.requests += 1
+            if success:
+                state.latencies.append(latency)
+                state.consecutive_failures = 0
+                state.open_until = 0.0
+                return
+            state.failures += 1
+            state.consecutive_failures += 1
+            if state.consecutive_failures >= self.failure_threshold:
+                state.open_until = time.monotonic() + self.cooldown
+                logger.warning(f"LLM服務提供者連續失敗 {state.consecutive_failures} 次，暫停使用 {self.cooldown:.0f} 秒: {state.name}")
+
+    def _call(self, state: _ProviderState, prompt: str, system_prompt: Optional[str]) -> Optional[str]:
+        """向單一提供者發送請求並記錄結果"""
+        start = time.monotonic()
+        try:
+            response = state.service.send_single_request(prompt, system_prompt=system_prompt)
+        except Exception as e:
+            logger.error(f"LLM服務提供者請求錯誤 ({state.name}): {e}")
+            response = None
+        self._record(state, bool(response), time.monotonic() - start)
+        return response
+
+    def send_single_request(self, prompt: str, system_prompt: Optional[str] = None, stream: bool = False) -> Union[Optional[str], Any]:
+        """
+        發送單次請求 (對沖請求及失敗切換)
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示詞
+            stream: 是否使用流式回應 (流式回應不對沖，只在建立失敗時切換提供者)
+
+        Returns:
+            str: 最先取得的有效回應 (所有提供者皆失敗時返回 None)
+        """
+        states = self._ordered_states()
+        if stream:
+            for state in states:
+                response = state.service.send_single_request(prompt, system_prompt=system_prompt, stream=True)
+                if response is not None:
+                    return response
+                self._record(state, False, 0.0)
+            return None
+
+        with self._lock:
+            closing = self._closing
+            if not closing:
+                self._active_requests += 1
+        if closing:
+            # 路由已被取代 (仍持有舊路由的翻譯工作)：不再對沖，依序切換提供者直到取得回應
+            for state in states:
+                response = self._call(state, prompt, system_prompt)
+                if response:
+                    return response
+            return None
+
+        try:
+            return self._send_hedged(states, prompt, system_prompt)
+        finally:
+            with self._lock:
+                self._active_requests -= 1
+                drained = self._closing and self._active_requests == 0
+            if drained:
+                self._executor.shutdown(wait=False)
+
+    def _send_hedged(self, states: List[_ProviderState], prompt: str, system_prompt: Optional[str]) -> Optional[str]:
+        """以執行緒池發送請求，提供者逾時未回應時對沖、失敗時切換至下一個提供者"""
+        running: Dict[Future, Tuple[_ProviderState, bool]] = {}
+        next_index = 0
+
+        def launch(hedged: bool):
+            nonlocal next_index
+            state = states[next_index]
+            next_index += 1
+            running[self._executor.submit(self._call, state, prompt, system_prompt)] = (state, hedged)
+
+        launch(hedged=False)
+        while running:
+            timeout = None
+            if next_index < len(states):
+                timeout = self._hedge_delay(states[next_index - 1])
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                if self.verbose:
+                    logger.info(f"LLM服務提供者 {timeout:.1f} 秒內未回應，發送對沖請求至 {states[next_index].name}")
+                launch(hedged=True)
+                continue
+
+            for future in done:
+                state, hedged = running.pop(future)
+                response = future.result()
+                if response:
+                    if hedged:
+                        with self._lock:
+                            state.hedged_wins += 1
+                    return response
+                # 失敗時立即改送下一個提供者
+                if next_index < len(states) and len(running) == 0:
+                    launch(hedged=False)
+        return None
+
+    async def _async_call(self, state: _ProviderState, prompt: str, system_prompt: Optional[str]) -> Optional[str]:
+        """向單一提供者發送非同步請求並記錄結果"""
+        start = time.monotonic()
+        try:
+            response = await state.service.async_send_single_request(prompt, system_prompt=system_prompt)
+        except Exception as e:
+            logger.error(f"LLM服務提供者請求錯誤 ({state.name}): {e}")
+            response = None
+        self._record(state, bool(response), time.monotonic() - start)
+        return response
+
+    async def async_send_single_request(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """
+        非同步發送單次請求 (對沖請求及失敗切換，邏輯與同步方法相同)
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示詞
+
+        Returns:
+            str: 最先取得的有效回應 (所有提供者皆失敗時返回 None)
+        """
+        states = self._ordered_states()
+        running: Dict[asyncio.Task, Tuple[_ProviderState, bool]] = {}
+        next_index = 0
+
+        def launch(hedged: bool):
+            nonlocal next_index
+            state = states[next_index]
+            next_index += 1
+            running[asyncio.ensure_future(self._async_call(state, prompt, system_prompt))] = (state, hedged)
+
+        launch(hedged=False)
+        try:
+            while running:
+                timeout = self._hedge_delay(states[next_index - 1]) if next_index < len(states) else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    launch(hedged=True)
+                    continue
+
+                for task in done:
+                    state, hedged = running.pop(task)
+                    response = task.result()
+                    if response:
+                        if hedged:
+                            with self._lock:
+                                state.hedged_wins += 1
+                        return response
+                    if next_index < len(states) and len(running) == 0:
+                        launch(hedged=False)
+            return None
+        finally:
+            # 未被採用的請求在背景完成 (只用於更新延遲紀錄)，保留參照避免被回收
+            for task in running:
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+
+    def send_multi_request(self, prompt: str, system_prompt: str, end_chat: bool = False) -> Optional[str]:
+        """
+        發送多輪對話請求 (同一對話固定使用同一提供者，失敗時切換)
+
+        Args:
+            prompt: 要發送的文本
+            system_prompt: 系統提示詞
+            end_chat: 是否結束多輪對話
+
+        Returns:
+            str: 模型回覆 (所有提供者皆失敗時返回 None)
+        """
+        if end_chat:
+            state, self._chat_state = self._chat_state, None
+            if state is not None:
+                return state.service.send_multi_request(prompt, system_prompt, end_chat=True)
+            return None
+
+        states = self._ordered_states()
+        if self._chat_state is not None and self._chat_state in states:
+            states.remove(self._chat_state)
+            states.insert(0, self._chat_state)
+
+        for state in states:
+            start = time.monotonic()
+            try:
+                response = state.service.send_multi_request(prompt, system_prompt, end_chat=False)
+            except Exception as e:
+                logger.error(f"LLM服務提供者請求錯誤 ({state.name}): {e}")
+                response = None
+            self._record(state, bool(response), time.monotonic() - start)
+            if response:
+                if state is not self._chat_state:
+                    if self._chat_state is not None:
+                        logger.warning(f"多輪對話切換提供者: {self._chat_state.name} → {state.name}")
+                        self._chat_state.service.send_multi_request("", system_prompt, end_chat=True)
+                    self._chat_state = state
+                return response
+        return None
+
+    def send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
+        """發送嵌入向量請求 (只使用第一個提供者，不同模型的向量空間不相容)"""
+        return self._states[0].service.send_embedding_request(text, store=store)
+
+    async def async_send_embedding_request(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
+        """非同步發送嵌入向量請求 (只使用第一個提供者)"""
+        return await self._states[0].service.async_send_embedding_request(text, store)
+
+    async def aclose(self):
+        """關閉所有提供者的非同步HTTP連線池"""
+        for state in self._states:
+            await state.service.aclose()
+
+    def set_history_window(self, max_turns: Optional[int], pinned_turns: int = 0):
+        """設定所有提供者的多輪對話上下文視窗"""
+        super().set_history_window(max_turns, pinned_turns)
+        for state in self._states:
+            state.service.set_history_window(max_turns, pinned_turns)
+
+    def is_available(self, model_name: str = None) -> bool:
+        """任一提供者可用即視為可用"""
+        return any(state.service.check_available() for state in self._states)
+
+    def update_config(self, api_key: str = None, model_name: str = None) -> bool:
+        """LLM服務路由不支援直接更新設定，請重新建立路由"""
+        logger.error("LLM服務路由不支援直接更新設定，請重新設定提供者列表")
+        return False
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        """
+        獲取各提供者的狀態
+
+        Returns:
+            List[Dict]: 依優先順序排列的提供者狀態 (名稱、是否熔斷、請求/失敗次數、對沖成功次數、延遲百分位數)
+        """
+        now = time.monotonic()
+        status = []
+        for state in self._states:
+            with self._lock:
+                latencies = sorted(state.latencies)
+                entry = {
+                    "name": state.name,
+                    "healthy": state.is_healthy(now),
+                    "cooldown_remaining": round(max(state.open_until - now, 0.0), 1),
+                    "requests": state.requests,
+                    "failures": state.failures,
+                    "hedged_wins": state.hedged_wins,
+                }
+            entry["latency_p50"] = round(latencies[len(latencies) // 2], 3) if latencies else None
+            entry["hedge_delay"] = round(self._hedge_delay(state), 3)
+            status.append(entry)
+        return status
+
+    def shutdown(self):
+        """
+        停用路由 (重新設定提供者列表時呼叫，不阻塞)
+
+        進行中的請求照常完成 (含對沖及失敗切換)，最後一個完成後才關閉執行緒池；
+        之後仍經由此路由發送的請求不再對沖，改為依序切換提供者。
+        """
+        with self._lock:
+            self._closing = True
+            active = self._active_requests
+        if active == 0:
+            self._executor.shutdown(wait=False)
+        if self.verbose:
+            logger.info(f"LLM服務路由已停用{f'，等待 {active} 個進行中的請求完成' if active else ''}")
@@ -0,0 +1,220 @@
+"""
+速率限制器 - 以令牌桶 (token bucket) 控制各LLM服務提供者的請求頻率與Token用量
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple, Any, Union, List
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(text: Union[str, List[str], None]) -> int:
+    """
+    粗略估算文本的Token數量 (英文約4字元1個Token，中日韓文字約1字1個Token)
+
+    Args:
+        text: 字串或字串列表
+
+    Returns:
+        int: 估算的Token數量 (至少為1)
+    """
+    if not text:
+        return 1
+    if isinstance(text, (list, tuple)):
+        return max(sum(estimate_tokens(t) for t in text), 1)
+
+    wide_chars = sum(1 for char in text if ord(char) > 0x2E7F)
+    return max(wide_chars + (len(text) - wide_chars) // 4, 1)
+
+class TokenBucket:
+    """
+    令牌桶 - 以固定速率補充令牌，允許預支以保證請求依序取得配額
+
+    Args:
+        per_minute: 每分鐘補充的令牌數量 (同時也是桶的容量)
+    """
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.refill_rate = per_minute / 60.0  # 每秒補充數量
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        預約令牌 (可預支至負數)，返回需要等待的秒數
+
+        Args:
+            amount: 需要的令牌數量 (超過容量時以容量計算，避免永遠無法滿足)
+            now: 當前時間 (time.monotonic)
+
+        Returns:
+            float: 需等待的秒數
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.refill_rate
+
+class RateLimiter:
+    """
+    ### 單一服務提供者/模型的速率限制器
+
+    同時以每分鐘請求數 (RPM) 及每分鐘Token數 (TPM) 兩個令牌桶限制請求。
+    """
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        """
+        初始化速率限制器
+
+        Args:
+            requests_per_minute: 每分鐘最大請求數 (None 表示不限制)
+            tokens_per_minute: 每分鐘最大Token數 (None 表示不限制)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self._request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._blocked_until = 0.0  # 收到429後的暫停時間點
+        self._lock = threading.Lock()
+
+        # 統計資料
+        self._total_requests = 0
+        self._total_tokens = 0
+        self._total_wait = 0.0
+        self._backoff_count = 0
+
+    def _reserve(self, tokens: int) -> float:
+        """預約一次請求的配額，返回需要等待的秒數"""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = max(self._blocked_until - now, 0.0)
+            if self._request_bucket:
+                wait_time = max(wait_time, self._request_bucket.reserve(1, now))
+            if self._token_bucket:
+                wait_time = max(wait_time, self._token_bucket.reserve(tokens, now))
+
+            self._total_requests += 1
+            self._total_tokens += tokens
+            self._total_wait += wait_time
+        return wait_time
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        取得一次請求的配額，必要時阻塞等待
+
+        Args:
+            tokens: 此次請求估算的Token數量
+
+        Returns:
+            float: 實際等待的秒數
+        """
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            logger.debug(f"[RateLimiter] 請求頻率達到上限，等待 {wait_time:.2f} 秒")
+            time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        """
+        取得一次請求的配額，必要時以非阻塞方式等待 (不佔用事件迴圈)
+
+        Args:
+            tokens: 此次請求估算的Token數量
+
+        Returns:
+            float: 實際等待的秒數
+        """
+        wait_time = self._reserve(tokens)
+        if wait_time > 0:
+            logger.debug(f"[RateLimiter] 請求頻率達到上限，等待 {wait_time:.2f} 秒")
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+    def backoff(self, seconds: float):
+        """
+        暫停所有請求一段時間 (收到429等限流回應時使用)
+
+        Args:
+            seconds: 暫停秒數
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._backoff_count += 1
+        logger.warning(f"[RateLimiter] 收到限流回應，暫停請求 {seconds:.1f} 秒")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """獲取限制器當前狀態"""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "available_requests": round(self._request_bucket.tokens, 2) if self._request_bucket else None,
+                "available_tokens": round(self._token_bucket.tokens, 2) if self._token_bucket else None,
+                "blocked_seconds": round(max(self._blocked_until - now, 0.0), 2),
+                "total_requests": self._total_requests,
+                "total_tokens": self._total_tokens,
+                "total_wait_seconds": round(self._total_wait, 2),
+                "backoff_count": self._backoff_count
+            }
+
+class RateLimiterRegistry:
+    """
+    速率限制器註冊表 - 依 (服務提供者, 模型) 共享限制器
+
+    同一提供者與模型的所有服務實例 (翻譯、Embedding、RAG問答) 共用同一組配額。
+    限制設定的鍵可為 "provider" 或 "provider/model"，後者優先。
+    """
+    _limits: Dict[str, Dict[str, int]] = {}
+    _limiters: Dict[Tuple[str, str], RateLimiter] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, limits: Dict[str, Dict[str, int]]):
+        """
+        設定速率限制 (會重建所有限制器)
+
+        Args:
+            limits: 限制設定，例如 {"google": {"requests_per_minute": 15, "tokens_per_minute": 250000}}
+        """
+        with cls._lock:
+            cls._limits = dict(limits or {})
+            cls._limiters = {}
+        logger.info(f"[RateLimiterRegistry] 速率限制設定完成: {list(cls._limits.keys())}")
+
+    @classmethod
+    def get(cls, provider: str, model_name: str) -> RateLimiter:
+        """
+        獲取 (服務提供者, 模型) 對應的速率限制器，不存在則依設定建立
+
+        Args:
+            provider: 服務提供者名稱
+            model_name: 模型名稱
+
+        Returns:
+            RateLimiter: 共享的速率限制器
+        """
+        key = (provider, model_name)
+        with cls._lock:
+            limiter = cls._limiters.get(key)
+            if limiter is None:
+                limit = cls._limits.get(f"{provider}/{model_name}", cls._limits.get(provider, {}))
+                limiter = RateLimiter(
+                    requests_per_minute=limit.get("requests_per_minute"),
+                    tokens_per_minute=limit.get("tokens_per_minute")
+                )
+                cls._limiters[key] = limiter
+            return limiter
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Dict[str, Any]]:
+        """獲取所有限制器的狀態 (鍵為 "provider/model")"""
+        with cls._lock:
+            limiters = dict(cls._limiters)
+        return {f"{provider}/{model}": limiter.snapshot() for (provider, model), limiter in limiters.items()}
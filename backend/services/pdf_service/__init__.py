@@ -1,7 +1,11 @@
 from .mineru_processor import MinerUProcessor
+from .mineru_worker import MinerUWorkerPool
+from .pdf_analyzer import PDFAnalyzer
 from .md_reconstructor import MarkdownReconstructor
 
 __all__ = [
     "MinerUProcessor",
+    "MinerUWorkerPool",
+    "PDFAnalyzer",
     "MarkdownReconstructor"
 ]
\ No newline at end of file
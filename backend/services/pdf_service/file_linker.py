@@ -0,0 +1,109 @@
+"""
+檔案連結工具 - 以硬連結、reflink或符號連結取代完整複製，避免相同內容的檔案重複佔用磁碟空間及I/O
+"""
+import os
+import sys
+import shutil
+from typing import Dict, List, Literal
+
+import logging
+from backend.api.logger import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+LinkMode = Literal["auto", "hardlink", "reflink", "symlink", "copy"]
+
+# auto 模式依序嘗試的方式 (全部失敗時完整複製)
+_AUTO_ORDER: List[str] = ["hardlink", "reflink", "symlink", "copy"]
+
+_FICLONE = 0x40049409  # Linux ioctl FICLONE (btrfs/xfs等支援寫入時複製的檔案系統)
+
+def _reflink(src: str, dst: str):
+    """建立reflink (僅支援Linux上具寫入時複製功能的檔案系統)"""
+    if not sys.platform.startswith("linux"):
+        raise OSError("此平台不支援 reflink")
+
+    import fcntl
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        except OSError:
+            dst_file.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+def _is_up_to_date(src: str, dst: str) -> bool:
+    """目標是否已與來源相同 (同一檔案、指向來源的符號連結，或大小及修改時間相同的副本)"""
+    if not os.path.lexists(dst):
+        return False
+    if os.path.islink(dst):
+        return os.path.realpath(dst) == os.path.realpath(src)
+    try:
+        if os.path.samefile(src, dst):
+            return True
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+        return src_stat.st_size == dst_stat.st_size and int(src_stat.st_mtime) == int(dst_stat.st_mtime)
+    except OSError:
+        return False
+
+def link_or_copy(src: str, dst: str, mode: LinkMode = "auto") -> str:
+    """
+    將來源檔案連結至目標路徑 (目標已是最新時略過)
+
+    Args:
+        src: 來源檔案路徑
+        dst: 目標檔案路徑
+        mode: 連結方式 (auto 依序嘗試 hardlink、reflink、symlink，皆不支援時完整複製)
+
+    Returns:
+        str: 實際使用的方式 (hardlink/reflink/symlink/copy，已是最新時為 skipped)
+    """
+    if _is_up_to_date(src, dst):
+        return "skipped"
+
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    if os.path.lexists(dst):
+        os.remove(dst)
+
+    methods = _AUTO_ORDER if mode == "auto" else [mode]
+    last_error = None
+    for method in methods:
+        try:
+            if method == "hardlink":
+                os.link(src, dst)
+            elif method == "reflink":
+                _reflink(src, dst)
+            elif method == "symlink":
+                os.symlink(os.path.abspath(src), dst)
+            elif method == "copy":
+                shutil.copy2(src, dst)
+            else:
+                raise ValueError(f"不支援的連結方式: {method}")
+            return method
+        except OSError as e:
+            last_error = e
+            continue
+    raise OSError(f"無法建立檔案連結 {src} → {dst}: {last_error}")
+
+def link_tree(src_dir: str, dst_dir: str, mode: LinkMode = "auto") -> Dict[str, int]:
+    """
+    將來源目錄下的所有檔案連結至目標目錄 (保留子目錄結構，已是最新的檔案略過)
+
+    Args:
+        src_dir: 來源目錄
+        dst_dir: 目標目錄
+        mode: 連結方式
+
+    Returns:
+        Dict[str, int]: 各方式處理的檔案數量 (例如 {"hardlink": 120, "skipped": 3})
+    """
+    counts: Dict[str, int] = {}
+    for root, _, files in os.walk(src_dir):
+        target_root = os.path.join(dst_dir, os.path.relpath(root, src_dir))
+        os.makedirs(target_root, exist_ok=True)
+        for file in files:
+            method = link_or_copy(os.path.join(root, file), os.path.join(target_root, file), mode=mode)
+            counts[method] = counts.get(method, 0) + 1
+    return counts
@@ -1,9 +1,10 @@
 from typing import Dict, Literal, Tuple, Optional
 import os
 import json
-import shutil
 import re
 
+from .file_linker import LinkMode, link_tree
+
 import logging
 from backend.api import setup_project_logger  # 導入日誌設置函數
 
@@ -14,15 +15,17 @@ class MarkdownReconstructor:
     """
     ### 將翻譯過的.json文件重組回.md檔案
     """
-    def __init__(self, instance_path: str, verbose: bool = False):
+    def __init__(self, instance_path: str, link_mode: LinkMode = "auto", verbose: bool = False):
         """
         初始化Markdown重組器
 
         Args:
             instance_path: 存放PDF的資料夾路徑
+            link_mode: 圖片放入重組目錄的方式 (auto/hardlink/reflink/symlink/copy)
             verbose: 是否啟用詳細模式
         """
         self.verbose = verbose
+        self.link_mode = link_mode
 
         self.instance_path = instance_path
         self.pdf_path = os.path.join(self.instance_path, "mineru_outputs")
@@ -92,11 +95,14 @@ class MarkdownReconstructor:
         with open(md_file_path, 'w', encoding='utf-8') as f:
             f.write(md_content)
 
-        shutil.copytree(
+        # 連結圖片目錄 (已是最新的圖片略過，不重複複製)
+        link_counts = link_tree(
             os.path.join(pdf_path, "images"), 
             os.path.join(os.path.dirname(md_file_path), "images"), 
-            dirs_exist_ok=True
+            mode=self.link_mode
         )
+        if self.verbose:
+            logger.info(f"圖片連結完成: {link_counts}")
 
         return md_file_path
 
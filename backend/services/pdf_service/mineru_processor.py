@@ -1,10 +1,19 @@
 import os
+import json
+import shutil
 import subprocess
-from typing import Dict, Any, Literal, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
+from typing import Dict, Any, Literal, Tuple, List, Optional
 import time
 
 from backend.api import ProgressManager # 導入進度管理器
 
+from .mineru_worker import MinerUWorkerPool
+from .mineru_progress import MinerUPhaseTimings, MinerUProgressTracker
+from .pdf_analyzer import PDFAnalyzer
+from .file_linker import LinkMode, link_or_copy
+
 import logging
 from backend.api.logger import setup_project_logger  # 導入日誌設置函數
 
@@ -14,19 +23,55 @@ logger = logging.getLogger(__name__)
 class MinerUProcessor:
     """MinerU PDF處理器"""
 
-    def __init__(self, instance_path: str, output_dirname: str = "mineru_outputs", verbose: bool = False):
+    def __init__(self, 
+            instance_path: str, 
+            output_dirname: str = "mineru_outputs", 
+            worker_mode: bool = False,
+            num_workers: int = 1,
+            shard_pages: int = 0,
+            shard_workers: int = 2,
+            preflight: bool = False,
+            preflight_methods: Optional[List[str]] = None,
+            preflight_sample_pages: int = 8,
+            link_mode: LinkMode = "auto",
+            verbose: bool = False
+        ):
         """
         初始化MinerU PDF處理器
 
         Args:
             instance_path: 實例路徑
             output_dirname: 輸出目錄名稱
+            worker_mode: 是否使用常駐工作程序 (保持模型載入，失敗時改用命令列)
+            num_workers: 常駐工作程序數量
+            shard_pages: 分段處理時每段的頁數 (0 表示不分段；頁數超過此值的PDF會拆分後平行處理)
+            shard_workers: 分段處理時平行處理的段數
+            preflight: 是否在處理前分析PDF文字層，自動選擇解析方法 (原生數位PDF略過OCR)
+            preflight_methods: 可由預檢分析結果取代的解析方法 (預設為 auto 及 ocr)
+            preflight_sample_pages: 預檢分析抽樣的頁數
+            link_mode: 建立短檔名PDF副本的方式 (auto/hardlink/reflink/symlink/copy)
             verbose: 是否啟用詳細模式
         """
         self.default_path = os.path.join(instance_path, "pdfs")
         self.output_dir = os.path.join(instance_path, output_dirname)
         os.makedirs(self.output_dir, exist_ok=True)
 
+        self.worker_mode = worker_mode
+        self.num_workers = num_workers
+        self._worker_pool: Optional[MinerUWorkerPool] = None
+        self._worker_pool_lock = Lock()
+
+        self.shard_pages = max(shard_pages, 0)
+        self.shard_workers = max(shard_workers, 1)
+
+        self.preflight = preflight
+        self.preflight_methods = preflight_methods if preflight_methods is not None else ["auto", "ocr"]
+        self.pdf_analyzer = PDFAnalyzer(sample_pages=preflight_sample_pages, verbose=verbose)
+        self.link_mode = link_mode
+
+        # 各階段耗時紀錄 (用於預估剩餘時間及容量規劃)
+        self.phase_timings = MinerUPhaseTimings(os.path.join(self.output_dir, "phase_timings.jsonl"))
+
         self.verbose: bool = verbose
 
         if self.verbose:
@@ -65,23 +110,29 @@ class MinerUProcessor:
                 - stdout (str): MinerU輸出內容
                 - error (str): 錯誤訊息（如果有的話）
                 - returncode (int): 返回代碼
+                - parse_method (str): 實際使用的解析方法 (可能由預檢分析決定)
+                - preflight (Dict): 預檢分析結果 (未執行時為 None)
         """
         # 準備輸出路徑
         output_path = os.path.abspath(self.output_dir)
         
         # 檢查是否需要使用雜湊檔名
         processing_filename, pdf_path = self._check_hashed_filename(pdf_name)
+        filename_mapping = self._filename_mapping  # 保存本次的映射 (其他執行緒檢查檔名時會覆寫實例屬性)
         
         # 建立輸出子目錄
         expected_output_dir = os.path.join(output_path, processing_filename, method)
         os.makedirs(expected_output_dir, exist_ok=True)
 
+        # 預檢分析：依文字層選擇實際的解析方法 (輸出仍保存於請求的方法目錄下)
+        parse_method, preflight = self._choose_parse_method(pdf_path, method, os.path.join(output_path, processing_filename))
+
         # 構建MinerU命令
         cmd = [
             "mineru",
             "-p", str(pdf_path),
             "-o", str(output_path),
-            "-m", method,
+            "-m", parse_method,
             "-b", backend,
             "-l", lang,
             "-f", str(formula).lower(),
@@ -95,47 +146,36 @@ class MinerUProcessor:
             logger.info(f"輸出目錄: {output_path}")
 
         try:
-            # 執行MinerU命令 - 即時顯示輸出
+            # 執行MinerU - 優先使用常駐工作程序，失敗時改用命令列
             start_time = time.time()
             if self.verbose:
                 logger.info(f"開始執行 MinerU...")
                 logger.info("-" * 60)
 
-            # 使用 Popen 來即時顯示輸出
-            # 編碼處理策略：統一使用 UTF-8 以保證跨平台一致性
-            # - 與 Electron (PYTHONIOENCODING='utf-8') 行為一致
-            # - 配合 errors='replace' 處理無法解碼的字節（如某些舊版程式的 Big5 輸出）
-            # - 確保在 Windows/Linux/Mac 上都能正常運行
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,  # 將 stderr 重定向到 stdout
-                text=True,
-                encoding='utf-8',  # 明確指定 UTF-8，與 Electron 環境一致
-                errors='replace',  # 遇到無法解碼的字節時用替代字符代替（容錯處理）
-                cwd=os.path.dirname(__file__),
-                universal_newlines=True,
-                bufsize=1,
-                env=os.environ.copy()  # 複製當前環境變量
-            )
-
-            # 收集所有輸出
-            all_output = []
-            if self.verbose:
-                logger.debug(f"MinerU 輸出:")
-            
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    self._update_progress(output)  # 更新進度
-                    all_output.append(output.strip())
-                    if self.verbose:
-                        logger.debug(output.strip())  # 即時顯示
-            
-            # 等待進程完成
-            return_code = process.poll()
+            return_code = None
+            page_count = self._count_pages(pdf_path)
+            tracker = MinerUProgressTracker(self.phase_timings, processing_filename, device, parse_method, page_count=page_count)
+            sharded = False
+            if page_count > self.shard_pages > 0:
+                return_code, all_output = self._run_sharded(
+                    pdf_path, page_count, expected_output_dir, parse_method, backend, lang, formula, table, device
+                )
+                sharded = return_code == 0
+                if return_code != 0:
+                    logger.warning("MinerU分段處理失敗，改為整份文件處理")
+            if return_code != 0 and self.worker_mode:
+                return_code, all_output = self._run_with_worker_pool(
+                    pdf_path, output_path, parse_method, backend, lang, formula, table, device, tracker=tracker
+                )
+                if return_code != 0:
+                    logger.warning("MinerU常駐工作程序處理失敗，改用命令列重新處理")
+            if return_code != 0:
+                return_code, all_output = self._run_with_cli(cmd, tracker=tracker)
+            tracker.finish(return_code == 0, sharded=sharded)
+            if return_code == 0 and parse_method != method and not sharded:
+                # 將輸出移至請求的方法目錄，後續流程 (進度檢查、翻譯、Markdown重組) 路徑不變
+                shutil.rmtree(expected_output_dir, ignore_errors=True)
+                shutil.move(os.path.join(output_path, processing_filename, parse_method), expected_output_dir)
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -154,24 +194,24 @@ class MinerUProcessor:
                     logger.info(f"輸出目錄: {output_path}")
 
                 # 查找生成的文件
-                if self._filename_mapping and hasattr(self, '_filename_mapping'):
+                if filename_mapping:
                     # 使用短檔名查找文件
                     generated_files = self._find_generated_files(
                         output_path, 
-                        f"{self._filename_mapping['short']}.pdf", 
+                        f"{filename_mapping['short']}.pdf", 
                         method=method
                     )
                     
                     # 清理臨時檔案
                     try:
-                        os.remove(self._filename_mapping['short_pdf_path'])
+                        os.remove(filename_mapping['short_pdf_path'])
                         if self.verbose:
-                            logger.info(f"清理臨時檔案: {self._filename_mapping['short_pdf_path']}")
+                            logger.info(f"清理臨時檔案: {filename_mapping['short_pdf_path']}")
                     except:
                         pass
 
                     if self.verbose:
-                        logger.info(f"檔名映射: {self._filename_mapping['short']} → {self._filename_mapping['original']}")
+                        logger.info(f"檔名映射: {filename_mapping['short']} → {filename_mapping['original']}")
                 else:
                     generated_files = self._find_generated_files(output_path, pdf_name, method=method)
 
@@ -182,7 +222,9 @@ class MinerUProcessor:
                     "processing_time": processing_time,
                     "stdout": full_output if self.verbose else "未開啟詳細模式，無輸出",
                     "error": "",
-                    "returncode": return_code
+                    "returncode": return_code,
+                    "parse_method": parse_method,
+                    "preflight": preflight
                 }
             else:
                 logger.error(f"MinerU處理失敗！錯誤代碼: {return_code}")
@@ -209,6 +251,317 @@ class MinerUProcessor:
                 "error": str(e)
             }
 
+    def _run_with_cli(self, cmd: List[str], tracker: Optional[MinerUProgressTracker] = None) -> Tuple[int, List[str]]:
+        """
+        以命令列子程序執行MinerU (每次執行皆需重新載入模型)
+
+        Args:
+            cmd: MinerU命令
+            tracker: 進度追蹤 (None 表示不更新處理進度)
+
+        Returns:
+            Tuple(return_code, all_output): 返回代碼及所有輸出行
+        """
+        # 使用 Popen 來即時顯示輸出
+        # 編碼處理策略：統一使用 UTF-8 以保證跨平台一致性
+        # - 與 Electron (PYTHONIOENCODING='utf-8') 行為一致
+        # - 配合 errors='replace' 處理無法解碼的字節（如某些舊版程式的 Big5 輸出）
+        # - 確保在 Windows/Linux/Mac 上都能正常運行
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,  # 將 stderr 重定向到 stdout
+            text=True,
+            encoding='utf-8',  # 明確指定 UTF-8，與 Electron 環境一致
+            errors='replace',  # 遇到無法解碼的字節時用替代字符代替（容錯處理）
+            cwd=os.path.dirname(__file__),
+            universal_newlines=True,
+            bufsize=1,
+            env=os.environ.copy()  # 複製當前環境變量
+        )
+
+        # 收集所有輸出
+        all_output = []
+        if self.verbose:
+            logger.debug(f"MinerU 輸出:")
+        
+        while True:
+            output = process.stdout.readline()
+            if output == '' and process.poll() is not None:
+                break
+            if output:
+                if tracker:
+                    self._update_progress(output, tracker)  # 更新進度
+                all_output.append(output.strip())
+                if self.verbose:
+                    logger.debug(output.strip())  # 即時顯示
+        
+        # 等待進程完成
+        return process.poll(), all_output
+
+    def _run_with_worker_pool(self, 
+            pdf_path: str, 
+            output_path: str, 
+            method: str, 
+            backend: str, 
+            lang: str, 
+            formula: bool, 
+            table: bool, 
+            device: str,
+            start_page: int = 0,
+            end_page: Optional[int] = None,
+            tracker: Optional[MinerUProgressTracker] = None
+        ) -> Tuple[int, List[str]]:
+        """
+        使用常駐工作程序執行MinerU (模型在工作程序間的多份文件間重複使用)
+
+        Args:
+            start_page: 起始頁碼 (從0開始)
+            end_page: 結束頁碼 (包含該頁，None 表示處理至最後一頁)
+            tracker: 進度追蹤 (None 表示不更新處理進度)
+
+        Returns:
+            Tuple(return_code, all_output): 返回代碼 (成功為0) 及所有輸出行
+        """
+        all_output = []
+
+        def on_output(line: str):
+            if tracker:
+                self._update_progress(line, tracker)  # 更新進度 (在當前執行緒執行，保持工作進度綁定)
+            all_output.append(line.strip())
+            if self.verbose:
+                logger.debug(line.strip())
+
+        success, error = self._get_worker_pool(device).run(
+            pdf_path=pdf_path,
+            output_dir=output_path,
+            method=method,
+            backend=backend,
+            lang=lang,
+            formula=formula,
+            table=table,
+            on_output=on_output,
+            start_page=start_page,
+            end_page=end_page
+        )
+        if not success:
+            logger.error(f"MinerU常駐工作程序錯誤: {error}")
+            all_output.append(error)
+            return 1, all_output
+        return 0, all_output
+
+    def _choose_parse_method(self, pdf_path: str, method: str, document_dir: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        依預檢分析結果選擇實際的解析方法，並記錄決策於文件輸出目錄 (preflight.json)
+
+        Args:
+            pdf_path: PDF檔案路徑
+            method: 請求的解析方法
+            document_dir: 文件輸出目錄
+
+        Returns:
+            Tuple(parse_method, preflight): 實際使用的解析方法及預檢分析結果 (未執行時為 None)
+        """
+        if not self.preflight or method not in self.preflight_methods:
+            return method, None
+
+        preflight = self.pdf_analyzer.analyze(pdf_path)
+        suggested = preflight.get("method")
+        # 文字層混合 (auto) 時保留請求的方法，由MinerU逐頁判斷
+        parse_method = suggested if suggested in ("txt", "ocr") else method
+        preflight["requested_method"] = method
+        preflight["parse_method"] = parse_method
+
+        if parse_method != method:
+            logger.info(f"預檢分析結果: 解析方法由 {method} 改為 {parse_method} (原生數位頁面比例 {preflight['text_page_ratio']:.0%})")
+        try:
+            os.makedirs(document_dir, exist_ok=True)
+            with open(os.path.join(document_dir, "preflight.json"), "w", encoding="utf-8") as f:
+                json.dump(preflight, f, ensure_ascii=False, indent=4)
+        except OSError as e:
+            logger.warning(f"記錄預檢分析結果失敗: {e}")
+        return parse_method, preflight
+
+    def _count_pages(self, pdf_path: str) -> int:
+        """取得PDF頁數 (無法讀取時返回0，即不分段)"""
+        try:
+            import pypdfium2 as pdfium  # MinerU的依賴套件
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except Exception as e:
+            logger.warning(f"無法讀取PDF頁數，不進行分段處理: {e}")
+            return 0
+
+    def _run_sharded(self, 
+            pdf_path: str, 
+            page_count: int, 
+            expected_output_dir: str, 
+            method: str, 
+            backend: str, 
+            lang: str, 
+            formula: bool, 
+            table: bool, 
+            device: str
+        ) -> Tuple[int, List[str]]:
+        """
+        將PDF依頁碼範圍分段，平行處理後合併輸出 (content_list.json、Markdown及圖片)
+
+        Args:
+            pdf_path: PDF檔案路徑
+            page_count: PDF總頁數
+            expected_output_dir: 合併後的輸出目錄 (與整份文件處理時的輸出目錄相同)
+
+        Returns:
+            Tuple(return_code, all_output): 返回代碼 (成功為0) 及所有輸出行
+        """
+        shard_dir = os.path.join(os.path.dirname(expected_output_dir), "_shards")
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+        page_ranges = [
+            (start, min(start + self.shard_pages, page_count) - 1)
+            for start in range(0, page_count, self.shard_pages)
+        ]
+        if self.verbose:
+            logger.info(f"PDF共 {page_count} 頁，分為 {len(page_ranges)} 段平行處理: {page_ranges}")
+
+        def run_shard(index: int, start: int, end: int) -> Tuple[int, List[str]]:
+            shard_output = os.path.join(shard_dir, str(index))
+            return_code = None
+            if self.worker_mode:
+                return_code, output = self._run_with_worker_pool(
+                    pdf_path, shard_output, method, backend, lang, formula, table, device,
+                    start_page=start, end_page=end
+                )
+            if return_code != 0:
+                cmd = [
+                    "mineru",
+                    "-p", str(pdf_path),
+                    "-o", str(shard_output),
+                    "-m", method,
+                    "-b", backend,
+                    "-l", lang,
+                    "-f", str(formula).lower(),
+                    "-t", str(table).lower(),
+                    "-d", device,
+                    "-s", str(start),
+                    "-e", str(end)
+                ]
+                return_code, output = self._run_with_cli(cmd)
+            return return_code, output
+
+        all_output = []
+        failed = False
+        started_at = time.time()
+        with ThreadPoolExecutor(max_workers=self.shard_workers, thread_name_prefix="mineru-shard") as executor:
+            futures = {
+                executor.submit(run_shard, index, start, end): index
+                for index, (start, end) in enumerate(page_ranges)
+            }
+            for finished, future in enumerate(as_completed(futures), start=1):
+                return_code, output = future.result()
+                all_output.extend(output)
+                if return_code != 0:
+                    logger.error(f"第 {futures[future] + 1} 段 (頁碼 {page_ranges[futures[future]]}) 處理失敗")
+                    failed = True
+                # 分段處理時以完成的段數更新進度及預估剩餘時間 (各段輸出交錯，無法對應單一處理階段)
+                ProgressManager.progress_update(
+                    3 + 24 * finished / len(page_ranges), 
+                    f"處理中: 已完成 {finished}/{len(page_ranges)} 段", 
+                    "processing-pdf",
+                    eta_seconds=(time.time() - started_at) / finished * (len(page_ranges) - finished)
+                )
+
+        try:
+            if failed or not self._merge_shards(shard_dir, page_ranges, expected_output_dir, os.path.splitext(os.path.basename(pdf_path))[0], method):
+                return 1, all_output
+            return 0, all_output
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+    def _merge_shards(self, 
+            shard_dir: str, 
+            page_ranges: List[Tuple[int, int]], 
+            expected_output_dir: str, 
+            file_stem: str, 
+            method: str
+        ) -> bool:
+        """
+        合併分段輸出：修正頁碼 (page_idx) 與圖片路徑，依頁碼順序串接內容及Markdown
+
+        Args:
+            shard_dir: 分段輸出的根目錄
+            page_ranges: 各段的頁碼範圍
+            expected_output_dir: 合併後的輸出目錄
+            file_stem: 輸出檔名 (不含副檔名)
+            method: 解析方法
+
+        Returns:
+            bool: 是否合併成功
+        """
+        merged_content: List[Dict[str, Any]] = []
+        merged_markdown: List[str] = []
+        images_dir = os.path.join(expected_output_dir, "images")
+        os.makedirs(images_dir, exist_ok=True)
+
+        try:
+            for index, (start, _) in enumerate(page_ranges):
+                output_dir = os.path.join(shard_dir, str(index), file_stem, method)
+
+                with open(os.path.join(output_dir, f"{file_stem}_content_list.json"), "r", encoding="utf-8") as f:
+                    content_list = json.load(f)
+                for item in content_list:
+                    item["page_idx"] = item.get("page_idx", 0) + start
+                    if item.get("img_path"):
+                        item["img_path"] = f"images/{os.path.basename(item['img_path'])}"
+                merged_content.extend(content_list)
+
+                markdown_path = os.path.join(output_dir, f"{file_stem}.md")
+                if os.path.exists(markdown_path):
+                    with open(markdown_path, "r", encoding="utf-8") as f:
+                        merged_markdown.append(f.read().strip())
+
+                # 圖片以內容雜湊值命名，不同段落的同名圖片內容相同
+                shard_images = os.path.join(output_dir, "images")
+                if os.path.isdir(shard_images):
+                    for image in os.listdir(shard_images):
+                        target = os.path.join(images_dir, image)
+                        if not os.path.exists(target):
+                            shutil.move(os.path.join(shard_images, image), target)
+
+            with open(os.path.join(expected_output_dir, f"{file_stem}_content_list.json"), "w", encoding="utf-8") as f:
+                json.dump(merged_content, f, ensure_ascii=False, indent=4)
+            with open(os.path.join(expected_output_dir, f"{file_stem}.md"), "w", encoding="utf-8") as f:
+                f.write("\n\n".join(merged_markdown) + "\n")
+        except Exception as e:
+            logger.error(f"合併分段輸出時發生錯誤: {e}")
+            return False
+
+        if self.verbose:
+            logger.info(f"已合併 {len(page_ranges)} 段輸出，共 {len(merged_content)} 個內容項目")
+        return True
+
+    def _get_worker_pool(self, device: str) -> MinerUWorkerPool:
+        """取得對應設備的常駐工作程序池 (設備變更時重新建立)"""
+        with self._worker_pool_lock:
+            if self._worker_pool is None or self._worker_pool.device != device:
+                if self._worker_pool is not None:
+                    self._worker_pool.shutdown()
+                self._worker_pool = MinerUWorkerPool(
+                    num_workers=max(self.num_workers, self.shard_workers if self.shard_pages else 1),
+                    device=device,
+                    verbose=self.verbose
+                )
+            return self._worker_pool
+
+    def get_worker_status(self) -> Optional[Dict[str, Any]]:
+        """獲取常駐工作程序池狀態 (未啟用或尚未建立時返回 None)"""
+        if self._worker_pool is None:
+            return None
+        return self._worker_pool.get_status()
+
     def _check_hashed_filename(self, pdf_name: str) -> Tuple[str, str]:
         """
         檢查是否需要使用雜湊檔名來避免路徑過長或非法字元問題。
@@ -249,15 +602,16 @@ class MinerUProcessor:
         logger.warning(f"原檔名: {original_filename}")
         logger.warning(f"短檔名: {short_filename}")
 
-        # 創建短檔名的 PDF 副本
-        import shutil
+        # 創建短檔名的 PDF 連結 (硬連結/reflink/符號連結，皆不支援時才完整複製)
         short_pdf_path = os.path.join(self.default_path, short_pdf_name)
         if not os.path.exists(original_pdf_path):
             logger.warning(f"原始PDF檔案不存在: {original_pdf_path}")
-        elif not os.path.exists(short_pdf_path):
-            shutil.copy2(original_pdf_path, short_pdf_path)
         else:
-            logger.info(f"短檔名副本已存在: {short_pdf_path}")
+            link_method = link_or_copy(original_pdf_path, short_pdf_path, mode=self.link_mode)
+            if link_method == "skipped":
+                logger.info(f"短檔名副本已存在: {short_pdf_path}")
+            elif self.verbose:
+                logger.info(f"已建立短檔名副本 ({link_method}): {short_pdf_path}")
         
         # 使用短檔名處理
         pdf_path = short_pdf_path
@@ -271,31 +625,22 @@ class MinerUProcessor:
         }
         return processing_filename, pdf_path
 
-    def _update_progress(self, message: str):
-        """更新處理進度"""
+    def _update_progress(self, message: str, tracker: MinerUProgressTracker):
+        """
+        依MinerU輸出更新處理進度及預估剩餘時間
+
+        Args:
+            message: MinerU輸出行
+            tracker: 本次處理的進度追蹤
+        """
         if not message:
             return
 
-        progress: Tuple[float, str] = (-1.0, "錯誤狀態")
-        if "fetching" in message.lower():
-            progress = (6.0, "處理中: 獲取頁面")
-        elif "layout predict" in message.lower():
-            progress = (9.0, "處理中: 版面預測")
-        elif "mfd predict" in message.lower():
-            progress = (12.0, "處理中: 表格分析")
-        elif "mfr predict" in message.lower():
-            progress = (15.0, "處理中: 版面分析")
-        elif "table-ocr" in message.lower():
-            progress = (18.0, "處理中: 表格 OCR 辨識")
-        elif "table-wireless" in message.lower():
-            progress = (21.0, "處理中: 表格預測")
-        elif "ocr-det" in message.lower():
-            progress = (24.0, "處理中: OCR 文字辨識")
-        elif "processing pages" in message.lower():
-            progress = (27.0, "處理中: 最後處理頁面")
-        else:
+        update = tracker.feed(message)
+        if update is None:
             return  # 無需更新
-        ProgressManager.progress_update(*progress, "processing-pdf")
+        progress, status, eta_seconds = update
+        ProgressManager.progress_update(progress, status, "processing-pdf", eta_seconds=eta_seconds)
 
     def _find_generated_files(self, output_path: str, file_name: str, method: str) -> Dict[str, Any]:
         """在輸出目錄中尋找MinerU生成的檔案"""
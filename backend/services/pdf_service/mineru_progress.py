@@ -0,0 +1,235 @@
+"""
+MinerU進度解析 - 將MinerU的tqdm進度條輸出解析為各處理階段的實際進度及預估剩餘時間，並記錄各階段耗時
+"""
+import os
+import re
+import json
+import time
+from collections import deque
+from threading import Lock
+from typing import Dict, Any, Optional, Tuple, List
+
+import logging
+from backend.api.logger import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+# MinerU處理階段 (關鍵字, 階段名稱, 顯示訊息)，依執行順序排列並平均分配進度範圍
+MINERU_PHASES: List[Tuple[str, str, str]] = [
+    ("fetching", "fetching", "獲取頁面"),
+    ("layout predict", "layout", "版面預測"),
+    ("mfd predict", "mfd", "表格分析"),
+    ("mfr predict", "mfr", "版面分析"),
+    ("table-ocr", "table_ocr", "表格 OCR 辨識"),
+    ("table-wireless", "table_wireless", "表格預測"),
+    ("ocr-det", "ocr_det", "OCR 文字辨識"),
+    ("processing pages", "pages", "最後處理頁面"),
+]
+
+# tqdm 進度條: "Layout Predict: 45%|████▌     | 9/20 [00:03<00:04,  2.61it/s]"
+_TQDM_PATTERN = re.compile(
+    r"(?P<desc>[^:|\r\n]+?):\s*(?P<percent>\d+)%\|[^|]*\|\s*(?P<n>\d+)/(?P<total>\d+)"
+    r"(?:\s*\[(?P<elapsed>[\d:]+)<(?P<remaining>[\d:?]+)(?:,\s*(?P<rate>[\d.]+)(?P<unit>it/s|s/it))?)?"
+)
+
+class MinerUPhaseTimings:
+    """
+    ### MinerU各階段耗時紀錄
+
+    每份文件處理完成後以JSON Lines格式附加一筆紀錄 (供容量規劃使用)，
+    並以最近的紀錄估算各階段每頁所需秒數 (用於預估尚未開始的階段的剩餘時間)。
+    """
+    def __init__(self, file_path: str, history_size: int = 50):
+        """
+        初始化耗時紀錄
+
+        Args:
+            file_path: JSON Lines紀錄檔路徑
+            history_size: 估算每頁秒數時參考的最近紀錄數量
+        """
+        self.file_path = file_path
+        self._lock = Lock()
+        self._history: deque = deque(maxlen=history_size)
+
+        if os.path.exists(file_path):
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            self._history.append(json.loads(line))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"讀取MinerU階段耗時紀錄失敗: {e}")
+
+    def record(self, entry: Dict[str, Any]):
+        """
+        附加一筆處理紀錄
+
+        Args:
+            entry: 處理紀錄 (document, pages, device, method, phases, total_seconds, success)
+        """
+        with self._lock:
+            try:
+                with open(self.file_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning(f"寫入MinerU階段耗時紀錄失敗: {e}")
+            if entry.get("success"):
+                self._history.append(entry)
+
+    def seconds_per_page(self, phase: str, device: str) -> Optional[float]:
+        """
+        估算指定階段每頁所需秒數
+
+        Args:
+            phase: 階段名稱
+            device: 設備模式 (只參考相同設備的紀錄)
+
+        Returns:
+            float: 每頁秒數 (無可參考的紀錄時返回 None)
+        """
+        with self._lock:
+            samples = [
+                entry["phases"][phase] / entry["pages"]
+                for entry in self._history
+                if entry.get("device") == device and entry.get("pages") and phase in entry.get("phases", {})
+            ]
+        return sum(samples) / len(samples) if samples else None
+
+class MinerUProgressTracker:
+    """
+    ### 單份文件的MinerU進度追蹤
+
+    解析tqdm輸出的目前數量/總數量及處理速率，換算為階段內的進度百分比；
+    預估剩餘時間 = 目前階段依速率計算的剩餘時間 + 後續階段依歷史紀錄估算的時間。
+    無法解析的關鍵字行則跳至該階段的起始進度。
+    """
+    def __init__(self,
+            timings: MinerUPhaseTimings,
+            document_name: str,
+            device: str,
+            method: str,
+            page_count: int = 0,
+            progress_range: Tuple[float, float] = (3.0, 27.0),
+            min_interval: float = 1.0
+        ):
+        """
+        初始化進度追蹤
+
+        Args:
+            timings: 階段耗時紀錄
+            document_name: 文件名稱
+            device: 設備模式
+            method: 解析方法
+            page_count: PDF頁數 (0 表示未知，以版面預測的總數代替)
+            progress_range: MinerU處理對應的整體進度範圍
+            min_interval: 同一階段內兩次回報的最短間隔秒數
+        """
+        self.timings = timings
+        self.document_name = document_name
+        self.device = device
+        self.method = method
+        self.page_count = page_count
+        self.progress_range = progress_range
+        self.min_interval = min_interval
+
+        self._started_at = time.time()
+        self._phase_index = -1
+        self._phase_started_at = self._started_at
+        self._phase_seconds: Dict[str, float] = {}
+        self._last_report = 0.0
+
+    def _phase_progress(self, index: int, fraction: float) -> float:
+        """換算階段內的進度為整體進度百分比"""
+        start, end = self.progress_range
+        width = (end - start) / len(MINERU_PHASES)
+        return start + width * (index + min(max(fraction, 0.0), 1.0))
+
+    def _enter_phase(self, index: int):
+        """進入新的處理階段並記錄前一階段耗時"""
+        now = time.time()
+        if self._phase_index >= 0:
+            name = MINERU_PHASES[self._phase_index][1]
+            self._phase_seconds[name] = self._phase_seconds.get(name, 0.0) + now - self._phase_started_at
+        self._phase_index = index
+        self._phase_started_at = now
+        self._last_report = 0.0
+
+    def _estimate_eta(self, n: int, total: int, rate: Optional[float]) -> Optional[float]:
+        """預估剩餘秒數 (目前階段依速率，後續階段依歷史每頁秒數)"""
+        if rate:
+            eta = (total - n) / rate
+        elif n:
+            eta = (time.time() - self._phase_started_at) / n * (total - n)
+        else:
+            return None
+
+        pages = self.page_count or total
+        for _, name, _ in MINERU_PHASES[self._phase_index + 1:]:
+            seconds_per_page = self.timings.seconds_per_page(name, self.device)
+            if seconds_per_page:
+                eta += seconds_per_page * pages
+        return eta
+
+    def feed(self, line: str) -> Optional[Tuple[float, str, Optional[float]]]:
+        """
+        解析一行MinerU輸出
+
+        Args:
+            line: MinerU輸出行
+
+        Returns:
+            Tuple(progress, message, eta_seconds): 需要回報的進度 (無需回報時返回 None)
+        """
+        lowered = line.lower()
+        index = next((i for i, (keyword, _, _) in enumerate(MINERU_PHASES) if keyword in lowered), None)
+        if index is None:
+            return None
+        if index != self._phase_index:
+            self._enter_phase(index)
+        label = MINERU_PHASES[index][2]
+
+        match = _TQDM_PATTERN.search(line)
+        if not match or not int(match.group("total")):
+            return self._phase_progress(index, 0.0), f"處理中: {label}", None
+
+        n, total = int(match.group("n")), int(match.group("total"))
+        if index == 1 and not self.page_count:
+            self.page_count = total  # 版面預測以頁為單位
+
+        now = time.time()
+        if n < total and now - self._last_report < self.min_interval:
+            return None  # 限制回報頻率
+        self._last_report = now
+
+        rate = None
+        if match.group("rate"):
+            rate = float(match.group("rate"))
+            if match.group("unit") == "s/it":
+                rate = 1 / rate if rate else None
+
+        eta = self._estimate_eta(n, total, rate)
+        return self._phase_progress(index, n / total), f"處理中: {label} ({n}/{total})", eta
+
+    def finish(self, success: bool, sharded: bool = False):
+        """
+        結束追蹤並記錄各階段耗時
+
+        Args:
+            success: 是否處理成功
+            sharded: 是否為分段處理 (各段輸出交錯，只記錄總耗時)
+        """
+        if self._phase_index >= 0:
+            self._enter_phase(-1)
+        total_seconds = time.time() - self._started_at
+        self.timings.record({
+            "document": self.document_name,
+            "pages": self.page_count,
+            "device": self.device,
+            "method": self.method,
+            "sharded": sharded,
+            "phases": {name: round(seconds, 3) for name, seconds in self._phase_seconds.items()},
+            "total_seconds": round(total_seconds, 3),
+            "success": success,
+            "finished_at": time.time()
+        })
@@ -0,0 +1,296 @@
+"""
+MinerU常駐工作程序 - 保持模型載入於記憶體中，連續處理多份PDF時不需重複啟動直譯器及載入模型
+
+工作程序以獨立的 Python 直譯器啟動並執行 `_worker_main`，
+透過 stdin 接收JSON格式的工作，透過原始 stdout 回傳結果事件；MinerU 的日誌與進度條輸出至 stderr。
+"""
+import os
+import sys
+import json
+import atexit
+import argparse
+import subprocess
+import traceback
+from pathlib import Path
+from queue import Queue, Empty
+from threading import Thread, Lock
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+import logging
+from backend.api.logger import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+# 以 -c 匯入後執行，避免 `python -m` 在套件已匯入本模組時重複執行
+_WORKER_ENTRY = "from backend.services.pdf_service.mineru_worker import _worker_main; _worker_main()"
+
+class MinerUWorker:
+    """
+    ### 單一MinerU常駐工作程序
+
+    同一時間只處理一份工作，stderr 的輸出皆屬於當前工作。
+    """
+    def __init__(self, worker_id: int, device: str, verbose: bool = False):
+        """
+        啟動工作程序
+
+        Args:
+            worker_id: 工作程序編號
+            device: 設備模式 (cuda/cpu)
+            verbose: 是否啟用詳細模式
+        """
+        self.worker_id = worker_id
+        self.device = device
+        self.verbose = verbose
+
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+        env["PYTHONIOENCODING"] = "utf-8"
+
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", _WORKER_ENTRY, "--device", device],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            cwd=str(PROJECT_ROOT),
+            env=env
+        )
+
+        # stdout (結果事件) 與 stderr (日誌輸出) 皆轉送到同一個事件佇列
+        self._events: Queue = Queue()
+        Thread(target=self._read_events, daemon=True, name=f"mineru-worker-{worker_id}-events").start()
+        Thread(target=self._read_output, daemon=True, name=f"mineru-worker-{worker_id}-output").start()
+
+        if self.verbose:
+            logger.info(f"[MinerUWorker] 工作程序 {worker_id} 已啟動 (PID: {self.process.pid}, 設備: {device})")
+
+    def _read_events(self):
+        """讀取工作程序回傳的結果事件"""
+        for line in self.process.stdout:
+            try:
+                self._events.put(("event", json.loads(line)))
+            except json.JSONDecodeError:
+                self._events.put(("output", line.rstrip()))
+        self._events.put(("exit", None))
+
+    def _read_output(self):
+        """讀取工作程序的日誌與進度條輸出"""
+        for line in self.process.stderr:
+            if line.strip():
+                self._events.put(("output", line.rstrip()))
+
+    def is_alive(self) -> bool:
+        """工作程序是否仍在執行"""
+        return self.process.poll() is None
+
+    def run(self, job: Dict[str, Any], on_output: Callable[[str], None]) -> Tuple[bool, str]:
+        """
+        執行一份工作並等待完成
+
+        Args:
+            job: 工作內容 (pdf_path, output_dir, method, backend, lang, formula, table, start_page, end_page)
+            on_output: 收到日誌輸出時的回呼函式 (在呼叫端執行緒執行)
+
+        Returns:
+            Tuple(success, error): 是否成功及錯誤訊息
+        """
+        try:
+            self.process.stdin.write(json.dumps(job, ensure_ascii=False) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            return False, f"無法傳送工作給工作程序: {e}"
+
+        while True:
+            try:
+                kind, payload = self._events.get(timeout=5)
+            except Empty:
+                if not self.is_alive():
+                    return False, f"工作程序異常結束 (返回代碼: {self.process.poll()})"
+                continue
+
+            if kind == "output":
+                on_output(payload)
+            elif kind == "exit":
+                return False, f"工作程序異常結束 (返回代碼: {self.process.poll()})"
+            elif payload.get("type") == "done":
+                return True, ""
+            elif payload.get("type") == "error":
+                return False, payload.get("error", "未知錯誤")
+            # 其他事件 (ready) 忽略
+
+    def stop(self, timeout: float = 10):
+        """關閉工作程序"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except Exception:
+            self.process.kill()
+
+class MinerUWorkerPool:
+    """
+    ### MinerU常駐工作程序池
+
+    工作程序在第一次使用時啟動，模型在第一份工作時載入並保留至工作程序結束；
+    工作程序異常結束時會於下次取用時重新啟動。
+    """
+    def __init__(self, num_workers: int = 1, device: str = "cpu", verbose: bool = False):
+        """
+        初始化工作程序池
+
+        Args:
+            num_workers: 工作程序數量 (每個工作程序各自載入一份模型)
+            device: 設備模式 (cuda/cpu)
+            verbose: 是否啟用詳細模式
+        """
+        self.num_workers = max(num_workers, 1)
+        self.device = device
+        self.verbose = verbose
+
+        self._idle: Queue = Queue()
+        self._workers: List[Optional[MinerUWorker]] = [None] * self.num_workers
+        for worker_id in range(self.num_workers):
+            self._idle.put(worker_id)
+        self._closed = False
+        self._lock = Lock()
+
+        atexit.register(self.shutdown)
+
+    def run(self,
+            pdf_path: str,
+            output_dir: str,
+            method: str,
+            backend: str,
+            lang: str,
+            formula: bool,
+            table: bool,
+            on_output: Callable[[str], None],
+            start_page: int = 0,
+            end_page: Optional[int] = None
+        ) -> Tuple[bool, str]:
+        """
+        使用閒置的工作程序處理PDF (無閒置工作程序時等待)
+
+        Args:
+            pdf_path: PDF檔案路徑
+            output_dir: 輸出目錄
+            method: 解析方法 (auto/txt/ocr)
+            backend: 後端引擎
+            lang: 語言設定
+            formula: 是否解析公式
+            table: 是否解析表格
+            on_output: 收到日誌輸出時的回呼函式
+            start_page: 起始頁碼 (從0開始)
+            end_page: 結束頁碼 (包含該頁，None 表示處理至最後一頁)
+
+        Returns:
+            Tuple(success, error): 是否成功及錯誤訊息
+        """
+        if self._closed:
+            return False, "工作程序池已關閉"
+
+        worker_id = self._idle.get()
+        try:
+            worker = self._get_worker(worker_id)
+            return worker.run(
+                {
+                    "pdf_path": str(pdf_path),
+                    "output_dir": str(output_dir),
+                    "method": method,
+                    "backend": backend,
+                    "lang": lang,
+                    "formula": formula,
+                    "table": table,
+                    "start_page": start_page,
+                    "end_page": end_page
+                },
+                on_output
+            )
+        except Exception as e:
+            logger.error(f"[MinerUWorkerPool] 工作程序 {worker_id} 執行工作時出錯: {e}")
+            return False, str(e)
+        finally:
+            self._idle.put(worker_id)
+
+    def _get_worker(self, worker_id: int) -> MinerUWorker:
+        """取得工作程序 (尚未啟動或已結束時重新啟動)"""
+        with self._lock:
+            worker = self._workers[worker_id]
+            if worker is None or not worker.is_alive():
+                if worker is not None:
+                    logger.warning(f"[MinerUWorkerPool] 工作程序 {worker_id} 已結束，重新啟動")
+                worker = MinerUWorker(worker_id, self.device, verbose=self.verbose)
+                self._workers[worker_id] = worker
+            return worker
+
+    def get_status(self) -> Dict[str, Any]:
+        """獲取工作程序池狀態"""
+        with self._lock:
+            return {
+                "device": self.device,
+                "num_workers": self.num_workers,
+                "alive_workers": sum(1 for worker in self._workers if worker is not None and worker.is_alive()),
+                "idle_workers": self._idle.qsize()
+            }
+
+    def shutdown(self):
+        """關閉所有工作程序"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = [worker for worker in self._workers if worker is not None]
+        for worker in workers:
+            worker.stop()
+        if self.verbose and workers:
+            logger.info(f"[MinerUWorkerPool] 已關閉 {len(workers)} 個工作程序")
+
+def _worker_main():
+    """工作程序進入點：載入MinerU後循環處理 stdin 傳入的工作"""
+    parser = argparse.ArgumentParser(description="MinerU常駐工作程序")
+    parser.add_argument("--device", default="cpu", help="設備模式 (cuda/cpu)")
+    args = parser.parse_args()
+
+    # 保留原始 stdout 作為結果事件通道，其餘輸出一律導向 stderr
+    events = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    def send(event: Dict[str, Any]):
+        events.write(json.dumps(event, ensure_ascii=False) + "\n")
+        events.flush()
+
+    os.environ["MINERU_DEVICE_MODE"] = args.device
+    try:
+        from mineru.cli.common import do_parse, read_fn
+    except Exception:
+        send({"type": "error", "error": traceback.format_exc()})
+        sys.exit(1)
+    send({"type": "ready"})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            pdf_path = Path(job["pdf_path"])
+            do_parse(
+                output_dir=job["output_dir"],
+                pdf_file_names=[pdf_path.stem],
+                pdf_bytes_list=[read_fn(pdf_path)],
+                p_lang_list=[job["lang"]],
+                backend=job["backend"],
+                parse_method=job["method"],
+                formula_enable=job["formula"],
+                table_enable=job["table"],
+                start_page_id=job.get("start_page", 0),
+                end_page_id=job.get("end_page")
+            )
+            send({"type": "done"})
+        except Exception:
+            send({"type": "error", "error": traceback.format_exc()})
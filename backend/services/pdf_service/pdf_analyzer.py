@@ -0,0 +1,143 @@
+"""
+PDF預檢分析 - 抽樣檢查頁面的文字層、字元對應品質及圖片覆蓋率，判斷PDF是否可直接擷取文字而不需OCR
+"""
+import time
+from typing import Dict, Any, List, Literal
+
+import logging
+from backend.api.logger import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+class PDFAnalyzer:
+    """
+    ### PDF預檢分析器
+
+    每頁依以下條件判斷是否為原生數位頁面 (具備可用的文字層)：
+    - 可擷取的字元數量達到下限
+    - 有效字元比例 (非替代字元、非私用區字元) 達到下限，避免字型缺少Unicode對應時擷取出亂碼
+    - 圖片覆蓋率低於上限 (掃描頁面通常為整頁圖片，可能附帶品質不明的OCR文字層)
+
+    抽樣頁面皆為原生數位頁面時建議使用 txt，皆無文字層時建議使用 ocr，混合時交由 MinerU 的 auto 逐頁判斷。
+    """
+    MIN_CHARS_PER_PAGE = 50         # 具備文字層的最少字元數
+    MIN_VALID_CHAR_RATIO = 0.9      # 有效字元比例下限
+    MAX_IMAGE_COVERAGE = 0.5        # 原生數位頁面的圖片覆蓋率上限
+    MIN_TEXT_PAGE_RATIO = 0.9       # 建議使用 txt 的原生數位頁面比例下限
+
+    def __init__(self, sample_pages: int = 8, verbose: bool = False):
+        """
+        初始化PDF預檢分析器
+
+        Args:
+            sample_pages: 抽樣檢查的頁數 (平均分布於整份文件)
+            verbose: 是否啟用詳細日誌
+        """
+        self.sample_pages = max(sample_pages, 1)
+        self.verbose = verbose
+
+    @staticmethod
+    def _is_valid_char(char: str) -> bool:
+        """字元是否具備有效的Unicode對應"""
+        if char == "\ufffd" or "\ue000" <= char <= "\uf8ff":  # 替代字元、私用區字元
+            return False
+        return char.isprintable() or char.isspace()
+
+    def _analyze_page(self, page, pdfium_c) -> Dict[str, Any]:
+        """分析單一頁面的文字層及圖片覆蓋率"""
+        width, height = page.get_size()
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_bounded()
+        finally:
+            textpage.close()
+
+        chars = [char for char in text if not char.isspace()]
+        valid_ratio = sum(1 for char in chars if self._is_valid_char(char)) / len(chars) if chars else 0.0
+
+        image_area = 0.0
+        for obj in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,)):
+            left, bottom, right, top = obj.get_pos()
+            image_area += max(right - left, 0) * max(top - bottom, 0)
+        image_coverage = min(image_area / (width * height), 1.0) if width and height else 0.0
+
+        has_text_layer = (
+            len(chars) >= self.MIN_CHARS_PER_PAGE
+            and valid_ratio >= self.MIN_VALID_CHAR_RATIO
+            and image_coverage < self.MAX_IMAGE_COVERAGE
+        )
+        return {
+            "chars": len(chars),
+            "valid_char_ratio": round(valid_ratio, 4),
+            "image_coverage": round(image_coverage, 4),
+            "has_text_layer": has_text_layer
+        }
+
+    def analyze(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        抽樣分析PDF並建議解析方法
+
+        Args:
+            pdf_path: PDF檔案路徑
+
+        Returns:
+            Dict ([str, Any]): 分析結果
+                - method (str): 建議的解析方法 (txt/ocr/auto，無法分析時為 None)
+                - page_count (int): PDF總頁數
+                - text_page_ratio (float): 抽樣頁面中原生數位頁面的比例
+                - pages (Dict[int, Dict]): 各抽樣頁面的分析結果
+                - analysis_time (float): 分析耗時 (秒)
+                - error (str): 錯誤訊息 (如果有的話)
+        """
+        start = time.time()
+        try:
+            import pypdfium2 as pdfium  # MinerU的依賴套件
+            import pypdfium2.raw as pdfium_c
+
+            pdf = pdfium.PdfDocument(pdf_path)
+        except Exception as e:
+            logger.warning(f"PDF預檢分析失敗，無法開啟檔案: {e}")
+            return {"method": None, "error": str(e)}
+
+        try:
+            page_count = len(pdf)
+            if page_count == 0:
+                return {"method": None, "page_count": 0, "error": "PDF沒有頁面"}
+
+            sample_count = min(self.sample_pages, page_count)
+            sampled: List[int] = sorted({int(i * page_count / sample_count) for i in range(sample_count)})
+
+            pages: Dict[int, Dict[str, Any]] = {}
+            for index in sampled:
+                page = pdf[index]
+                try:
+                    pages[index] = self._analyze_page(page, pdfium_c)
+                finally:
+                    page.close()
+        except Exception as e:
+            logger.warning(f"PDF預檢分析失敗: {e}")
+            return {"method": None, "error": str(e)}
+        finally:
+            pdf.close()
+
+        text_page_ratio = sum(1 for page in pages.values() if page["has_text_layer"]) / len(pages)
+        method: Literal["txt", "ocr", "auto"]
+        if text_page_ratio >= self.MIN_TEXT_PAGE_RATIO:
+            method = "txt"
+        elif text_page_ratio == 0:
+            method = "ocr"
+        else:
+            method = "auto"
+
+        result = {
+            "method": method,
+            "page_count": page_count,
+            "text_page_ratio": round(text_page_ratio, 4),
+            "pages": pages,
+            "analysis_time": round(time.time() - start, 3),
+            "error": ""
+        }
+        if self.verbose:
+            logger.info(f"PDF預檢分析完成: 建議方法 {method}，原生數位頁面比例 {text_page_ratio:.0%} (抽樣 {len(pages)}/{page_count} 頁，耗時 {result['analysis_time']:.2f} 秒)")
+        return result
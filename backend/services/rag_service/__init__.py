@@ -2,13 +2,17 @@
 RAG服務模組 - 基於Ollama Embedding和ChromaDB的檢索增強生成系統
 """
 from .document_processor import DocumentProcessor
+from .embedding_cache import EmbeddingCache
 from .embedding_service import EmbeddingService
 from .chroma_database import ChromaVectorStore
+from .ingest_stream import IngestStream
 from .rag_engine import RAGEngine
 
 __all__ = [
     'DocumentProcessor',
+    'EmbeddingCache',
     'EmbeddingService', 
     'ChromaVectorStore',
+    'IngestStream',
     'RAGEngine'
 ]
@@ -55,7 +55,8 @@ class ChromaVectorStore:
             logger.info(f"ChromaDB向量儲存服務初始化完成，持久化目錄: {self.persist_directory}")
 
     def get_create_collection(self, collection_name: str, 
-        distance_metric: Literal['cosine', 'l2', 'ip'], load_into_cache: bool = True
+        distance_metric: Literal['cosine', 'l2', 'ip'], load_into_cache: bool = True,
+        metadata: Optional[Dict[str, Any]] = None
     ) -> Optional[chromadb.Collection]:
         """
         獲取集合物件 (並存入緩存)
@@ -67,6 +68,7 @@ class ChromaVectorStore:
                 - l2: 適合圖像相似度 (0~無限大，越小越相似)
                 - ip: 內積，適合某些特定場景 (-無限大~無限大，越大越相似)
             load_into_cache: 是否將獲取的集合存入緩存
+            metadata: 創建新集合時附加的核心數據 (例如 {"embedding_model": "ollama/nomic-embed-text"})
 
         Returns:
             chromadb.Collection: 集合物件 (失敗返回None)
@@ -86,7 +88,7 @@ class ChromaVectorStore:
             try:
                 collection = self.client.create_collection(
                     name=collection_name,
-                    metadata={"hnsw:space": distance_metric}
+                    metadata={**(metadata or {}), "hnsw:space": distance_metric}
                 )
                 if self.verbose:
                     logger.info(f"創建新集合: {collection_name}")
@@ -106,7 +108,9 @@ class ChromaVectorStore:
         self.collection_cache[collection_name] = collection
         return collection
 
-    def add_chunks(self, chunks: List[DocumentChunk], embeddings: List[List[float]], collection_name: str = None) -> bool:
+    def add_chunks(self, chunks: List[DocumentChunk], embeddings: List[List[float]], collection_name: str = None,
+        embedding_model: Optional[str] = None
+    ) -> bool:
         """
         新增內容片段和對應的embedding向量
         
@@ -114,6 +118,7 @@ class ChromaVectorStore:
             chunks: 內容片段列表
             embeddings: 對應的embedding向量列表
             collection_name: 向量資料庫集合名稱 (如未提供則使用chunks中的document_name)
+            embedding_model: 產生向量的Embedding模型 ("provider/model"，創建新集合時記錄於集合核心數據)
 
         Returns:
             是否成功
@@ -131,7 +136,8 @@ class ChromaVectorStore:
         collection_name = collection_name or chunks[0].document_name
         collection = self.get_create_collection(
             collection_name=collection_name,    # 使用內容名稱作為集合名稱
-            distance_metric="cosine"            # 適合文本相似度
+            distance_metric="cosine",           # 適合文本相似度
+            metadata={"embedding_model": embedding_model} if embedding_model else None
         )
         if collection is None:
             logger.error("無法獲取或創建集合，操作終止")
@@ -140,7 +146,7 @@ class ChromaVectorStore:
         try:
             ids = [chunk.chunk_id for chunk in chunks]
             existing_results = collection.get(ids=ids, include=[])['ids']
-            existing_ids = set(existing_results['ids']) if existing_results else set()
+            existing_ids = set(existing_results) if existing_results else set()
 
             filtered_chunks = [chunk for chunk in chunks if chunk.chunk_id not in existing_ids]
             filtered_embeddings = [embed for chunk, embed in zip(chunks, embeddings) if chunk.chunk_id not in existing_ids]
@@ -279,6 +285,7 @@ class ChromaVectorStore:
         try:
             # 刪除現有集合
             self.client.delete_collection(name=document_name)
+            self.collection_cache.pop(document_name, None)  # 避免緩存中殘留已刪除的集合物件
 
             # 檢查集合是否真的被刪除
             try:
@@ -291,6 +298,128 @@ class ChromaVectorStore:
             logger.error(f"刪除集合時出錯: {e}")
             return False
 
+    def rename_collection(self, old_name: str, new_name: str) -> bool:
+        """
+        將集合改名 (片段ID及核心數據中的內容名稱一併更新，沿用已計算的embedding向量)
+
+        Args:
+            old_name: 原集合名稱 (通常為檔案名稱)
+            new_name: 新集合名稱
+
+        Returns:
+            是否成功
+        """
+        if not self.has_collection(old_name):
+            return False
+
+        try:
+            old_collection = self.client.get_collection(name=old_name)
+            records = old_collection.get(include=["documents", "embeddings", "metadatas"])
+
+            if self.has_collection(new_name):
+                self.delete_collection(new_name)     # 新名稱的集合屬於其他內容，不可混用
+            new_collection = self.get_create_collection(
+                collection_name=new_name,
+                distance_metric=(old_collection.metadata or {}).get("hnsw:space", "cosine"),
+                metadata={key: value for key, value in (old_collection.metadata or {}).items() if key != "hnsw:space"}
+            )
+            if new_collection is None:
+                logger.error("無法創建集合，操作終止")
+                return False
+
+            if records["ids"]:
+                # 片段ID格式: {document_name}_chunk_{chunk_index}_{content_hash}
+                new_collection.add(
+                    ids=[new_name + chunk_id[len(old_name):] if chunk_id.startswith(old_name + "_chunk_") else chunk_id
+                         for chunk_id in records["ids"]],
+                    documents=records["documents"],
+                    embeddings=records["embeddings"],
+                    metadatas=[{**metadata, "document_name": new_name} for metadata in records["metadatas"]]
+                )
+            self.delete_collection(old_name)
+            logger.info(f"集合 {old_name} 已改名為 {new_name} ({len(records['ids'])} 個片段)")
+            return True
+        except Exception as e:
+            logger.error(f"集合改名時出錯: {e}")
+            return False
+
+    def get_embedding_model(self, collection_name: str) -> Optional[str]:
+        """
+        獲取集合記錄的Embedding模型
+
+        Args:
+            collection_name: 集合名稱 (通常為檔案名稱)
+
+        Returns:
+            str: 產生集合向量的Embedding模型 ("provider/model"，集合不存在或未記錄時返回 None)
+        """
+        if not self.has_collection(collection_name):
+            return None
+        collection = self.get_create_collection(
+            collection_name=collection_name,
+            distance_metric="cosine"
+        )
+        if collection is None:
+            return None
+        return (collection.metadata or {}).get("embedding_model")
+
+    def get_chunk_ids(self, collection_name: str) -> Optional[List[str]]:
+        """
+        獲取集合中所有片段的ID
+
+        Args:
+            collection_name: 集合名稱 (通常為檔案名稱)
+
+        Returns:
+            List[str]: 片段ID列表 (集合不存在時返回空列表，出錯時返回None)
+        """
+        if not self.has_collection(collection_name):
+            return []
+
+        collection = self.get_create_collection(
+            collection_name=collection_name,
+            distance_metric="cosine"
+        )
+        if collection is None:
+            logger.error("無法獲取集合，操作終止")
+            return None
+
+        try:
+            return collection.get(include=[])['ids']
+        except Exception as e:
+            logger.error(f"獲取片段ID時出錯: {e}")
+            return None
+
+    def delete_chunks(self, collection_name: str, chunk_ids: List[str]) -> bool:
+        """
+        刪除集合中指定的片段
+
+        Args:
+            collection_name: 集合名稱 (通常為檔案名稱)
+            chunk_ids: 要刪除的片段ID列表
+
+        Returns:
+            是否成功
+        """
+        if not chunk_ids:
+            return True
+
+        collection = self.get_create_collection(
+            collection_name=collection_name,
+            distance_metric="cosine"
+        )
+        if collection is None:
+            logger.error("無法獲取集合，操作終止")
+            return False
+
+        try:
+            collection.delete(ids=list(chunk_ids))
+            logger.info(f"成功從集合 {collection_name} 刪除 {len(chunk_ids)} 個片段")
+            return True
+        except Exception as e:
+            logger.error(f"刪除片段時出錯: {e}")
+            return False
+
     def update_chunk(self, update_id: str, new_embedding: List[float], 
         new_content: str = None, new_page_num: int = None, new_chunk_index: int = None
     ) -> bool:
@@ -452,6 +581,24 @@ class ChromaVectorStore:
             logger.error(f"導入集合數據時出錯: {e}")
             return False
 
+    def has_collection(self, collection_name: str) -> bool:
+        """
+        檢查集合是否存在 (直接查詢單一集合，不需列出所有集合)
+
+        Args:
+            collection_name: 集合名稱 (通常為檔案名稱)
+
+        Returns:
+            bool: 集合是否存在
+        """
+        if collection_name in self.collection_cache:
+            return True
+        try:
+            self.client.get_collection(name=collection_name)
+            return True
+        except Exception:
+            return False
+
     def list_collections(self) -> List[str]:
         """
         列出所有集合名稱
@@ -462,7 +609,7 @@ class ChromaVectorStore:
         try:
             collections = self.client.list_collections()
             collection_names = [col.name for col in collections]
-            logger.info(f"目前存在的集合: {collection_names}")
+            logger.debug(f"目前存在 {len(collection_names)} 個集合")
             return collection_names
         except Exception as e:
             logger.error(f"列出集合時出錯: {e}")
@@ -4,7 +4,7 @@
 import os
 import json
 import hashlib
-from typing import Literal, List, Optional
+from typing import Literal, List, Optional, Dict
 from dataclasses import dataclass
 
 import logging
@@ -124,25 +124,61 @@ class DocumentProcessor:
         with open(json_file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
+        document_name = '_'.join(json_file_name.split("_")[:-1])
         chunks = []
         for index, item in enumerate(data):
-            # 過濾掉沒有翻譯核心數據的項目 (圖片、公式、空字串等)
-            if item.get("translation_metadata") == None:
-                continue
-
-            chunk = DocumentChunk(
-                content=item.get("text_zh"),
-                document_name='_'.join(json_file_name.split("_")[:-1]),
-                page_num=item.get("page_idx"),
-                chunk_index=index,
-                content_type=item.get("translation_metadata").get("content_type")
-            )
-            chunks.append(chunk)
+            chunk = self._item_to_chunk(item, index, document_name)
+            if chunk is not None:
+                chunks.append(chunk)
         
         if self.verbose:
             logger.info(f"已讀取並生成初始片段: {len(chunks)} 個 (來自 {json_file_path})")
         return chunks
 
+    def item_to_chunks(self, item: Dict, item_index: int, document_name: str, index_start: int) -> List[DocumentChunk]:
+        """
+        將單一翻譯後的段落轉換為內容片段 (用於串流處理)
+
+        依文件順序逐段呼叫並累加 index_start，生成的片段與 json_to_chunks 完全相同
+
+        Args:
+            item: 翻譯後的段落
+            item_index: 段落在文件中的編號
+            document_name: 來源文件名稱
+            index_start: 此段落第一個片段的編號 (即先前已生成的片段數量)
+
+        Returns:
+            List[DocumentChunk]: 處理後的內容片段列表 (未翻譯的段落返回空列表)
+        """
+        chunk = self._item_to_chunk(item, item_index, document_name)
+        if chunk is None:
+            return []
+        return self._process_chunk(chunk, index_start)
+
+    def _item_to_chunk(self, item: Dict, item_index: int, document_name: str) -> Optional[DocumentChunk]:
+        """
+        將段落轉換為初始內容片段
+
+        Args:
+            item: 翻譯後的段落
+            item_index: 段落在文件中的編號
+            document_name: 來源文件名稱
+
+        Returns:
+            DocumentChunk: 初始內容片段 (沒有翻譯核心數據的項目返回 None)
+        """
+        # 過濾掉沒有翻譯核心數據的項目 (圖片、公式、空字串等)
+        if item.get("translation_metadata") == None:
+            return None
+
+        return DocumentChunk(
+            content=item.get("text_zh"),
+            document_name=document_name,
+            page_num=item.get("page_idx"),
+            chunk_index=item_index,
+            content_type=item.get("translation_metadata").get("content_type")
+        )
+
     def _process_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
         """
         處理內容片段，根據內容類型進行不同的分段策略
@@ -156,24 +192,35 @@ class DocumentProcessor:
         processed_chunks = []
         
         for chunk in chunks:
-            if chunk.content_type == 'title':
-                processed = self._process_title(chunk, len(processed_chunks))
-            elif chunk.content_type == 'abstract':
-                processed = self._process_abstract(chunk, len(processed_chunks))
-            elif chunk.content_type == 'body':
-                processed = self._process_body(chunk, len(processed_chunks))
-            elif chunk.content_type == 'reference':
-                processed = self._process_reference(chunk, len(processed_chunks))
-            else:
-                # 未知類型，保持原樣
-                raise ValueError(f"未知的content_type: {chunk}")
-            
-            processed_chunks.extend(processed)
+            processed_chunks.extend(self._process_chunk(chunk, len(processed_chunks)))
         
         if self.verbose:
             logger.info(f"處理後的片段總數: {len(processed_chunks)} 個")
         return processed_chunks
 
+    def _process_chunk(self, chunk: DocumentChunk, index_start: int) -> List[DocumentChunk]:
+        """
+        依內容類型處理單一內容片段
+
+        Args:
+            chunk: 原始內容片段
+            index_start: 起始編號
+
+        Returns:
+            List[DocumentChunk]: 處理後的內容片段列表
+        """
+        if chunk.content_type == 'title':
+            return self._process_title(chunk, index_start)
+        elif chunk.content_type == 'abstract':
+            return self._process_abstract(chunk, index_start)
+        elif chunk.content_type == 'body':
+            return self._process_body(chunk, index_start)
+        elif chunk.content_type == 'reference':
+            return self._process_reference(chunk, index_start)
+        else:
+            # 未知類型，保持原樣
+            raise ValueError(f"未知的content_type: {chunk}")
+
     def _process_title(self, base_chunk: DocumentChunk, index_start: int) -> List[DocumentChunk]:
         """
         標題處理：永遠不分段，保持完整
@@ -0,0 +1,176 @@
+"""
+Embedding快取 - 以SQLite持久化保存向量，重新加入文件或重複查詢時不再請求LLM服務
+"""
+import os
+import time
+import sqlite3
+import hashlib
+from array import array
+from threading import Lock
+from typing import List, Optional, Dict, Any
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """
+    ### Embedding快取
+
+    以 (模型, 用途 store/query, 文字雜湊值) 為鍵保存向量，向量以float32二進位格式儲存。
+    超過數量上限時依最近使用時間淘汰舊的向量。
+    """
+    def __init__(self,
+            instance_path: str,
+            db_name: str = "embedding_cache.db",
+            max_entries: int = 200000,
+            verbose: bool = False
+        ):
+        """
+        初始化Embedding快取
+
+        Args:
+            instance_path: 資料庫存放路徑
+            db_name: 資料庫檔案名稱
+            max_entries: 保存的向量數量上限 (超過時淘汰最久未使用的向量)
+            verbose: 是否啟用詳細日誌
+        """
+        os.makedirs(instance_path, exist_ok=True)
+        self.db_path = os.path.join(instance_path, db_name)
+
+        self.max_entries = max(max_entries, 1)
+        self.verbose = verbose
+
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if self.verbose:
+            logger.info(f"Embedding快取初始化完成: {self.db_path} (已保存 {self._entries} 筆向量)")
+
+    @staticmethod
+    def _make_key(model: str, store: bool, text: str) -> str:
+        """產生向量的快取鍵"""
+        task = "store" if store else "query"
+        return f"{model}|{task}|{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def get_many(self, model: str, store: bool, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        批量查詢向量
+
+        Args:
+            model: embedding模型名稱
+            store: 是否為存儲用途 (存儲與查詢的向量分開保存)
+            texts: 字串列表
+
+        Returns:
+            List[Optional[List[float]]]: 與輸入順序相同的向量列表 (未命中為 None)
+        """
+        keys = [self._make_key(model, store, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            try:
+                for start in range(0, len(keys), 500):  # SQLite參數數量有上限，分段查詢
+                    part = list(set(keys[start:start + 500]))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})",
+                        part
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = array('f', blob).tolist()
+
+                if found:
+                    now = time.time()
+                    self._conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"查詢Embedding快取時出錯: {e}")
+                found = {}
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for vector in results if vector is not None)
+            self._hits += hits
+            self._misses += len(results) - hits
+        return results
+
+    def put_many(self, model: str, store: bool, texts: List[str], vectors: List[List[float]]):
+        """
+        批量保存向量 (超過數量上限時淘汰最久未使用的向量)
+
+        Args:
+            model: embedding模型名稱
+            store: 是否為存儲用途
+            texts: 字串列表
+            vectors: 與字串列表對應的向量列表
+        """
+        now = time.time()
+        rows = [
+            (self._make_key(model, store, text), array('f', vector).tobytes(), now)
+            for text, vector in zip(texts, vectors) if vector
+        ]
+        with self._lock:
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany("INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows)
+                self._entries += self._conn.total_changes - before
+                if self._entries > self.max_entries:
+                    self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"保存Embedding快取時出錯: {e}")
+
+    def _evict(self):
+        """淘汰最久未使用的向量，保留數量上限的90% (需在鎖內呼叫)"""
+        target = int(self.max_entries * 0.9)
+        cursor = self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (self._entries - target,)
+        )
+        self._entries -= cursor.rowcount
+        self._evictions += cursor.rowcount
+        if self.verbose:
+            logger.info(f"Embedding快取已淘汰 {cursor.rowcount} 筆最久未使用的向量")
+
+    def clear(self):
+        """清空Embedding快取"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._entries = 0
+        logger.info("Embedding快取已清空")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        獲取Embedding快取統計資料
+
+        Returns:
+            Dict: 向量數量、命中/未命中次數、命中率及淘汰數量
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": self._entries,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+                "evictions": self._evictions,
+                "db_path": self.db_path
+            }
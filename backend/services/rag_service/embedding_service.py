@@ -2,10 +2,13 @@
 Embedding服務 - 基於Ollama的向量化服務
 """
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional, Union
 
 from backend.services.llm_service import BaseLLMService
 
+from .embedding_cache import EmbeddingCache
+
 from backend.api import ProgressManager
 
 import logging
@@ -22,6 +25,7 @@ class EmbeddingService:
         llm_service_obj: BaseLLMService,
         max_retries: int = 3,
         retry_delay: int = 1,
+        embedding_cache: Optional[EmbeddingCache] = None,
         verbose: bool = False
     ):
         """
@@ -33,16 +37,20 @@ class EmbeddingService:
             api_key: API金鑰 (僅Gemini需要)
             max_retries: 最大重試次數
             retry_delay: 重試延遲時間（秒）
+            embedding_cache: Embedding快取 (None 表示不使用)
             verbose: 是否啟用詳細日誌
         """
         self.llm_service = llm_service_obj
+        self.embedding_cache = embedding_cache
 
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.verbose = verbose
 
     def is_available(self, model_name: str = None) -> bool:
-        """檢查Embedding服務是否可用"""
+        """檢查Embedding服務是否可用 (未指定模型時使用快取的可用狀態)"""
+        if model_name is None:
+            return self.llm_service.check_available()
         return self.llm_service.is_available(model_name=model_name)
 
     def _get_embedding_with_retry(self, text: Union[str, List[str]], store: bool) -> Optional[List[List[float]]]:
@@ -57,7 +65,9 @@ class EmbeddingService:
             List[float]: 向量化結果 (出現錯誤則返回 None)
         """
         for attempt in range(self.max_retries):
-            embedding = self.llm_service.send_embedding_request(text, store=store)
+            with self.llm_service.concurrency.slot() as slot:
+                embedding = self.llm_service.send_embedding_request(text, store=store)
+                slot.success = embedding is not None
             if embedding is not None:
                 if self.verbose:
                     logger.info("成功獲取embedding")
@@ -81,14 +91,36 @@ class EmbeddingService:
         Returns:
             List[float]: 向量化結果 (出現錯誤則返回 None)
         """
-        embedding = self._get_embedding_with_retry(text, store=store)[0]
+        cache_model = self._cache_model()
+        if cache_model is not None:
+            cached = self.embedding_cache.get_many(cache_model, store, [text])[0]
+            if cached is not None:
+                return cached
+
+        embeddings = self._get_embedding_with_retry(text, store=store)
+        embedding = embeddings[0] if embeddings else None
         if embedding is None:
             logger.error(f"無法為文本獲取embedding: {text[:30]}...")
-        if self.verbose and embedding is not None:
-            logger.info("獲取單個embedding完成")
+        else:
+            if cache_model is not None:
+                self.embedding_cache.put_many(cache_model, store, [text], [embedding])
+            if self.verbose:
+                logger.info("獲取單個embedding完成")
         return embedding
 
-    def get_embeddings(self, texts: List[str], store: bool = False, batch_size: int = 100) -> List[List[float]]:
+    def model_key(self) -> Optional[str]:
+        """目前使用的Embedding模型鍵 ("provider/model"，未設定服務時返回 None)"""
+        if self.llm_service is None:
+            return None
+        return f"{getattr(self.llm_service, 'provider', 'base')}/{self.llm_service.model_name}"
+
+    def _cache_model(self) -> Optional[str]:
+        """Embedding快取使用的模型鍵 (未啟用快取時返回 None)"""
+        if self.embedding_cache is None:
+            return None
+        return self.model_key()
+
+    def get_embeddings(self, texts: List[str], store: bool = False, batch_size: int = 100, report_progress: bool = True) -> List[List[float]]:
         """
         批量處理字串的embeddings
 
@@ -96,38 +128,68 @@ class EmbeddingService:
             texts: 字串列表
             store: 是否為存儲用途 True: 存儲, False: 搜索 (僅Gemini適用)
             batch_size: 每批次處理的字串數量
+            report_progress: 是否更新處理進度 (串流寫入時由背景執行緒呼叫，不更新進度)
 
         Returns:
             List[Optional[List[float]]]: 向量化結果列表
         """
-        buffer_time = 1 if hasattr(self.llm_service, 'api_key') else 0
-
-        new_texts: List[List[str]] = []
+        # 先從快取取得向量，僅請求未命中的字串
+        cache_model = self._cache_model()
+        if cache_model is not None:
+            vectors: List[Optional[List[float]]] = self.embedding_cache.get_many(cache_model, store, texts)
+        else:
+            vectors = [None] * len(texts)
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if cache_model is not None and self.verbose:
+            logger.info(f"Embedding快取命中 {len(texts) - len(missing)}/{len(texts)} 個字串")
+
+        new_texts: List[List[int]] = []
         counter = 0
         while True:
-            text = texts[counter:counter + batch_size]
-            if not text:
+            indices = missing[counter:counter + batch_size]
+            if not indices:
                 break
-            new_texts.append(text)
+            new_texts.append(indices)
             counter += batch_size
         print(f"總共有 {len(new_texts)} 批次需要處理")
 
         last_progress = 73
-        per_progress = 23 / len(new_texts)
-
+        per_progress = 23 / max(len(new_texts), 1)
+
+        # 啟用自適應併發控制時各批次並行請求，同時送出的數量由控制器調整
+        concurrency = self.llm_service.concurrency
+        workers = min(concurrency.max_limit, len(new_texts)) if concurrency.enabled else 1
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="embedding") as executor:
+            futures = {
+                executor.submit(self._get_embedding_with_retry, [texts[text_index] for text_index in indices], store): indices
+                for indices in new_texts
+            }
+            for index, future in enumerate(as_completed(futures)):
+                if report_progress:
+                    ProgressManager.progress_update(last_progress + per_progress * index , f"處理中: 正在處理第 {index + 1} 條，共 {len(new_texts)} 條", "adding-to-rag")
+                indices = futures[future]
+                text = [texts[text_index] for text_index in indices]
+                embedding = future.result()
+
+                # 紀錄embedding獲取失敗的字串
+                if embedding is None or len(embedding) != len(text):
+                    logger.error(f"無法為字串處理embedding: {text[:30]}...")
+                    continue
+
+                for text_index, vector in zip(indices, embedding):
+                    vectors[text_index] = vector
+                if cache_model is not None:
+                    self.embedding_cache.put_many(cache_model, store, text, embedding)
+
+        # 依原始批次組合結果，並過濾掉包含失敗字串的批次
         embeddings = []
         error_counter = 0
-        for index, text in enumerate(new_texts):
-            ProgressManager.progress_update(last_progress + per_progress * index , f"處理中: 正在處理第 {index + 1} 條，共 {len(new_texts)} 條", "adding-to-rag")
-            embedding = self._get_embedding_with_retry(text, store=store)
-
-            # 紀錄embedding獲取失敗的字串，並過濾掉失敗的結果
-            if embedding is None:
-                logger.error(f"無法為字串處理embedding: {text[:30]}...")
+        for start in range(0, len(texts), batch_size):
+            batch_vectors = vectors[start:start + batch_size]
+            if any(vector is None for vector in batch_vectors):
                 error_counter += 1
             else:
-                embeddings.append(embedding)
-            time.sleep(buffer_time)
+                embeddings.append(batch_vectors)
         
         if error_counter > 0:
             logger.warning(f"總共有 {error_counter} 批次的字串未能成功處理")
@@ -0,0 +1,180 @@
+"""
+串流寫入 - 將翻譯完成的段落逐批向量化並寫入向量資料庫，使向量化與翻譯重疊進行
+"""
+import time
+from queue import Queue, Empty
+from threading import Thread
+from typing import Dict, List, Optional, Iterable
+
+from .document_processor import DocumentProcessor, DocumentChunk
+from .embedding_service import EmbeddingService
+from .chroma_database import ChromaVectorStore
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+_CLOSE = object()  # 結束串流的標記
+
+class IngestStream:
+    """
+    ### 串流寫入向量資料庫
+
+    翻譯完成的段落依文件順序透過 `feed` 送入，立即切分為內容片段；
+    背景執行緒累積成批 (達到批次大小或閒置超過一定時間) 後向量化並寫入ChromaDB。
+    片段編號與一次性處理 (`DocumentProcessor.json_to_chunks`) 完全相同。
+    """
+    def __init__(self,
+            document_processor_obj: DocumentProcessor,
+            embedding_service_obj: EmbeddingService,
+            chromadb_obj: ChromaVectorStore,
+            collection_name: str,
+            existing_chunk_ids: Optional[Iterable[str]] = None,
+            batch_size: int = 32,
+            flush_interval: float = 2.0,
+            verbose: bool = False
+        ):
+        """
+        初始化並啟動串流寫入
+
+        Args:
+            document_processor_obj: 文件處理器物件
+            embedding_service_obj: Embedding服務物件
+            chromadb_obj: ChromaDB向量資料庫物件
+            collection_name: 寫入的集合名稱 (同時作為片段的來源文件名稱)
+            existing_chunk_ids: 集合中現有的片段ID (相同ID的片段不重新寫入，關閉時刪除未再出現的片段)
+            batch_size: 每批次向量化的片段數量
+            flush_interval: 未滿一批時，閒置超過此秒數即寫入 (縮短首批片段可查詢的時間)
+            verbose: 是否輸出詳細日誌
+        """
+        self.document_processor = document_processor_obj
+        self.embedding_service = embedding_service_obj
+        self.vector_store = chromadb_obj
+        self.collection_name = collection_name
+
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.verbose = verbose
+
+        self.chunk_count = 0        # 已寫入資料庫的片段數量
+        self.failed = False         # 是否有批次寫入失敗
+
+        self._existing_ids = set(existing_chunk_ids or [])
+        self._seen_ids = set()      # 本次串流產生的所有片段ID
+
+        self._next_chunk_index = 0  # 下一個片段的編號
+        self._closed = False
+        self._aborted = False
+        self._started_at = time.time()
+
+        self._queue: Queue = Queue()
+        self._thread = Thread(target=self._worker, name=f"ingest-{collection_name}", daemon=True)
+        self._thread.start()
+
+    def feed(self, item_index: int, item: Dict):
+        """
+        送入一個已確定的段落 (需依文件順序呼叫，未翻譯的段落會被略過)
+
+        Args:
+            item_index: 段落在文件中的編號
+            item: 翻譯後的段落
+        """
+        if self._closed:
+            raise RuntimeError("串流已關閉，無法再送入段落")
+
+        chunks = self.document_processor.item_to_chunks(item, item_index, self.collection_name, self._next_chunk_index)
+        self._next_chunk_index += len(chunks)
+        for chunk in chunks:
+            self._seen_ids.add(chunk.chunk_id)
+            if chunk.chunk_id not in self._existing_ids:
+                self._queue.put(chunk)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        關閉串流並等待剩餘片段寫入完成
+
+        Args:
+            timeout: 等待秒數上限 (None 表示無限等待)
+
+        Returns:
+            bool: 是否所有片段皆成功寫入
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+        self._thread.join(timeout)
+
+        if self._thread.is_alive():
+            logger.error(f"[IngestStream] 等待集合 {self.collection_name} 寫入完成逾時")
+            return False
+        if self.failed:
+            return False
+
+        # 刪除已不存在的片段
+        vanished_ids = self._existing_ids - self._seen_ids
+        if not self.vector_store.delete_chunks(self.collection_name, list(vanished_ids)):
+            return False
+        if self.verbose:
+            logger.info(f"[IngestStream] 串流寫入結束: {self.collection_name}, 新增 {self.chunk_count} 個片段，刪除 {len(vanished_ids)} 個片段")
+        return True
+
+    def abort(self):
+        """中止串流 (捨棄尚未寫入的片段)"""
+        self._aborted = True
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+
+    def _worker(self):
+        """背景執行緒：累積片段成批後向量化並寫入"""
+        batch: List[DocumentChunk] = []
+        closing = False
+        while not closing:
+            try:
+                chunk = self._queue.get(timeout=self.flush_interval if batch else None)
+            except Empty:
+                chunk = None  # 閒置逾時，寫入未滿的批次
+
+            if chunk is _CLOSE:
+                closing = True
+            elif chunk is not None:
+                batch.append(chunk)
+
+            if batch and (closing or chunk is None or len(batch) >= self.batch_size):
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch: List[DocumentChunk]):
+        """向量化並寫入一批片段"""
+        if self._aborted or self.failed:
+            return
+
+        try:
+            embeddings = self.embedding_service.get_embeddings(
+                [chunk.content for chunk in batch],
+                store=True,
+                batch_size=len(batch),
+                report_progress=False
+            )
+            vectors = [vector for batch_vectors in embeddings for vector in batch_vectors]
+            if len(vectors) != len(batch):
+                logger.error(f"[IngestStream] 片段數量: {len(batch)} 與向量數量: {len(vectors)} 不一致")
+                self.failed = True
+                return
+
+            if not self.vector_store.add_chunks(batch, vectors, collection_name=self.collection_name, embedding_model=self.embedding_service.model_key()):
+                logger.error(f"[IngestStream] 寫入集合 {self.collection_name} 失敗")
+                self.failed = True
+                return
+        except Exception as e:
+            logger.error(f"[IngestStream] 串流寫入時出錯: {e}")
+            self.failed = True
+            return
+
+        if self.chunk_count == 0:
+            logger.info(f"[IngestStream] 首批片段已可查詢: {self.collection_name} ({time.time() - self._started_at:.2f} 秒)")
+        self.chunk_count += len(batch)
+        if self.verbose:
+            logger.info(f"[IngestStream] 已寫入 {self.chunk_count} 個片段")
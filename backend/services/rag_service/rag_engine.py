@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from .document_processor import DocumentProcessor
 from .embedding_service import EmbeddingService
 from .chroma_database import ChromaVectorStore
+from .ingest_stream import IngestStream
 
 from backend.services.llm_service import BaseLLMService
 
@@ -64,6 +65,8 @@ class RAGEngine:
         embedding_service_obj: EmbeddingService,
         chromadb_obj: ChromaVectorStore,
         llm_service_obj: BaseLLMService,
+        stream_batch_size: int = 32,
+        stream_flush_interval: float = 2.0,
         verbose: bool = False,
     ):
         """
@@ -77,6 +80,8 @@ class RAGEngine:
             model_name: LLM服務模型名稱 (如未提供則使用預設模型)
                 - Ollama 預設為 "yi-chat" (為自訂模型，須依使用者修改使用模型名稱)
                 - Gemini 預設為 "gemini-2.5-flash-lite"
+            stream_batch_size: 串流寫入時每批次向量化的片段數量
+            stream_flush_interval: 串流寫入時未滿一批的最長等待秒數
             verbose: 是否輸出詳細日誌
         """
         self.verbose = verbose
@@ -89,9 +94,70 @@ class RAGEngine:
         self.vector_store = chromadb_obj
         self.llm_service = llm_service_obj
 
+        self.stream_batch_size = stream_batch_size
+        self.stream_flush_interval = stream_flush_interval
+
         if self.verbose:
             logger.info("RAG引擎初始化完成")
 
+    def open_ingest_stream(self, collection_name: str) -> Optional[IngestStream]:
+        """
+        開啟串流寫入，翻譯完成的段落可邊翻譯邊向量化並寫入向量資料庫
+
+        Args:
+            collection_name: 集合名稱 (即翻譯檔案名稱去除 `_translated.json`)
+
+        Returns:
+            IngestStream: 串流寫入物件 (Embedding服務不可用時返回 None)
+        """
+        if not self.embedding_service.is_available():
+            logger.error("Embedding服務不可用，無法開啟串流寫入")
+            return None
+
+        # 集合由其他Embedding模型建立時先刪除，現有片段才能沿用
+        if not self._reset_collection_on_model_change(collection_name):
+            logger.error("刪除Embedding模型不符的集合失敗，無法開啟串流寫入")
+            return None
+
+        # 現有片段不重新寫入，串流結束後刪除已不存在的片段
+        existing_ids = self.vector_store.get_chunk_ids(collection_name)
+        if existing_ids is None:
+            logger.error("無法獲取現有片段ID，無法開啟串流寫入")
+            return None
+
+        if self.verbose:
+            logger.info(f"開啟串流寫入: {collection_name} (現有 {len(existing_ids)} 個片段)")
+        return IngestStream(
+            document_processor_obj=self.document_processor,
+            embedding_service_obj=self.embedding_service,
+            chromadb_obj=self.vector_store,
+            collection_name=collection_name,
+            existing_chunk_ids=existing_ids,
+            batch_size=self.stream_batch_size,
+            flush_interval=self.stream_flush_interval,
+            verbose=self.verbose
+        )
+
+    def _reset_collection_on_model_change(self, collection_name: str) -> bool:
+        """
+        集合的向量由其他Embedding模型產生 (或未記錄模型) 時刪除集合，避免混用不同模型的向量
+
+        Args:
+            collection_name: 集合名稱
+
+        Returns:
+            bool: 集合可沿用或已刪除 (刪除失敗時返回 False)
+        """
+        if not self.vector_store.has_collection(collection_name):
+            return True
+        current_model = self.embedding_service.model_key()
+        collection_model = self.vector_store.get_embedding_model(collection_name)
+        if collection_model == current_model:
+            return True
+
+        logger.warning(f"集合 {collection_name} 的Embedding模型 ({collection_model or '未記錄'}) 與目前模型 ({current_model}) 不同，重新建立集合")
+        return self.vector_store.delete_collection(collection_name)
+
     def store_document_into_vectordb(self, json_file_name: str) -> Tuple[bool, str]:
         """
         儲存單個文件到向量資料庫
@@ -112,27 +178,51 @@ class RAGEngine:
             chunks = self.document_processor.json_to_chunks(json_file_name)
             if not chunks:
                 logger.error("未讀取到翻譯JSON文件或文件內容為空")
-                return False
+                return False, None
             ProgressManager.progress_update(73, "文件片段生成完成，開始向量化並儲存到資料庫", "adding-to-rag")
 
-            # 檢查embedding服務可用性
-            if not self.embedding_service.is_available():
-                logger.error("Embedding服務不可用")
-                return False
+            # 與現有集合比對 (片段ID包含內容雜湊，內容未變的片段ID相同)；Embedding模型變更時完整重建
+            collection_name = '_'.join(json_file_name.split("_")[:-1])
+            if not self._reset_collection_on_model_change(collection_name):
+                logger.error("刪除Embedding模型不符的集合失敗")
+                return False, None
+            existing_ids = self.vector_store.get_chunk_ids(collection_name)
+            if existing_ids is None:
+                logger.error("無法獲取現有片段ID")
+                return False, None
+            existing_ids = set(existing_ids)
+            new_ids = {chunk.chunk_id for chunk in chunks}
 
-            # 生成embedding向量
-            texts = [chunk.content for chunk in chunks]
-            embeddings = self.embedding_service.get_embeddings(texts, store=True)
+            vanished_ids = existing_ids - new_ids
+            new_chunks = [chunk for chunk in chunks if chunk.chunk_id not in existing_ids]
+            if self.verbose:
+                logger.info(f"增量更新: 保留 {len(chunks) - len(new_chunks)} 個片段，新增 {len(new_chunks)} 個，刪除 {len(vanished_ids)} 個")
+
+            if new_chunks:
+                # 檢查embedding服務可用性
+                if not self.embedding_service.is_available():
+                    logger.error("Embedding服務不可用")
+                    return False, None
+
+                # 僅為新的片段生成embedding向量
+                texts = [chunk.content for chunk in new_chunks]
+                embeddings = self.embedding_service.get_embeddings(texts, store=True)
+                vectors = [vector for batch_vectors in embeddings for vector in batch_vectors]
+                if len(vectors) != len(new_chunks):
+                    logger.error(f"片段數量: {len(new_chunks)} 與向量數量: {len(vectors)} 不一致")
+                    return False, None
             ProgressManager.progress_update(96, "向量化完成，正在儲存到向量資料庫", "adding-to-rag")
 
-            # 如果文件已存在，先刪除
-            collection_name = '_'.join(json_file_name.split("_")[:-1])
-            if self.vector_store.get_collection_info(collection_name)['document_count'] > 0:
-                self.vector_store.delete_collection(collection_name)
+            # 刪除已不存在的片段
+            if not self.vector_store.delete_chunks(collection_name, list(vanished_ids)):
+                logger.error("刪除舊片段失敗")
+                return False, None
 
             # 新增到向量資料庫
-            logger.debug(f"片段數量: {len(chunks)}, 向量數量: {len(embeddings[0])}")
-            success = self.vector_store.add_chunks(chunks, embeddings[0], collection_name=collection_name)
+            success = True
+            if new_chunks:
+                logger.debug(f"片段數量: {len(new_chunks)}, 向量數量: {len(vectors)}")
+                success = self.vector_store.add_chunks(new_chunks, vectors, collection_name=collection_name, embedding_model=self.embedding_service.model_key())
             ProgressManager.progress_update(99, "文件成功儲存到向量資料庫", "idle")
 
             if success:
@@ -343,6 +433,7 @@ class RAGEngine:
                 - vector_store_info: 向量資料庫資訊
                 - embedding_model: 使用的embedding模型
                 - llm_service: 使用的LLM服務
+                - embedding_cache: Embedding快取統計資料
                 - document_processor: 文件處理器設定
                 - min_chunk_size: 內容片段最小長度
         """
@@ -350,6 +441,7 @@ class RAGEngine:
             "vector_store_info": self.vector_store.list_collections() or "未指定集合",
             "embedding_model": self.embedding_service.llm_service.model_name if self.embedding_service.llm_service else "未設定",
             "llm_service": self.llm_service.model_name if self.llm_service else "未設定",
+            "embedding_cache": self.embedding_service.embedding_cache.stats() if self.embedding_service.embedding_cache else "未啟用",
             "document_processor": {
                 "min_chunk_size": self.document_processor.min_chunk_size,
                 "max_chunk_size": self.document_processor.max_chunk_size,
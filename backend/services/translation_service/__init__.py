@@ -2,7 +2,21 @@
 翻譯器服務模塊 - 提供多種翻譯器的接口
 """
 from .translator import Translator
+from .translation_memory import TranslationMemory
+from .content_filter import ContentFilter
+from .progress_journal import ProgressJournal
+from .reference_parser import ReferenceParser, ParsedReference
+from .glossary import GlossaryExtractor, DocumentGlossary
+from .page_scheduler import PageScheduler
 
 __all__ = [
-    "Translator"
+    "Translator",
+    "TranslationMemory",
+    "ContentFilter",
+    "ProgressJournal",
+    "ReferenceParser",
+    "ParsedReference",
+    "GlossaryExtractor",
+    "DocumentGlossary",
+    "PageScheduler"
 ]
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+翻譯前內容過濾 - 辨識不需翻譯的段落 (純公式、數字殘留、網址、DOI、頁碼、已是目標語言的文字)，直接沿用原文而不請求LLM服務
+"""
+import re
+import unicodedata
+from typing import Optional, Dict
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+# 僅由網址、DOI、電子郵件組成的段落
+_IDENTIFIER_PATTERN = re.compile(
+    r"^(?:\s*(?:"
+    r"(?:https?://|www\.)\S+"
+    r"|(?:doi:\s*|https?://(?:dx\.)?doi\.org/)?10\.\d{4,9}/\S+"
+    r"|[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+    r"|arxiv:\s*\d{4}\.\d{4,5}(?:v\d+)?"
+    r")[\s,;.]*)+$",
+    re.IGNORECASE
+)
+
+# 頁碼: "12"、"- 12 -"、"Page 3 of 10"、"3/10"
+_PAGE_NUMBER_PATTERN = re.compile(r"^[\s\-–—]*(?:page\s*)?\d{1,4}(?:\s*(?:/|of)\s*\d{1,4})?[\s\-–—]*$", re.IGNORECASE)
+
+# 行內/獨立公式 ($...$、$$...$$、\(...\)、\[...\]) 及 LaTeX 指令
+_MATH_PATTERN = re.compile(r"\$\$.*?\$\$|\$[^$]*\$|\\\(.*?\\\)|\\\[.*?\\\]", re.DOTALL)
+_LATEX_COMMAND_PATTERN = re.compile(r"\\[a-zA-Z]+\*?(?:\{[^{}]*\})?")
+
+# 兩個字母以上的單詞
+_WORD_PATTERN = re.compile(r"[^\W\d_]{2,}")
+
+def _simplified_only_chars() -> frozenset:
+    """簡體專用字: GB2312 收錄而 Big5 未收錄的漢字，加上 Big5 雖收錄但在繁體文字中罕用的常見簡體字"""
+    def encodable(char: str, encoding: str) -> bool:
+        try:
+            char.encode(encoding)
+            return True
+        except UnicodeEncodeError:
+            return False
+    chars = {chr(code) for code in range(0x4e00, 0xa000) if encodable(chr(code), "gb2312") and not encodable(chr(code), "big5")}
+    return frozenset(chars | set("种于后么几范复征"))
+
+_SIMPLIFIED_CHARS = _simplified_only_chars()
+
+class ContentFilter:
+    """
+    ### 翻譯前內容過濾器
+
+    依序檢查段落是否屬於以下不需翻譯的類型 (返回對應的原因)：
+    - identifier: 僅由網址、DOI、電子郵件或arXiv編號組成
+    - page_number: 頁碼
+    - math: 含公式或LaTeX指令，移除後可翻譯的單詞少於下限
+    - symbolic: 沒有可翻譯的單詞或字母比例過低 (符號或數字密集，例如表格殘留)
+    - target_language: 文字已是目標語言 (繁體中文，以漢字比例及無假名、諺文、簡體字判斷)
+    """
+    MIN_WORDS = 2                   # 移除公式後至少需要的單詞數量
+    MIN_LETTER_RATIO = 0.3          # 字母佔非空白字元的比例下限
+    MIN_TARGET_SCRIPT_RATIO = 0.8   # 判斷為目標語言的漢字佔字母比例下限
+
+    # 來源語言本身使用漢字且仍需轉換 (簡體→繁體) 時不檢查目標語言
+    SKIP_TARGET_CHECK_LANGS = {"ch"}
+
+    def __init__(self, verbose: bool = False):
+        """
+        初始化內容過濾器
+
+        Args:
+            verbose: 是否啟用詳細日誌
+        """
+        self.verbose = verbose
+
+    @staticmethod
+    def _is_han(char: str) -> bool:
+        """是否為漢字"""
+        return "\u4e00" <= char <= "\u9fff" or "\u3400" <= char <= "\u4dbf" or "\uf900" <= char <= "\ufaff"
+
+    @staticmethod
+    def _is_kana_or_hangul(char: str) -> bool:
+        """是否為日文假名或韓文諺文"""
+        return "\u3040" <= char <= "\u30ff" or "\uac00" <= char <= "\ud7af" or "\u1100" <= char <= "\u11ff"
+
+    def _is_target_language(self, text: str) -> bool:
+        """文字是否已是目標語言 (繁體中文，含簡體字時仍需翻譯轉換)"""
+        letters = [char for char in text if unicodedata.category(char).startswith("L")]
+        if not letters or any(self._is_kana_or_hangul(char) or char in _SIMPLIFIED_CHARS for char in letters):
+            return False
+        return sum(1 for char in letters if self._is_han(char)) / len(letters) >= self.MIN_TARGET_SCRIPT_RATIO
+
+    def classify(self, text: str, source_lang: str = "en") -> Optional[str]:
+        """
+        判斷段落是否不需翻譯
+
+        Args:
+            text: 段落原文
+            source_lang: 文件的來源語言
+
+        Returns:
+            str: 不需翻譯的原因 (identifier/page_number/math/symbolic/target_language)，需要翻譯時返回 None
+        """
+        stripped = text.strip()
+        if not stripped:
+            return None
+
+        if _IDENTIFIER_PATTERN.match(stripped):
+            return "identifier"
+        if _PAGE_NUMBER_PATTERN.match(stripped):
+            return "page_number"
+
+        # 移除公式及LaTeX指令後計算可翻譯的單詞 (含漢字時視為有可翻譯內容)
+        prose = _LATEX_COMMAND_PATTERN.sub(" ", _MATH_PATTERN.sub(" ", stripped))
+        has_math = prose != stripped
+        if not any(self._is_han(char) for char in prose):
+            words = len(_WORD_PATTERN.findall(prose))
+            if has_math and words < self.MIN_WORDS:
+                return "math"
+            if words == 0:
+                return "symbolic"
+
+        chars = [char for char in stripped if not char.isspace()]
+        letters = sum(1 for char in chars if unicodedata.category(char).startswith("L"))
+        if letters / len(chars) < self.MIN_LETTER_RATIO:
+            return "symbolic"
+
+        if source_lang not in self.SKIP_TARGET_CHECK_LANGS and self._is_target_language(prose):
+            return "target_language"
+        return None
+
+    def filter_content_list(self, content_list: list, candidates: list, source_lang: str = "en") -> Dict[int, str]:
+        """
+        找出內容列表中不需翻譯的段落
+
+        Args:
+            content_list: 內容列表
+            candidates: 待翻譯段落的索引
+            source_lang: 文件的來源語言
+
+        Returns:
+            Dict[int, str]: 不需翻譯的段落索引及原因
+        """
+        passthrough: Dict[int, str] = {}
+        for index in candidates:
+            reason = self.classify(content_list[index].get('text', ''), source_lang)
+            if reason is not None:
+                passthrough[index] = reason
+
+        if self.verbose and passthrough:
+            reasons: Dict[str, int] = {}
+            for reason in passthrough.values():
+                reasons[reason] = reasons.get(reason, 0) + 1
+            logger.info(f"翻譯前過濾: {len(passthrough)}/{len(candidates)} 個段落不需翻譯 {reasons}")
+        return passthrough
@@ -0,0 +1,266 @@
+"""
+文件術語表 - 翻譯前從標題、摘要、章節標題及高頻詞組擷取候選術語，翻譯一次後注入每個段落的獨立翻譯請求，
+使段落不需依賴多輪對話即可維持全文術語一致 (可並行翻譯)
+"""
+import os
+import re
+import json
+from typing import Optional, Dict, List, Iterable, Tuple
+
+from .progress_journal import atomic_write_json
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+# 單詞 (允許連字號及數字，例如 "Short-Term"、"GPT-4")
+_TOKEN_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]*(?:-[A-Za-z0-9]+)*")
+
+# 句子或子句分界 (詞組不跨越標點)
+_CLAUSE_PATTERN = re.compile(r"[.,;:!?()\[\]{}\"“”]|\s[-–—]\s")
+
+# 縮寫定義: "Long Short-Term Memory (LSTM)"
+_ACRONYM_PATTERN = re.compile(r"\(([A-Z][A-Za-z0-9]*[A-Z][A-Za-z0-9]*)s?\)")
+
+_STOPWORDS = frozenset("""
+a an the and or nor but of in on at to for from by with without within into onto over under about above below
+between through during before after than then as is are was were be been being has have had do does did can
+could should would may might must will shall this that these those it its we our us they their them he she his
+her you your i my me which who whom whose what when where why how all any each every both either neither some
+such no not only also very more most less least many much few other another same so too via per et al etc
+using used use based show shows shown propose proposed present presented paper work results result method
+methods approach approaches table figure fig section eq equation first second third one two three new however
+thus therefore here there while whereas since because although if whether e g i e
+""".split())
+
+class GlossaryExtractor:
+    """
+    ### 候選術語擷取器
+
+    - 縮寫定義 (例如 "Long Short-Term Memory (LSTM)") 的完整名稱一律列入
+    - 標題、摘要及章節標題中的2~4字詞組，全文出現至少2次時列入 (權重較高)
+    - 正文中出現至少 `min_frequency` 次的2~4字詞組
+
+    詞組的首尾不可為停用詞；較短詞組大多出現在較長詞組中時只保留較長者。
+    僅適用於以空白分詞的語言 (英文等)，其他語言只會擷取縮寫定義。
+    """
+    MIN_NGRAM = 2
+    MAX_NGRAM = 4
+    HEADING_WEIGHT = 3      # 出現在標題、摘要、章節標題中的詞組權重
+
+    def __init__(self, max_terms: int = 80, min_frequency: int = 3, verbose: bool = False):
+        """
+        初始化候選術語擷取器
+
+        Args:
+            max_terms: 擷取的術語數量上限
+            min_frequency: 正文詞組至少需要的出現次數
+            verbose: 是否啟用詳細日誌
+        """
+        self.max_terms = max(max_terms, 0)
+        self.min_frequency = max(min_frequency, 2)
+        self.verbose = verbose
+
+    @staticmethod
+    def _clauses(text: str) -> List[List[str]]:
+        """將文字切分為子句，返回各子句的單詞列表"""
+        return [_TOKEN_PATTERN.findall(clause) for clause in _CLAUSE_PATTERN.split(text)]
+
+    def _ngrams(self, words: List[str]) -> Iterable[Tuple[str, ...]]:
+        """子句中首尾不為停用詞的2~4字詞組"""
+        for size in range(self.MIN_NGRAM, self.MAX_NGRAM + 1):
+            for start in range(len(words) - size + 1):
+                gram = tuple(words[start:start + size])
+                if gram[0].lower() in _STOPWORDS or gram[-1].lower() in _STOPWORDS:
+                    continue
+                if any(len(word) < 2 for word in (gram[0], gram[-1])):
+                    continue
+                yield gram
+
+    @staticmethod
+    def _acronym_expansions(text: str) -> Iterable[str]:
+        """找出縮寫定義的完整名稱 (各單詞的首字母需與縮寫的大寫字母相符)"""
+        for match in _ACRONYM_PATTERN.finditer(text):
+            letters = [char.lower() for char in match.group(1) if char.isupper()]
+            preceding = _TOKEN_PATTERN.findall(_CLAUSE_PATTERN.split(text[:match.start()])[-1])
+            # 由縮寫前方往回取單詞，直到首字母 (含連字號分段) 數量與縮寫相同
+            initials: List[str] = []
+            for start in range(len(preceding) - 1, -1, -1):
+                initials = [part[0].lower() for part in preceding[start].split("-") if part] + initials
+                if len(initials) >= len(letters):
+                    if initials == letters:
+                        yield " ".join(preceding[start:])
+                    break
+
+    def extract(self, content_list: List[Dict], content_types: List[Optional[str]], candidates: List[int]) -> List[str]:
+        """
+        從待翻譯段落中擷取候選術語
+
+        Args:
+            content_list: 內容列表
+            content_types: 各段落的內容類型
+            candidates: 待翻譯段落的索引 (不含參考文獻)
+
+        Returns:
+            List[str]: 依重要性排序的候選術語
+        """
+        counts: Dict[str, int] = {}                 # 小寫詞組 → 全文出現次數
+        heading_counts: Dict[str, int] = {}         # 小寫詞組 → 標題、摘要、章節標題中的出現次數
+        surfaces: Dict[str, Dict[str, int]] = {}    # 小寫詞組 → 各原文寫法的出現次數
+        expansions: Dict[str, str] = {}
+
+        for index in candidates:
+            text = content_list[index].get('text', '')
+            is_heading = content_types[index] in ('title', 'abstract')
+            for expansion in self._acronym_expansions(text):
+                expansions.setdefault(expansion.lower(), expansion)
+            for words in self._clauses(text):
+                for gram in self._ngrams(words):
+                    surface = " ".join(gram)
+                    key = surface.lower()
+                    counts[key] = counts.get(key, 0) + 1
+                    if is_heading:
+                        heading_counts[key] = heading_counts.get(key, 0) + 1
+                    forms = surfaces.setdefault(key, {})
+                    forms[surface] = forms.get(surface, 0) + 1
+
+        scores: Dict[str, float] = {}
+        for key, count in counts.items():
+            from_heading = heading_counts.get(key, 0)
+            if (from_heading and count >= 2) or count >= self.min_frequency:
+                scores[key] = count + from_heading * (self.HEADING_WEIGHT - 1)
+
+        # 較短詞組大多出現在已選取的較長詞組中時略過 (例如 "neural network" 與 "graph neural network")
+        selected: List[str] = []
+        for key in sorted(scores, key=lambda key: (-len(key.split()), -scores[key])):
+            if any(f" {key} " in f" {longer} " and counts[longer] >= 0.8 * counts[key] for longer in selected):
+                continue
+            selected.append(key)
+        ranked = sorted(selected, key=lambda key: -scores[key])
+
+        terms = list(expansions.values())
+        seen = set(expansions)
+        for key in ranked:
+            if len(terms) >= self.max_terms:
+                break
+            if key not in seen:
+                forms = surfaces[key]
+                terms.append(max(forms, key=forms.get))
+                seen.add(key)
+        terms = terms[:self.max_terms]
+
+        if self.verbose:
+            logger.info(f"擷取候選術語 {len(terms)} 個 (縮寫定義 {len(expansions)} 個)")
+        return terms
+
+class DocumentGlossary:
+    """
+    ### 文件術語表
+
+    保存於進度檔案旁 (`{file_name}_glossary.json`)，中斷後恢復翻譯時沿用，翻譯完成後與進度檔案一併清除。
+    """
+    def __init__(self, progress_dir: str, file_name: str, terms: Optional[Dict[str, str]] = None):
+        """
+        初始化文件術語表
+
+        Args:
+            progress_dir: 進度檔案存放路徑
+            file_name: 文件名稱
+            terms: 術語及譯文
+        """
+        self.path = os.path.join(progress_dir, f"{file_name}_glossary.json")
+        self.set_terms(terms or {})
+
+    def set_terms(self, terms: Dict[str, str]):
+        """
+        設定術語及譯文
+
+        Args:
+            terms: 術語及譯文
+        """
+        self.terms: Dict[str, str] = dict(terms)
+        self._patterns = {term: re.compile(rf"(?<![\w-]){re.escape(term)}(?![\w-])", re.IGNORECASE) for term in self.terms}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def exists(self) -> bool:
+        """是否存在已保存的術語表"""
+        return os.path.exists(self.path)
+
+    def load(self) -> bool:
+        """
+        載入已保存的術語表
+
+        Returns:
+            bool: 是否載入成功
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                terms = json.load(f).get("terms", {})
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            logger.error(f"載入術語表時出錯: {e}")
+            return False
+        self.set_terms(terms)
+        return True
+
+    def save(self) -> str:
+        """
+        保存術語表
+
+        Returns:
+            str: 術語表路徑 (寫入失敗時返回空字串)
+        """
+        try:
+            atomic_write_json(self.path, {"terms": self.terms})
+        except OSError as e:
+            logger.error(f"保存術語表時出錯: {e}")
+            return ""
+        return self.path
+
+    def clear(self) -> bool:
+        """
+        清除已保存的術語表
+
+        Returns:
+            bool: 是否存在術語表檔案
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+            return True
+        return False
+
+    def matching(self, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        找出文字中出現的術語 (每次請求只附上相關術語，避免提示詞隨術語表增長)
+
+        Args:
+            texts: 段落文字
+
+        Returns:
+            Dict[str, str]: 出現的術語及譯文
+        """
+        texts = list(texts)
+        return {
+            term: translation
+            for term, translation in self.terms.items()
+            if translation and any(self._patterns[term].search(text) for text in texts)
+        }
+
+    def prompt_for(self, texts: Iterable[str]) -> str:
+        """
+        產生附加於翻譯請求的術語表提示 (文字中沒有術語時返回空字串)
+
+        Args:
+            texts: 段落文字
+
+        Returns:
+            str: 術語表提示
+        """
+        terms = self.matching(texts)
+        if not terms:
+            return ""
+        pairs = "; ".join(f"{term} → {translation}" for term, translation in terms.items())
+        return f"術語表 (請依此統一翻譯)：{pairs};\n"
@@ -0,0 +1,120 @@
+"""
+頁面優先排程 - 並行翻譯時依閱讀介面請求的頁面調整待翻譯段落的順序，並提供各頁面的翻譯狀態
+"""
+import threading
+from collections import deque
+from typing import Dict, List, Iterable, Any, Set
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+def summarize_pages(content_list: List[Dict], failed: Iterable[int] = ()) -> Dict[int, Dict[str, Any]]:
+    """
+    統計各頁面的翻譯狀態
+
+    Args:
+        content_list: 內容列表
+        failed: 翻譯失敗的段落索引
+
+    Returns:
+        Dict[int, Dict]: 頁碼 (page_idx) → 文字段落數量 (total)、已翻譯數量 (translated)、失敗數量 (failed)、
+            是否可顯示 (ready，所有段落皆已翻譯或確定失敗)
+    """
+    failed = set(failed)
+    pages: Dict[int, Dict[str, Any]] = {}
+    for index, item in enumerate(content_list):
+        page = pages.setdefault(item.get('page_idx', 0), {"total": 0, "translated": 0, "failed": 0})
+        if item.get('type') != 'text' or not item.get('text'):
+            continue
+        page["total"] += 1
+        if item.get('translation_metadata') is not None:
+            page["translated"] += 1
+        elif index in failed:
+            page["failed"] += 1
+    for page in pages.values():
+        page["ready"] = page["translated"] + page["failed"] >= page["total"]
+    return dict(sorted(pages.items()))
+
+class PageScheduler:
+    """
+    ### 頁面優先排程器
+
+    待翻譯的工作單位 (單一段落或合併批次) 預設依文件順序取出；閱讀介面請求頁面後，
+    包含該頁段落的工作單位移至佇列最前方 (最近請求的頁面最優先)。
+    """
+    def __init__(self, content_list: List[Dict], units: List[List[int]]):
+        """
+        初始化頁面優先排程器
+
+        Args:
+            content_list: 內容列表
+            units: 依文件順序排列的工作單位 (段落索引列表)
+        """
+        self.content_list = content_list
+        self.units = units
+        self._pages: Dict[int, List[int]] = {}      # 頁碼 → 包含該頁段落的工作單位編號 (依文件順序)
+        for unit_id, indices in enumerate(units):
+            for page in sorted({content_list[index].get('page_idx', 0) for index in indices}):
+                self._pages.setdefault(page, []).append(unit_id)
+
+        self._order = deque(range(len(units)))      # 依文件順序的工作單位
+        self._priority: deque = deque()             # 請求頁面的工作單位
+        self._taken: Set[int] = set()
+        self._failed: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """尚未取出的工作單位數量"""
+        with self._lock:
+            return len(self.units) - len(self._taken)
+
+    def request_pages(self, pages: Iterable[int]) -> int:
+        """
+        將包含指定頁面段落的工作單位移至佇列最前方
+
+        Args:
+            pages: 頁碼 (page_idx，依優先順序排列)
+
+        Returns:
+            int: 移至最前方的工作單位數量 (已取出的不計)
+        """
+        with self._lock:
+            requested: List[int] = []
+            seen: Set[int] = set(self._taken)
+            for page in pages:
+                for unit_id in self._pages.get(page, []):
+                    if unit_id not in seen:
+                        requested.append(unit_id)
+                        seen.add(unit_id)
+            self._priority.extendleft(reversed(requested))
+        return len(requested)
+
+    def pop(self) -> List[int]:
+        """
+        取出下一個工作單位
+
+        Returns:
+            List[int]: 段落索引列表 (沒有待翻譯的工作單位時返回空列表)
+        """
+        with self._lock:
+            for queue in (self._priority, self._order):
+                while queue:
+                    unit_id = queue.popleft()
+                    if unit_id not in self._taken:
+                        self._taken.add(unit_id)
+                        return self.units[unit_id]
+        return []
+
+    def mark_failed(self, index: int):
+        """標記段落翻譯失敗 (該頁面不再等待此段落)"""
+        with self._lock:
+            self._failed.add(index)
+
+    def page_status(self) -> Dict[int, Dict[str, Any]]:
+        """獲取各頁面的翻譯狀態 (格式同 `summarize_pages`)"""
+        with self._lock:
+            failed = set(self._failed)
+        return summarize_pages(self.content_list, failed)
@@ -0,0 +1,214 @@
+"""
+翻譯進度日誌 - 以基底快照加上逐段附加的JSON Lines紀錄保存翻譯進度，每個檢查點只寫入新完成的段落
+"""
+import os
+import json
+import time
+from typing import Optional, Dict, List, Any
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = 2):
+    """
+    以暫存檔寫入後取代的方式寫入JSON檔案 (寫入途中中斷不會損毀原檔案)
+
+    Args:
+        path: 檔案路徑
+        data: 要寫入的資料
+        indent: JSON縮排 (None 表示不縮排)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class ProgressJournal:
+    """
+    ### 翻譯進度日誌
+
+    - 基底快照 (`{file_name}_progress.json`): 內容列表的完整快照，格式與舊版進度檔案相同
+    - 附加紀錄 (`{file_name}_progress.jsonl`): 每翻譯完成一個段落附加一行 (段落索引、譯文、翻譯資訊)
+
+    附加紀錄依筆數或時間間隔批次呼叫 fsync；紀錄筆數超過上限時合併回基底快照並清空紀錄 (壓縮)。
+    恢復進度時載入基底快照並依序重播附加紀錄，寫入途中中斷的最後一行會被略過。
+    """
+    def __init__(self,
+            progress_dir: str,
+            file_name: str,
+            fsync_batch: int = 20,
+            fsync_interval: float = 1.0,
+            compact_threshold: int = 500,
+            verbose: bool = False
+        ):
+        """
+        初始化翻譯進度日誌
+
+        Args:
+            progress_dir: 進度檔案存放路徑
+            file_name: 文件名稱
+            fsync_batch: 累積多少筆紀錄後呼叫 fsync
+            fsync_interval: 距上次 fsync 超過多少秒後呼叫 fsync
+            compact_threshold: 附加紀錄超過多少筆後合併回基底快照 (0 表示只在結束時合併)
+            verbose: 是否啟用詳細日誌
+        """
+        self.snapshot_path = os.path.join(progress_dir, f"{file_name}_progress.json")
+        self.journal_path = os.path.join(progress_dir, f"{file_name}_progress.jsonl")
+        self.fsync_batch = max(fsync_batch, 1)
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+        self.verbose = verbose
+
+        self.translator_type: Optional[str] = None
+        self._content_list: List[Dict] = []
+        self._journal = None
+        self._entries = 0           # 附加紀錄中的筆數 (壓縮後歸零)
+        self._unsynced = 0          # 尚未 fsync 的筆數
+        self._last_sync = time.time()
+
+    def exists(self) -> bool:
+        """是否存在可恢復的翻譯進度"""
+        return os.path.exists(self.snapshot_path)
+
+    def start(self, content_list: List[Dict], translator_type: Optional[str] = None):
+        """
+        以新的內容列表建立基底快照並清空附加紀錄
+
+        Args:
+            content_list: 內容列表 (之後的紀錄皆對應此列表的索引)
+            translator_type: 翻譯使用的模型名稱
+        """
+        self._content_list = content_list
+        self.translator_type = translator_type
+        self.compact()
+
+    def load(self, translator_type: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        載入基底快照並重播附加紀錄
+
+        Args:
+            translator_type: 翻譯使用的模型名稱 (之後壓縮時寫入快照)
+
+        Returns:
+            List[Dict]: 恢復後的內容列表 (快照不存在或無法讀取時返回 None)
+        """
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                content_list = json.load(f).get("content_list", [])
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"載入翻譯進度快照時出錯: {e}")
+            return None
+
+        replayed, corrupted = 0, False
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        item = content_list[entry["index"]]
+                    except (json.JSONDecodeError, KeyError, IndexError, TypeError):
+                        logger.warning(f"略過無法解析的翻譯進度紀錄: {self.journal_path} 第 {line_number} 行")
+                        corrupted = True
+                        continue
+                    item["text_zh"] = entry.get("text_zh", "")
+                    item["translation_metadata"] = entry.get("translation_metadata")
+                    replayed += 1
+
+        if self.verbose:
+            logger.info(f"載入翻譯進度快照並重播 {replayed} 筆紀錄: {self.snapshot_path}")
+
+        self._content_list = content_list
+        self.translator_type = translator_type
+        self._entries = replayed
+        if corrupted:
+            self.compact()  # 重寫快照，避免之後的紀錄接在不完整的行之後
+        return content_list
+
+    def append(self, index: int):
+        """
+        附加一筆段落翻譯結果 (依批次設定呼叫 fsync，筆數超過上限時壓縮)
+
+        Args:
+            index: 段落在內容列表中的索引
+        """
+        item = self._content_list[index]
+        entry = {
+            "index": index,
+            "text_zh": item.get("text_zh", ""),
+            "translation_metadata": item.get("translation_metadata")
+        }
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._entries += 1
+        self._unsynced += 1
+
+        if self._unsynced >= self.fsync_batch or time.time() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        if self.compact_threshold > 0 and self._entries >= self.compact_threshold:
+            self.compact()
+
+    def sync(self):
+        """將附加紀錄寫入磁碟"""
+        if self._journal is not None and self._unsynced:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+    def compact(self) -> str:
+        """
+        將目前的內容列表寫入基底快照並清空附加紀錄
+
+        Returns:
+            str: 基底快照路徑 (寫入失敗時返回空字串)
+        """
+        progress_info = {
+            "content_list": self._content_list,
+            "save_time": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "translator_type": self.translator_type
+        }
+        try:
+            atomic_write_json(self.snapshot_path, progress_info)
+        except OSError as e:
+            logger.error(f"保存翻譯進度時出錯: {e}")
+            return ""
+
+        # 快照已包含所有紀錄後才清空附加紀錄
+        self.close()
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        if self.verbose and self._entries:
+            logger.info(f"翻譯進度壓縮完成: 合併 {self._entries} 筆紀錄至 {self.snapshot_path}")
+        self._entries = 0
+        return self.snapshot_path
+
+    def close(self):
+        """寫入尚未 fsync 的紀錄並關閉附加紀錄檔案"""
+        if self._journal is not None:
+            self.sync()
+            self._journal.close()
+            self._journal = None
+
+    def clear(self) -> bool:
+        """
+        清除基底快照及附加紀錄
+
+        Returns:
+            bool: 是否存在進度檔案
+        """
+        self.close()
+        existed = False
+        for path in (self.snapshot_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+                existed = True
+        return existed
@@ -0,0 +1,161 @@
+"""
+參考文獻解析 - 在本地解析參考文獻條目，找出論文標題的位置 (作者、出處、年份、DOI 保持原文)，翻譯後再組回條目
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional, List, Tuple
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+# 條目編號: "[12]"、"(12)"、"12."
+_MARKER_PATTERN = re.compile(r"^\s*(?:\[\s*\d+\s*\]|\(\s*\d+\s*\)|\d{1,3}\.(?=\s))\s*")
+
+# 引號內的標題 (IEEE 格式): “Title,” 或 "Title."
+_QUOTED_PATTERN = re.compile(r"[“\"](?P<title>[^”\"]{8,}?)[,.]?[”\"]")
+
+# APA 格式的年份: "(2019)." 或 "(2019a)."，標題緊接在後
+_APA_YEAR_PATTERN = re.compile(r"\((?:19|20)\d{2}[a-z]?\)\.\s+")
+
+# 句子分界 (句點、問號、驚嘆號後接空白)
+_BOUNDARY_PATTERN = re.compile(r"(?<=[.?!])\s+")
+
+# 句點前為縮寫時不視為分界
+_ABBREVIATION_PATTERN = re.compile(r"\b(?:vs|pp|vol|Vol|no|No|Jr|Sr|St|Eds?|eds?|Inc|Proc|Conf|Int|Trans|Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\.$")
+
+# 名在前的姓名縮寫 ("A. Smith"、"and J. R. Doe")，句點不視為分界；
+# 姓在後的縮寫 ("Doe A.") 則是作者區段的結尾 (Vancouver 格式)
+_LEADING_INITIAL_PATTERN = re.compile(r"(?:^|[,;&]\s*|\band\s+|[A-Z]\.\s*|[A-Z]\.-)[A-Z]\.$")
+
+# 出處區段的開頭 (不可能是標題)
+_VENUE_PATTERN = re.compile(r"^(?:In\b|Proc|Proceedings|arXiv|Journal|IEEE|ACM|Advances in|Available|Retrieved|https?://|doi:)", re.IGNORECASE)
+
+_YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}[a-z]?\b")
+
+@dataclass
+class ParsedReference:
+    """
+    解析後的參考文獻條目
+
+    Args:
+        text: 條目原文
+        title_start: 標題在原文中的起始位置
+        title_end: 標題在原文中的結束位置 (不含結尾標點)
+    """
+    text: str
+    title_start: int
+    title_end: int
+
+    @property
+    def title(self) -> str:
+        """條目中的論文標題"""
+        return self.text[self.title_start:self.title_end]
+
+    def reassemble(self, translated_title: str) -> str:
+        """
+        以譯文取代標題並組回條目
+
+        Args:
+            translated_title: 標題譯文
+
+        Returns:
+            str: 其餘部分保持原文的條目
+        """
+        return self.text[:self.title_start] + translated_title.strip() + self.text[self.title_end:]
+
+class ReferenceParser:
+    """
+    ### 參考文獻解析器
+
+    依序嘗試以下格式找出標題：
+    - 引號內的標題 (IEEE)
+    - 年份括號後的句子 (APA)
+    - 以句點分隔的區段中，作者區段之後第一個像標題的區段 (ACM、Springer 等)
+
+    無法確定標題時返回 None，由呼叫端改為翻譯整個條目。
+    """
+    MIN_TITLE_WORDS = 2     # 標題至少需要的單詞數量
+
+    def __init__(self, verbose: bool = False):
+        """
+        初始化參考文獻解析器
+
+        Args:
+            verbose: 是否啟用詳細日誌
+        """
+        self.verbose = verbose
+
+    def _is_title_like(self, segment: str) -> bool:
+        """區段是否像論文標題"""
+        words = re.findall(r"[^\W\d_]+", segment)
+        if len(words) < self.MIN_TITLE_WORDS or _VENUE_PATTERN.match(segment):
+            return False
+        # 標題很少包含年份，含年份的區段通常是出處
+        return not _YEAR_PATTERN.search(segment)
+
+    def _segments(self, text: str, start: int) -> List[Tuple[int, int]]:
+        """以句子分界切分條目 (略過縮寫及姓名縮寫後的句點)"""
+        spans: List[Tuple[int, int]] = []
+        segment_start = start
+        for match in _BOUNDARY_PATTERN.finditer(text, start):
+            preceding = text[segment_start:match.start()]
+            if _ABBREVIATION_PATTERN.search(preceding) or _LEADING_INITIAL_PATTERN.search(preceding):
+                continue
+            spans.append((segment_start, match.start()))
+            segment_start = match.end()
+        if segment_start < len(text):
+            spans.append((segment_start, len(text)))
+        return spans
+
+    @staticmethod
+    def _trim(text: str, start: int, end: int) -> Tuple[int, int]:
+        """去除區段前後的空白及結尾的分隔標點 (保留問號、驚嘆號)"""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and (text[end - 1].isspace() or text[end - 1] in ".,;:"):
+            end -= 1
+        return start, end
+
+    def parse(self, text: str) -> Optional[ParsedReference]:
+        """
+        解析參考文獻條目
+
+        Args:
+            text: 條目原文
+
+        Returns:
+            ParsedReference: 解析結果 (找不到標題時返回 None)
+        """
+        if not text or not text.strip():
+            return None
+
+        quoted = _QUOTED_PATTERN.search(text)
+        if quoted and self._is_title_like(quoted.group("title")):
+            start, end = self._trim(text, *quoted.span("title"))
+            return ParsedReference(text=text, title_start=start, title_end=end)
+
+        apa = _APA_YEAR_PATTERN.search(text)
+        if apa:
+            segments = self._segments(text, apa.end())
+            if segments:
+                start, end = self._trim(text, *segments[0])
+                if self._is_title_like(text[start:end]):
+                    return ParsedReference(text=text, title_start=start, title_end=end)
+
+        marker = _MARKER_PATTERN.match(text)
+        segments = self._segments(text, marker.end() if marker else 0)
+        for span_start, span_end in segments[1:]:
+            start, end = self._trim(text, span_start, span_end)
+            segment = text[start:end]
+            if re.fullmatch(r"\(?(?:19|20)\d{2}[a-z]?\)?", segment):
+                continue  # ACM 格式: 作者. 年份. 標題.
+            if self._is_title_like(segment):
+                return ParsedReference(text=text, title_start=start, title_end=end)
+            break
+
+        if self.verbose:
+            logger.info(f"無法解析參考文獻標題: {text[:80]}")
+        return None
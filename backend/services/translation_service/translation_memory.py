@@ -0,0 +1,185 @@
+"""
+翻譯記憶庫 - 以SQLite持久化保存段落譯文，相同原文不再重複請求LLM服務
+"""
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import unicodedata
+from threading import Lock
+from typing import Optional, Dict, Any
+
+import logging
+from backend.api import setup_project_logger  # 導入日誌設置函數
+
+setup_project_logger(verbose=True)  # 設置全局日誌記錄器
+logger = logging.getLogger(__name__)
+
+class TranslationMemory:
+    """
+    ### 翻譯記憶庫
+
+    以 (正規化原文, 語言, 模型, 內容類型) 的雜湊值為鍵保存譯文，
+    重新處理同一份PDF、上傳修訂版本或不同論文間的重複段落 (作者單位、授權聲明、常見參考文獻) 皆可直接使用。
+    超過數量上限時依最近使用時間淘汰舊的譯文。
+    """
+    def __init__(self,
+            instance_path: str,
+            db_name: str = "translation_memory.db",
+            max_entries: int = 100000,
+            verbose: bool = False
+        ):
+        """
+        初始化翻譯記憶庫
+
+        Args:
+            instance_path: 資料庫存放路徑 (存放於 instance_path/translated_files 目錄下)
+            db_name: 資料庫檔案名稱
+            max_entries: 保存的譯文數量上限 (超過時淘汰最久未使用的譯文)
+            verbose: 是否啟用詳細日誌
+        """
+        db_dir = os.path.join(instance_path, "translated_files")
+        os.makedirs(db_dir, exist_ok=True)
+        self.db_path = os.path.join(db_dir, db_name)
+
+        self.max_entries = max(max_entries, 1)
+        self.verbose = verbose
+
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                translation TEXT NOT NULL,
+                model TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)")
+        self._conn.commit()
+
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if self.verbose:
+            logger.info(f"翻譯記憶庫初始化完成: {self.db_path} (已保存 {self._entries} 筆譯文)")
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """正規化原文 (Unicode NFKC並合併空白)，使排版差異不影響比對"""
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+    def _make_key(self, text: str, lang: str, model: str, content_type: str) -> str:
+        """產生譯文的雜湊鍵"""
+        raw = "\x1f".join([self.normalize(text), lang, model, content_type or ""])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, text: str, lang: str, model: str, content_type: str) -> Optional[str]:
+        """
+        查詢譯文
+
+        Args:
+            text: 原文
+            lang: 原文語言
+            model: 翻譯模型名稱
+            content_type: 內容類型 (title/abstract/body/reference)
+
+        Returns:
+            str: 已保存的譯文 (未命中時返回 None)
+        """
+        key = self._make_key(text, lang, model, content_type)
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self._misses += 1
+                    return None
+
+                self._conn.execute(
+                    "UPDATE translations SET last_used = ?, hit_count = hit_count + 1 WHERE key = ?",
+                    (time.time(), key)
+                )
+                self._conn.commit()
+                self._hits += 1
+                return row[0]
+            except sqlite3.Error as e:
+                logger.error(f"查詢翻譯記憶庫時出錯: {e}")
+                self._misses += 1
+                return None
+
+    def store(self, text: str, lang: str, model: str, content_type: str, translation: str):
+        """
+        保存譯文 (超過數量上限時淘汰最久未使用的譯文)
+
+        Args:
+            text: 原文
+            lang: 原文語言
+            model: 翻譯模型名稱
+            content_type: 內容類型
+            translation: 譯文
+        """
+        if not translation:
+            return
+
+        key = self._make_key(text, lang, model, content_type)
+        now = time.time()
+        with self._lock:
+            try:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO translations (key, translation, model, content_type, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, translation, model, content_type or "", now, now)
+                )
+                self._entries += cursor.rowcount
+                if self._entries > self.max_entries:
+                    self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"保存翻譯記憶時出錯: {e}")
+
+    def _evict(self):
+        """淘汰最久未使用的譯文，保留數量上限的90% (需在鎖內呼叫)"""
+        target = int(self.max_entries * 0.9)
+        cursor = self._conn.execute(
+            "DELETE FROM translations WHERE key IN "
+            "(SELECT key FROM translations ORDER BY last_used ASC LIMIT ?)",
+            (self._entries - target,)
+        )
+        self._entries -= cursor.rowcount
+        self._evictions += cursor.rowcount
+        if self.verbose:
+            logger.info(f"翻譯記憶庫已淘汰 {cursor.rowcount} 筆最久未使用的譯文")
+
+    def clear(self):
+        """清空翻譯記憶庫"""
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+            self._entries = 0
+        logger.info("翻譯記憶庫已清空")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        獲取翻譯記憶庫統計資料
+
+        Returns:
+            Dict: 譯文數量、命中/未命中次數、命中率及淘汰數量
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": self._entries,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+                "evictions": self._evictions,
+                "db_path": self.db_path
+            }
@@ -1,45 +1,130 @@
 """
 翻譯器基類 - 定義翻譯器的基本接口和通用方法
 """
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Callable, Any
 import json
 import os
 import time
 import requests
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 
 from backend.services.llm_service import BaseLLMService
+from backend.services.llm_service.rate_limiter import estimate_tokens
 from backend.api import ProgressManager
 
+from .translation_memory import TranslationMemory
+from .content_filter import ContentFilter
+from .progress_journal import ProgressJournal, atomic_write_json
+from .reference_parser import ReferenceParser
+from .glossary import GlossaryExtractor, DocumentGlossary
+from .page_scheduler import PageScheduler, summarize_pages
+
 import logging
 from backend.api import setup_project_logger  # 導入日誌設置函數
 
 setup_project_logger(verbose=True)  # 設置全局日誌記錄器
 logger = logging.getLogger(__name__)
 
+class _OrderedNotifier:
+    """
+    依文件順序通知已確定 (翻譯完成、無需翻譯或翻譯失敗) 的段落
+
+    並行翻譯時段落完成順序不固定，先完成的段落會暫存，直到前面的段落都確定後才依序通知。
+    """
+    def __init__(self, content_list: List[Dict], callback: Optional[Callable[[int, Dict], None]]):
+        self.content_list = content_list
+        self.callback = callback
+        self.settled = [False] * len(content_list)
+        self.next_index = 0
+
+    def settle(self, index: int):
+        """標記段落已確定，並依序通知所有可通知的段落"""
+        if self.callback is None:
+            return
+        self.settled[index] = True
+        while self.next_index < len(self.content_list) and self.settled[self.next_index]:
+            try:
+                self.callback(self.next_index, self.content_list[self.next_index])
+            except Exception as e:
+                logger.error(f"段落 {self.next_index + 1} 的完成通知處理失敗: {e}")
+            self.next_index += 1
+
+    def settle_until(self, end: int):
+        """標記編號小於 end 的所有段落已確定"""
+        for index in range(self.next_index, end):
+            self.settle(index)
+
 class Translator():
     """
     ### 通用翻譯器
 
     使用指定的LLM服務進行文本翻譯。
     """
-    def __init__(self, instance_path: str, llm_service_obj: BaseLLMService, verbose: bool = False):
+    def __init__(self, 
+            instance_path: str, 
+            llm_service_obj: BaseLLMService, 
+            max_workers: Dict[str, int] = None,
+            batch_token_budget: Dict[str, int] = None,
+            batch_max_items: int = 20,
+            history_window: Optional[int] = None,
+            pinned_turns: int = 0,
+            translation_memory: Optional[TranslationMemory] = None,
+            content_filter: Optional[ContentFilter] = None,
+            reference_parser: Optional[ReferenceParser] = None,
+            reference_batch_size: int = 40,
+            glossary_extractor: Optional[GlossaryExtractor] = None,
+            journal_fsync_batch: int = 20,
+            journal_fsync_interval: float = 1.0,
+            journal_compact_threshold: int = 500,
+            verbose: bool = False
+        ):
         """
         初始化翻譯器
 
         Args:
             instance_path: 存放PDF的資料夾路徑
             llm_services_obj: LLM服務實例
+            max_workers: 各服務提供者的並行翻譯數量 (未設定或為1時使用多輪對話逐段翻譯)
+            batch_token_budget: 各服務提供者每次請求合併翻譯的段落Token上限 (未設定或為0時不合併)
+            batch_max_items: 每次請求合併翻譯的段落數量上限
+            history_window: 多輪對話翻譯時保留的最近輪數 (None 表示保留全部對話紀錄)
+            pinned_turns: 多輪對話翻譯時固定保留的最初輪數
+            translation_memory: 翻譯記憶庫 (None 表示不使用)
+            content_filter: 翻譯前內容過濾器 (None 表示所有文字段落皆送出翻譯)
+            reference_parser: 參考文獻解析器 (None 表示參考文獻條目逐條完整翻譯)
+            reference_batch_size: 每次請求批次翻譯的參考文獻標題數量上限
+            glossary_extractor: 候選術語擷取器 (None 表示不建立文件術語表，逐段翻譯時使用多輪對話維持術語一致)
+            journal_fsync_batch: 翻譯進度日誌累積多少筆紀錄後寫入磁碟
+            journal_fsync_interval: 翻譯進度日誌距上次寫入磁碟超過多少秒後寫入磁碟
+            journal_compact_threshold: 翻譯進度日誌超過多少筆紀錄後合併回基底快照
             verbose: 是否啟用詳細模式
         """
         self.llm_service = llm_service_obj
+        self.max_workers = max_workers or {}
+        self.batch_token_budget = batch_token_budget or {}
+        self.batch_max_items = max(batch_max_items, 1)
+        self.history_window = history_window
+        self.pinned_turns = pinned_turns
+        self.translation_memory = translation_memory
+        self.content_filter = content_filter
+        self.reference_parser = reference_parser
+        self.reference_batch_size = max(reference_batch_size, 1)
+        self.glossary_extractor = glossary_extractor
+        self.journal_fsync_batch = journal_fsync_batch
+        self.journal_fsync_interval = journal_fsync_interval
+        self.journal_compact_threshold = journal_compact_threshold
 
         self.verbose = verbose
 
         self.instance_path = instance_path
         self.progress_path = os.path.join(instance_path, "translated_files", "unfinished_file")
 
-        self.is_reference = False
+        # 翻譯中的文件 (文件名稱 → 內容列表及頁面優先排程器)，供閱讀介面請求頁面及查詢頁面狀態
+        self._active_jobs: Dict[str, Dict] = {}
+        self._page_requests: Dict[str, List[int]] = {}  # 翻譯中的文件在排程器建立前收到的頁面請求
+        self._jobs_lock = threading.Lock()
 
         # 支援的語言映射
         self.LANG_MAP = {
@@ -60,6 +145,72 @@ class Translator():
         """檢查翻譯器是否可用"""
         return self.llm_service.is_available()
 
+    def request_pages(self, file_name: str, pages: List[int]) -> bool:
+        """
+        請求優先翻譯指定頁面 (並行翻譯時包含這些頁面段落的工作單位移至佇列最前方)
+
+        文件翻譯中但尚未進入並行翻譯階段時保留請求，待排程器建立後套用 (翻譯結束時捨棄)；
+        文件未在翻譯中時忽略請求；多輪對話逐段翻譯依文件順序進行，不受影響。
+
+        Args:
+            file_name: 文件名稱
+            pages: 頁碼 (page_idx，依優先順序排列)
+
+        Returns:
+            bool: 是否已套用於進行中的並行翻譯
+        """
+        with self._jobs_lock:
+            job = self._active_jobs.get(file_name)
+            if job is None:
+                return False
+            scheduler = job["scheduler"]
+            if scheduler is None:
+                earlier = [page for page in self._page_requests.get(file_name, []) if page not in pages]
+                self._page_requests[file_name] = list(pages) + earlier
+                return False
+
+        moved = scheduler.request_pages(pages)
+        if self.verbose:
+            logger.info(f"優先翻譯頁面 {[page + 1 for page in pages]}: {moved} 個工作單位移至佇列最前方")
+        return True
+
+    def get_page_status(self, file_name: str) -> Dict[str, Any]:
+        """
+        獲取文件各頁面的翻譯狀態
+
+        Args:
+            file_name: 文件名稱
+
+        Returns:
+            Dict: 翻譯狀態
+                - state: translating (翻譯中)、completed (已完成)、interrupted (有未完成的翻譯進度)、pending (尚未翻譯)
+                - pages: 頁碼 (page_idx) → 頁面狀態 (格式同 `summarize_pages`)
+        """
+        with self._jobs_lock:
+            job = self._active_jobs.get(file_name)
+        if job is not None:
+            scheduler = job["scheduler"]
+            pages = scheduler.page_status() if scheduler is not None else summarize_pages(job["content_list"])
+            return {"state": "translating", "pages": pages}
+
+        output_path = os.path.join(os.path.dirname(self.progress_path), f"{file_name}_translated.json")
+        if os.path.exists(output_path):
+            try:
+                with open(output_path, 'r', encoding='utf-8') as f:
+                    pages = summarize_pages(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"讀取翻譯結果時出錯: {e}")
+                return {"state": "pending", "pages": {}}
+            for page in pages.values():
+                page["ready"] = True  # 翻譯已結束，未翻譯的段落皆為失敗或略過
+            return {"state": "completed", "pages": pages}
+
+        journal = self._create_journal(file_name)
+        content_list = journal.load() if journal.exists() else None
+        if content_list is not None:
+            return {"state": "interrupted", "pages": summarize_pages(content_list)}
+        return {"state": "pending", "pages": {}}
+
     def _get_system_prompt(self, target_lang: str) -> str:
         """獲取系統提示詞"""
         return """
@@ -90,11 +241,21 @@ class Translator():
 **重要：僅輸出翻譯結果，無需額外說明；上下文僅供參考，請勿將上下文內容複製到回答中**
 """.format(target_lang=target_lang, context="{context}", content_type="{content_type}")
 
-    def send_translate_request(self, prompt: str, end_chat: bool, target_lang: str = "en") -> str:
-        """發送翻譯請求給翻譯器"""
+    def send_translate_request(self, prompt: str, end_chat: bool, target_lang: str = "en", stateless: bool = False) -> str:
+        """發送翻譯請求給翻譯器 (stateless 為 True 時發送獨立請求，不使用多輪對話)"""
         if target_lang not in self.LANG_MAP:
             raise ValueError(f"不支援的目標語言: {target_lang}")
 
+        if stateless:
+            # 獨立請求由自適應併發控制器決定同時送出的數量
+            with self.llm_service.concurrency.slot() as slot:
+                response = self.llm_service.send_single_request(
+                    prompt, 
+                    system_prompt=self._get_system_prompt(target_lang=self.LANG_MAP.get(target_lang))
+                )
+                slot.success = bool(response)
+            return response
+
         return self.llm_service.send_multi_request(
             prompt, 
             self._get_system_prompt(target_lang=self.LANG_MAP.get(target_lang)), 
@@ -129,24 +290,63 @@ class Translator():
             target_lang: str,
             content_type: str = "body", 
             max_retries: int = 3, 
+            stateless: bool = False,
+            glossary: Optional[DocumentGlossary] = None
         ) -> str:
         """
-        翻譯單一段落文字。
+        翻譯單一段落文字 (優先使用翻譯記憶庫中的譯文)。
         
         Args:
             text: 要翻譯的文本
             target_lang: 目標語言
             content_type: 內容類型 (title/abstract/body/reference)
             max_retries: 最大重試次數
+            stateless: 是否使用獨立請求 (並行翻譯時使用，不共享多輪對話)
+            glossary: 文件術語表 (段落中出現的術語會附加於請求中)
             
+        Returns:
+            翻譯後的文本 (如果出現錯誤，返回空字串)
+        """
+        cached = self._recall(text, target_lang, content_type)
+        if cached is not None:
+            return cached
+
+        translation = self._request_translation(text, target_lang, content_type, max_retries, stateless, glossary)
+        self._remember(text, target_lang, content_type, translation)
+        return translation
+
+    def _recall(self, text: str, target_lang: str, content_type: str) -> Optional[str]:
+        """從翻譯記憶庫查詢譯文 (未啟用或未命中時返回 None)"""
+        if self.translation_memory is None:
+            return None
+        return self.translation_memory.lookup(text, target_lang, self.llm_service.model_name, content_type)
+
+    def _remember(self, text: str, target_lang: str, content_type: str, translation: str):
+        """將譯文存入翻譯記憶庫"""
+        if self.translation_memory is not None and translation:
+            self.translation_memory.store(text, target_lang, self.llm_service.model_name, content_type, translation)
+
+    def _request_translation(self, 
+            text: str, 
+            target_lang: str,
+            content_type: str, 
+            max_retries: int, 
+            stateless: bool,
+            glossary: Optional[DocumentGlossary] = None
+        ) -> str:
+        """
+        發送單一段落的翻譯請求 (附帶重試機制)
+
         Returns:
             翻譯後的文本 (如果出現錯誤，返回空字串)
         """
         prompt = f"""內容類型：{content_type}; 翻譯內容：{text};"""
+        if glossary is not None:
+            prompt = glossary.prompt_for([text]) + prompt
 
         for attempt in range(1, max_retries + 1):
             try:
-                translation = self.send_translate_request(prompt, end_chat=False, target_lang=target_lang)
+                translation = self.send_translate_request(prompt, end_chat=False, target_lang=target_lang, stateless=stateless)
                 if not translation:
                     logger.warning(f"翻譯出現錯誤，重新嘗試 (嘗試 {attempt}/{max_retries})")
                     continue
@@ -189,18 +389,185 @@ class Translator():
             logger.info("超過最大重試次數")
         return ""
 
+    def translate_batch(self, 
+            texts: List[str], 
+            content_types: List[str], 
+            target_lang: str,
+            glossary: Optional[DocumentGlossary] = None
+        ) -> Optional[List[str]]:
+        """
+        以單次請求翻譯多個段落 (JSON陣列格式輸入與輸出)
+
+        Args:
+            texts: 要翻譯的段落列表
+            content_types: 各段落的內容類型 (title/abstract/body/reference)
+            target_lang: 目標語言
+            glossary: 文件術語表 (段落中出現的術語會附加於請求中)
+
+        Returns:
+            List[str]: 與輸入順序相同的譯文列表 (請求失敗或回應格式不符時返回 None)
+        """
+        paragraphs = [
+            {"id": index, "content_type": content_type, "text": text}
+            for index, (text, content_type) in enumerate(zip(texts, content_types))
+        ]
+        prompt = (
+            f"以下JSON陣列包含 {len(paragraphs)} 個段落，請逐一翻譯每個段落的 text (依各自的 content_type 處理)。\n"
+            f"僅輸出JSON陣列，不得包含其他說明或Markdown標記，格式為: "
+            f'[{{"id": 段落id, "translation": "譯文"}}, ...]，陣列長度必須為 {len(paragraphs)}。\n'
+            f"{json.dumps(paragraphs, ensure_ascii=False)}"
+        )
+        if glossary is not None:
+            prompt = glossary.prompt_for(texts) + prompt
+
+        try:
+            response = self.send_translate_request(prompt, end_chat=False, target_lang=target_lang, stateless=True)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"批次翻譯請求錯誤: {e}")
+            return None
+
+        translations = self._parse_batch_response(response, len(paragraphs))
+        if translations is None:
+            logger.warning(f"批次翻譯回應格式不符，共 {len(paragraphs)} 個段落")
+        return translations
+
+    def _parse_batch_response(self, response: Optional[str], count: int) -> Optional[List[str]]:
+        """
+        解析並驗證批次翻譯的JSON回應
+
+        Args:
+            response: LLM回應文字
+            count: 預期的段落數量
+
+        Returns:
+            List[str]: 依段落id排序的譯文列表 (格式不符時返回 None)
+        """
+        if not response:
+            return None
+
+        # 去除可能的Markdown程式碼區塊等前後文字
+        start, end = response.find("["), response.rfind("]")
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = json.loads(response[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+
+        if not isinstance(data, list) or len(data) != count:
+            return None
+
+        translations: Dict[int, str] = {}
+        for entry in data:
+            if not isinstance(entry, dict):
+                return None
+            index, translation = entry.get("id"), entry.get("translation")
+            if not isinstance(index, int) or not 0 <= index < count:
+                return None
+            if not isinstance(translation, str) or not translation.strip():
+                return None
+            translations[index] = translation.strip()
+
+        if len(translations) != count:
+            return None
+        return [translations[index] for index in range(count)]
+
+    def translate_reference_titles(self, titles: List[str], target_lang: str) -> Optional[List[str]]:
+        """
+        以單次精簡請求翻譯多個參考文獻標題 (不使用完整的學術翻譯系統提示詞)
+
+        Args:
+            titles: 論文標題列表
+            target_lang: 目標語言
+
+        Returns:
+            List[str]: 與輸入順序相同的標題譯文 (請求失敗或回應格式不符時返回 None)
+        """
+        if target_lang not in self.LANG_MAP:
+            raise ValueError(f"不支援的目標語言: {target_lang}")
+
+        system_prompt = (
+            f"你是學術論文標題翻譯器，將{self.LANG_MAP[target_lang]}論文標題翻譯為繁體中文。"
+            f"專有名詞、模型名稱、縮寫及數學符號保持原文。"
+        )
+        prompt = (
+            f"翻譯以下 {len(titles)} 個論文標題，僅輸出JSON陣列，格式為: "
+            f'[{{"id": 標題id, "translation": "譯文"}}, ...]，陣列長度必須為 {len(titles)}。\n'
+            f"{json.dumps([{'id': index, 'title': title} for index, title in enumerate(titles)], ensure_ascii=False)}"
+        )
+
+        try:
+            with self.llm_service.concurrency.slot() as slot:
+                response = self.llm_service.send_single_request(prompt, system_prompt=system_prompt)
+                slot.success = bool(response)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"參考文獻標題翻譯請求錯誤: {e}")
+            return None
+        if not response:
+            logger.error(f"參考文獻標題翻譯未取得回覆 ({getattr(self.llm_service, 'provider', None)}/{self.llm_service.model_name})，共 {len(titles)} 個標題")
+            return None
+
+        translations = self._parse_batch_response(response, len(titles))
+        if translations is None:
+            logger.warning(f"參考文獻標題翻譯回應格式不符，共 {len(titles)} 個標題")
+        return translations
+
+    def translate_glossary_terms(self, terms: List[str], target_lang: str) -> Optional[List[str]]:
+        """
+        以單次精簡請求翻譯文件的候選術語
+
+        Args:
+            terms: 候選術語列表
+            target_lang: 目標語言
+
+        Returns:
+            List[str]: 與輸入順序相同的術語譯文 (請求失敗或回應格式不符時返回 None)
+        """
+        if target_lang not in self.LANG_MAP:
+            raise ValueError(f"不支援的目標語言: {target_lang}")
+
+        system_prompt = (
+            f"你是學術術語翻譯器，將{self.LANG_MAP[target_lang]}學術術語翻譯為繁體中文 (台灣慣用譯名)。"
+            f"專有名詞、模型名稱及公認縮寫保持原文；不是術語的一般詞組照常翻譯。"
+        )
+        prompt = (
+            f"翻譯以下 {len(terms)} 個術語，僅輸出JSON陣列，格式為: "
+            f'[{{"id": 術語id, "translation": "譯文"}}, ...]，陣列長度必須為 {len(terms)}。\n'
+            f"{json.dumps([{'id': index, 'term': term} for index, term in enumerate(terms)], ensure_ascii=False)}"
+        )
+
+        try:
+            with self.llm_service.concurrency.slot() as slot:
+                response = self.llm_service.send_single_request(prompt, system_prompt=system_prompt)
+                slot.success = bool(response)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"術語翻譯請求錯誤: {e}")
+            return None
+        if not response:
+            logger.error(f"術語翻譯未取得回覆 ({getattr(self.llm_service, 'provider', None)}/{self.llm_service.model_name})，共 {len(terms)} 個術語")
+            return None
+
+        translations = self._parse_batch_response(response, len(terms))
+        if translations is None:
+            logger.warning(f"術語翻譯回應格式不符，共 {len(terms)} 個術語")
+        return translations
+
     def translate_content_list(self, 
             content_list_path: str, 
             target_lang: str,
-            buffer_time: float = 0.5
+            buffer_time: float = 0.5,
+            on_item_translated: Optional[Callable[[int, Dict], None]] = None
         ) -> str:
         """
         翻譯content_list.json檔案
         
         Args:
             content_list_path: content_list.json檔案路徑
-            buffer_time: 每次請求後的緩衝時間，避免過於頻繁請求
+            buffer_time: 每次請求後的緩衝時間，避免過於頻繁請求 (僅逐段翻譯模式使用)
             target_lang: 目標語言
+            on_item_translated: 段落確定後的回呼函式 (index, item)，依文件順序對每個段落呼叫一次
+                - 用於將翻譯結果串流給下游處理 (例如邊翻譯邊向量化)
+                - 未翻譯或翻譯失敗的段落也會通知 (不含 translation_metadata)
             
         Returns:
             翻譯結果檔案路徑
@@ -211,67 +578,295 @@ class Translator():
             raise FileNotFoundError(f"檔案不存在: {content_list_path}")
 
         file_name = '_'.join(str(content_list_path.stem).split("_")[:-2])
-        progress_path = os.path.join(self.progress_path, f"{file_name}_progress.json")
-        if os.path.exists(progress_path):
-            # 載入進度檔案
-            with open(progress_path, 'r', encoding='utf-8') as f:
-                progress_data = json.load(f)
-            content_list = progress_data.get("content_list", [])
-
+        journal = self._create_journal(file_name)
+        content_list = journal.load(self.llm_service.model_name) if journal.exists() else None
+        if content_list is not None:
+            remaining = self._check_translated_progress(content_list)
             if self.verbose:
-                logger.info(f"偵測到翻譯進度: {progress_path}")
-                logger.info(f"重新載入翻譯進度: 剩餘 {self._check_translated_progress(content_list)} 個段落")
-
-            if self._check_translated_progress(content_list) == 0:
-                logger.info("檔案已全部翻譯完成，無需重複翻譯")
-                return self._save_translated_progress(content_list, file_name)
+                logger.info(f"偵測到翻譯進度: {journal.snapshot_path}")
+                logger.info(f"重新載入翻譯進度: 剩餘 {remaining} 個段落")
         else:
-            # 初次翻譯，載入原始檔案
+            # 初次翻譯，載入原始檔案並建立基底快照
             with open(content_list_path, 'r', encoding='utf-8') as f:
                 content_list = json.load(f)
-
-            # 保存初始進度，再載入進度檔案
-            self._save_translated_progress(content_list, file_name)
-            with open(progress_path, 'r', encoding='utf-8') as f:
-                progress_data = json.load(f)
-            content_list = progress_data.get("content_list", [])
+            journal.start(content_list, self.llm_service.model_name)
+            remaining = self._check_translated_progress(content_list)
 
             if self.verbose:
-                logger.info(f"初次翻譯，建立進度檔案: {progress_path}")
+                logger.info(f"初次翻譯，建立進度檔案: {journal.snapshot_path}")
                 logger.info(f"總計翻譯項目: {len(content_list)} 個項目")
 
-        # 翻譯處理
+        translated_count, passthrough_count, reference_count = 0, 0, 0
+        with self._jobs_lock:
+            self._active_jobs[file_name] = {"content_list": content_list, "scheduler": None}
+        try:
+            if remaining == 0:
+                logger.info("檔案已全部翻譯完成，無需重複翻譯")
+                _OrderedNotifier(content_list, on_item_translated).settle_until(len(content_list))
+            else:
+                # 依文件順序預先分類內容類型 (參考文獻判斷依賴段落順序)
+                content_types = self._classify_content_list(content_list)
+                passthrough_count = self._apply_content_filter(content_list, content_types, target_lang)
+                if passthrough_count:
+                    journal.compact()
+                reference_count = self._translate_references(content_list, content_types, journal, target_lang)
+                glossary = self._build_glossary(file_name, content_list, content_types, target_lang)
+                notifier = _OrderedNotifier(content_list, on_item_translated)
+
+                max_workers = self._get_max_workers()
+                token_budget = self._get_batch_token_budget()
+                # 有術語表時以獨立請求維持術語一致，不需依賴多輪對話逐段翻譯
+                if glossary is not None or max_workers > 1 or token_budget > 0:
+                    # 啟用自適應併發控制時，工作池大小為併發上限的最大值，實際同時送出的請求數量由控制器調整
+                    concurrency = self.llm_service.concurrency
+                    pool_size = concurrency.max_limit if concurrency.enabled else max_workers
+                    if self.verbose:
+                        logger.info(f"使用並行翻譯模式，並行數量: {pool_size}{' (自適應)' if concurrency.enabled else ''}，合併翻譯Token上限: {token_budget}")
+                    translated_count += self._translate_concurrently(content_list, content_types, journal, target_lang, pool_size, notifier, token_budget, glossary, file_name)
+                else:
+                    translated_count += self._translate_sequentially(content_list, content_types, journal, target_lang, buffer_time, notifier)
+
+                    # 結束多輪對話
+                    self.send_translate_request("", end_chat=True)
+        finally:
+            journal.close()
+            with self._jobs_lock:
+                self._active_jobs.pop(file_name, None)
+                self._page_requests.pop(file_name, None)
+
+        # 保存翻譯結果 (寫入完成後才清除進度檔案)
+        output_path = os.path.join(os.path.dirname(self.progress_path), f"{file_name}_translated.json")
+        atomic_write_json(output_path, content_list)
+
+        logger.info("翻譯完成！")
+        logger.info(f"翻譯結果已保存: {output_path}")
+        logger.info(
+            f"共翻譯 {translated_count + reference_count} 個段落"
+            + (f" (其中 {reference_count} 條參考文獻僅翻譯標題)" if reference_count else "")
+            + (f"，{passthrough_count} 個段落沿用原文" if passthrough_count else "")
+        )
+
+        self._clear_translated_progress(file_name)
+        
+        return str(output_path)
+
+    def _create_journal(self, file_name: str) -> ProgressJournal:
+        """建立文件的翻譯進度日誌"""
+        return ProgressJournal(
+            progress_dir=self.progress_path,
+            file_name=file_name,
+            fsync_batch=self.journal_fsync_batch,
+            fsync_interval=self.journal_fsync_interval,
+            compact_threshold=self.journal_compact_threshold,
+            verbose=self.verbose
+        )
+
+    def _get_max_workers(self) -> int:
+        """依LLM服務提供者取得並行翻譯數量"""
+        provider = getattr(self.llm_service, "provider", None)
+        return max(int(self.max_workers.get(provider, 1)), 1)
+
+    def _get_batch_token_budget(self) -> int:
+        """依LLM服務提供者取得合併翻譯的Token上限 (0 表示不合併)"""
+        provider = getattr(self.llm_service, "provider", None)
+        return max(int(self.batch_token_budget.get(provider, 0)), 0)
+
+    def _needs_translation(self, item: Dict) -> bool:
+        """判斷段落是否仍需翻譯"""
+        if item.get('translation_metadata', {}) != {}:
+            return False
+        return item.get('type') == 'text' and bool(item.get('text'))
+
+    def _apply_translation(self, item: Dict, translated_text: str, content_type: str):
+        """將翻譯結果寫回段落"""
+        item['text_zh'] = translated_text
+        item['translation_metadata'] = {
+            'model': self.llm_service.model_name,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'content_type': content_type
+        }
+
+    def _apply_content_filter(self, content_list: List[Dict], content_types: List[Optional[str]], target_lang: str) -> int:
+        """
+        以翻譯前內容過濾器找出不需翻譯的段落，直接沿用原文並標記為 passthrough
+
+        Args:
+            content_list: 內容列表
+            content_types: 各段落的內容類型
+            target_lang: 文件的來源語言
+
+        Returns:
+            int: 沿用原文的段落數量
+        """
+        if self.content_filter is None:
+            return 0
+
+        candidates = [index for index, item in enumerate(content_list) if self._needs_translation(item)]
+        passthrough = self.content_filter.filter_content_list(content_list, candidates, target_lang)
+        for index, reason in passthrough.items():
+            item = content_list[index]
+            item['text_zh'] = item.get('text', '')
+            item['translation_metadata'] = {
+                'model': None,
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'content_type': content_types[index],
+                'passthrough': reason
+            }
+        return len(passthrough)
+
+    def _translate_references(self, 
+            content_list: List[Dict], 
+            content_types: List[Optional[str]], 
+            journal: ProgressJournal, 
+            target_lang: str
+        ) -> int:
+        """
+        參考文獻快速翻譯：在本地解析條目，僅將標題合併為少數幾次請求翻譯後組回條目
+
+        無法解析標題或標題翻譯失敗的條目保持未翻譯，由一般翻譯流程逐條完整翻譯。
+
+        Args:
+            content_list: 內容列表
+            content_types: 各段落的內容類型
+            journal: 翻譯進度日誌
+            target_lang: 文件的來源語言
+
+        Returns:
+            int: 完成翻譯的參考文獻條目數量
+        """
+        if self.reference_parser is None:
+            return 0
+
+        parsed = {}
+        for index, content_type in enumerate(content_types):
+            if content_type == 'reference' and self._needs_translation(content_list[index]):
+                reference = self.reference_parser.parse(content_list[index].get('text', ''))
+                if reference is not None:
+                    parsed[index] = reference
+        if not parsed:
+            return 0
+
+        # 先使用翻譯記憶庫中的標題譯文，其餘標題依批次大小合併請求
+        titles = {index: self._recall(reference.title, target_lang, 'reference_title') for index, reference in parsed.items()}
+        misses = [index for index, title in titles.items() if title is None]
+        failed_batches = 0
+        for start in range(0, len(misses), self.reference_batch_size):
+            batch = misses[start:start + self.reference_batch_size]
+            ProgressManager.progress_update(30, f"翻譯中: 正在批次翻譯參考文獻標題 ({start + len(batch)}/{len(misses)})", "translating-json")
+            translations = self.translate_reference_titles([parsed[index].title for index in batch], target_lang)
+            if translations is None:
+                failed_batches += 1
+                continue
+            for index, translation in zip(batch, translations):
+                titles[index] = translation
+                self._remember(parsed[index].title, target_lang, 'reference_title', translation)
+
+        translated_count = 0
+        for index, title in titles.items():
+            if not title:
+                continue
+            self._apply_translation(content_list[index], parsed[index].reassemble(title), 'reference')
+            content_list[index]['translation_metadata']['title_only'] = True
+            journal.append(index)
+            translated_count += 1
+
+        if misses and failed_batches * self.reference_batch_size >= len(misses):
+            # 所有標題請求皆失敗通常是服務傳輸問題 (而非個別條目格式)，快速翻譯形同停用
+            provider = getattr(self.llm_service, "provider", None)
+            logger.error(f"參考文獻快速翻譯未生效: {provider}/{self.llm_service.model_name} 的 {failed_batches} 個標題請求皆失敗，{len(misses)} 條參考文獻改為逐條完整翻譯")
+        if self.verbose:
+            requests_count = (len(misses) + self.reference_batch_size - 1) // self.reference_batch_size
+            logger.info(f"參考文獻快速翻譯: {translated_count}/{len(parsed)} 條完成 (發送 {requests_count} 個請求，{len(parsed) - len(misses)} 條使用翻譯記憶庫)")
+        return translated_count
+
+    def _build_glossary(self, 
+            file_name: str, 
+            content_list: List[Dict], 
+            content_types: List[Optional[str]], 
+            target_lang: str
+        ) -> Optional[DocumentGlossary]:
+        """
+        建立文件術語表：擷取候選術語並以單次請求翻譯 (恢復翻譯進度時沿用已保存的術語表)
+
+        Args:
+            file_name: 文件名稱
+            content_list: 內容列表
+            content_types: 各段落的內容類型
+            target_lang: 文件的來源語言
+
+        Returns:
+            DocumentGlossary: 文件術語表 (未啟用或術語翻譯失敗時返回 None，改為多輪對話逐段翻譯)
+        """
+        if self.glossary_extractor is None:
+            return None
+
+        glossary = DocumentGlossary(self.progress_path, file_name)
+        if glossary.exists() and glossary.load():
+            if self.verbose:
+                logger.info(f"沿用已保存的術語表: {len(glossary)} 個術語")
+            return glossary
+
+        candidates = [
+            index for index, item in enumerate(content_list)
+            if self._needs_translation(item) and content_types[index] != 'reference'
+        ]
+        terms = self.glossary_extractor.extract(content_list, content_types, candidates)
+
+        # 先使用翻譯記憶庫中的術語譯文，其餘術語合併為單次請求
+        translations = {term: self._recall(term, target_lang, 'glossary_term') for term in terms}
+        misses = [term for term, translation in translations.items() if translation is None]
+        if misses:
+            ProgressManager.progress_update(30, f"翻譯中: 正在建立術語表 ({len(misses)} 個術語)", "translating-json")
+            translated = self.translate_glossary_terms(misses, target_lang)
+            if translated is None:
+                # 術語請求失敗時段落請求多半也會失敗 (例如服務傳輸錯誤)，以錯誤層級記錄，不視為一般的改用多輪對話
+                logger.error(f"術語表建立失敗 ({getattr(self.llm_service, 'provider', None)}/{self.llm_service.model_name})，改為多輪對話逐段翻譯，請確認LLM服務的獨立請求是否正常")
+                return None
+            for term, translation in zip(misses, translated):
+                translations[term] = translation
+                self._remember(term, target_lang, 'glossary_term', translation)
+
+        glossary.set_terms({term: translation for term, translation in translations.items() if translation})
+        glossary.save()
+        if self.verbose:
+            logger.info(f"術語表建立完成: {len(glossary)} 個術語 ({len(terms) - len(misses)} 個使用翻譯記憶庫)")
+        return glossary
+
+    def _translate_sequentially(self, 
+            content_list: List[Dict], 
+            content_types: List[Optional[str]], 
+            journal: ProgressJournal, 
+            target_lang: str, 
+            buffer_time: float,
+            notifier: _OrderedNotifier
+        ) -> int:
+        """
+        以多輪對話逐段翻譯 (保持上下文術語一致)
+
+        Returns:
+            int: 成功翻譯的段落數量
+        """
         translated_count = 0
 
+        # 限制多輪對話的上下文長度，使每段的請求成本不隨文件位置增加
+        self.llm_service.set_history_window(self.history_window, self.pinned_turns)
+
         last_progress = 30  # 初始進度
         per_progress = 37 / len(content_list)  # 37%分配給翻譯
         for index, item in enumerate(content_list):
+            notifier.settle_until(index)  # 逐段翻譯時，先前的段落皆已確定
             ProgressManager.progress_update(last_progress + per_progress * index, f"翻譯中: 正在翻譯第 {index+1}/{len(content_list)} 個段落", "translating-json")
-            if item.get('translation_metadata', {}) != {}:
-                continue
-            if not (item.get('type') == 'text' and item.get('text')):
+            if not self._needs_translation(item):
                 continue
 
+            # 每翻譯10個段落額外暫停，避免請求過於頻繁
             if translated_count != 0 and translated_count % 10 == 0:
-                start_time = time.time()
-                logger.info(f"第 {index//10} 個檢查點，正在保存翻譯進度...")
-                ProgressManager.progress_update(last_progress + per_progress * index, f"儲存中: 正在保存翻譯進度...", "translating-json")
-                self._save_translated_progress(content_list, file_name)
-                end_time = time.time()
+                time.sleep(buffer_time*5)
 
-                batch_sleep = buffer_time*5 - (end_time - start_time)
-                if batch_sleep > 0:
-                    time.sleep(batch_sleep)
-
-            # 判斷內容類型
-            content_type = self._classify_content_type(item)
+            content_type = content_types[index]
 
             # 翻譯文本
             original_text = item.get('text', '')
-            if not original_text:
-                logger.warning(f"空文本，跳過段落: {original_text}")
-                continue
-
             translated_text = self.translate_single_text(
                 text=original_text,
                 content_type=content_type,
@@ -286,13 +881,9 @@ class Translator():
 
             translated_count += 1
 
-            # 保存翻譯結果
-            item['text_zh'] = translated_text
-            item['translation_metadata'] = {
-                'model': self.llm_service.model_name,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'content_type': content_type
-            }
+            # 保存翻譯結果 (每個段落皆附加至進度日誌)
+            self._apply_translation(item, translated_text, content_type)
+            journal.append(index)
             
             if self.verbose:
                 logger.info(f"   原文: {original_text[:50]}...")
@@ -301,100 +892,218 @@ class Translator():
             # 避免請求過於頻繁
             time.sleep(buffer_time)
 
-        # 結束多輪對話
-        self.send_translate_request("", end_chat=True)
+        notifier.settle_until(len(content_list))
+        return translated_count
 
-        # 保存翻譯結果
-        output_path = os.path.join(os.path.dirname(self.progress_path), f"{file_name}_translated.json")
-        
-        # 確保輸出目錄存在
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(content_list, f, ensure_ascii=False, indent=2)
+    def _translate_concurrently(self, 
+            content_list: List[Dict], 
+            content_types: List[Optional[str]], 
+            journal: ProgressJournal, 
+            target_lang: str, 
+            max_workers: int,
+            notifier: _OrderedNotifier,
+            token_budget: int = 0,
+            glossary: Optional[DocumentGlossary] = None,
+            file_name: Optional[str] = None
+        ) -> int:
+        """
+        以固定大小的工作池並行翻譯段落 (獨立請求，不使用多輪對話)
 
-        logger.info("翻譯完成！")
-        logger.info(f"翻譯結果已保存: {output_path}")
-        logger.info(f"共翻譯 {translated_count} 個段落")
+        每個請求另需取得自適應併發控制器的配額，實際同時送出的請求數量不超過控制器當前的上限。
 
-        self._clear_translated_progress(file_name)
-        
-        return str(output_path)
+        token_budget 大於0時，連續的段落會在Token上限內合併為單次請求翻譯；提供術語表時，段落中出現的術語會附加於每個請求中。
+        工作單位預設依文件順序送出，閱讀介面請求的頁面 (`request_pages`) 會優先翻譯。
+        翻譯結果依段落索引寫回，保持文件順序；每個段落完成後即附加至進度日誌。
 
-    def _classify_content_type(self, item: Dict) -> str:
-        """分類內容類型"""
-        text = item.get('text', '').lower()
-        text_level = item.get('text_level', -1)
-        
-        # 摘要判斷
-        if 'abstract' in text:
-            return 'abstract'
+        Returns:
+            int: 成功翻譯的段落數量
+        """
+        pending_indices = [index for index, item in enumerate(content_list) if self._needs_translation(item)]
+        queued = set(pending_indices)
+        for index in range(len(content_list)):
+            if index not in queued:
+                notifier.settle(index)  # 無需翻譯的段落直接確定
 
-        # 參考文獻區域判斷
-        if 'reference' in text:
-            self.is_reference = True
+        if token_budget > 0:
+            units = self._build_batches(content_list, pending_indices, token_budget)
+        else:
+            units = [[index] for index in pending_indices]
+        scheduler = PageScheduler(content_list, units)
+        with self._jobs_lock:
+            if file_name in self._active_jobs:
+                self._active_jobs[file_name]["scheduler"] = scheduler
+                requested = self._page_requests.pop(file_name, None)
+                if requested:
+                    scheduler.request_pages(requested)
 
-        # 參考文獻判斷
-        if self.is_reference and any(ref in text for ref in ['[', 'doi:', 'http://', 'https://', '@']):
-            return 'reference'
-        
-        # 標題判斷
-        if text_level == 1:
-            return 'title'
-        
-        # 默認為正文
-        return 'body'
+        total = len(content_list)
+        finished = total - len(pending_indices)
+        translated_count = 0
+
+        last_progress = 30  # 初始進度
+        per_progress = 37 / total  # 37%分配給翻譯
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translator") as executor:
+            running: Dict[Future, List[int]] = {}
+            while len(scheduler) or running:
+                # 補滿工作池 (請求的頁面優先)
+                while len(running) < max_workers:
+                    indices = scheduler.pop()
+                    if not indices:
+                        break
+                    future = executor.submit(self._translate_unit, content_list, content_types, indices, target_lang, glossary)
+                    running[future] = indices
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    indices = running.pop(future)
+                    try:
+                        translated_texts = future.result()
+                    except Exception as e:
+                        logger.error(f"翻譯段落 {indices[0]+1}~{indices[-1]+1} 時出錯: {e}")
+                        translated_texts = [""] * len(indices)
+
+                    for index, translated_text in zip(indices, translated_texts):
+                        item = content_list[index]
+                        finished += 1
+
+                        if translated_text == "":
+                            logger.error(f"翻譯失敗，跳過段落: {item.get('text', '')}")
+                            scheduler.mark_failed(index)
+                            notifier.settle(index)
+                            continue
+
+                        self._apply_translation(item, translated_text, content_types[index])
+                        journal.append(index)
+                        notifier.settle(index)
+                        translated_count += 1
+                        if self.verbose:
+                            logger.info(f"翻譯進度: {finished}/{total} - 第{item.get('page_idx', 0)+1}頁")
 
-    def _save_translated_progress(self, progress_data: list, file_name: str) -> str:
+                ProgressManager.progress_update(last_progress + per_progress * finished, f"翻譯中: 已完成 {finished}/{total} 個段落", "translating-json")
+
+        return translated_count
+
+    def _build_batches(self, content_list: List[Dict], indices: List[int], token_budget: int) -> List[List[int]]:
         """
-        保存翻譯進度到本地文件
-        
+        將待翻譯段落依文件順序合併為批次 (每批次的估算Token數不超過上限)
+
         Args:
-            progress_data: 包含翻譯進度的list數據
-            file_name: 輸出檔案名稱
+            content_list: 內容列表
+            indices: 待翻譯段落的索引 (依文件順序)
+            token_budget: 每批次的Token上限 (超過上限的單一段落獨立成批)
 
         Returns:
-            str: 輸出檔案的路徑
+            List[List[int]]: 批次列表
         """
-        output_path = os.path.join(self.progress_path, f"{file_name}_progress.json")
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for index in indices:
+            tokens = estimate_tokens(content_list[index].get('text', ''))
+            if current and (current_tokens + tokens > token_budget or len(current) >= self.batch_max_items):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
 
-        # 確保進度目錄存在
-        os.makedirs(self.progress_path, exist_ok=True)
+        if self.verbose:
+            logger.info(f"合併翻譯: {len(indices)} 個段落合併為 {len(batches)} 個請求")
+        return batches
 
-        # 🔧 修正：創建包含進度信息的新結構，不修改原始數據
-        progress_info = {
-            "content_list": progress_data,  # 原始翻譯數據
-            "save_time": time.strftime('%Y-%m-%d %H:%M:%S'),
-            "translator_type": self.llm_service.model_name
-        }
+    def _translate_unit(self, 
+            content_list: List[Dict], 
+            content_types: List[Optional[str]], 
+            indices: List[int], 
+            target_lang: str,
+            glossary: Optional[DocumentGlossary] = None
+        ) -> List[str]:
+        """
+        翻譯一個工作單位 (單一段落或合併批次)，批次翻譯失敗時退回逐段獨立翻譯
 
-        try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(progress_info, f, ensure_ascii=False, indent=2)
-            return output_path
-        except Exception as e:
-            logger.error(f"保存翻譯進度時出錯: {e}")
-            return ""
+        Returns:
+            List[str]: 與 indices 順序相同的譯文列表 (翻譯失敗的段落為空字串)
+        """
+        if len(indices) == 1:
+            index = indices[0]
+            return [self.translate_single_text(
+                text=content_list[index].get('text', ''),
+                target_lang=target_lang,
+                content_type=content_types[index],
+                stateless=True,
+                glossary=glossary
+            )]
+
+        # 先使用翻譯記憶庫中的譯文，僅合併翻譯未命中的段落
+        results = {index: self._recall(content_list[index].get('text', ''), target_lang, content_types[index]) for index in indices}
+        misses = [index for index in indices if results[index] is None]
+
+        if len(misses) > 1:
+            translations = self.translate_batch(
+                texts=[content_list[index].get('text', '') for index in misses],
+                content_types=[content_types[index] for index in misses],
+                target_lang=target_lang,
+                glossary=glossary
+            )
+            if translations is not None:
+                for index, translation in zip(misses, translations):
+                    results[index] = translation
+                    self._remember(content_list[index].get('text', ''), target_lang, content_types[index], translation)
+                misses = []
+            else:
+                logger.warning(f"批次翻譯失敗，改為逐段翻譯 {len(misses)} 個段落")
 
-    def _load_translated_progress(self, file_name: str) -> Optional[dict]:
+        for index in misses:
+            text = content_list[index].get('text', '')
+            results[index] = self._request_translation(text, target_lang, content_types[index], max_retries=3, stateless=True, glossary=glossary)
+            self._remember(text, target_lang, content_types[index], results[index])
+
+        return [results[index] for index in indices]
+
+    def _classify_content_list(self, content_list: List[Dict]) -> List[Optional[str]]:
         """
-        從本地文件加載翻譯進度
+        依文件順序分類所有文字段落的內容類型
 
         Args:
-            file_name: 原始文件名
+            content_list: 內容列表
 
         Returns:
-            包含翻譯進度的字典數據，或None如果加載失敗
+            List[Optional[str]]: 與內容列表等長的內容類型 (非文字段落為None)
         """
-        input_path = os.path.join(self.progress_path, f"{file_name}_progress.json")
+        # 參考文獻區域以區域變數記錄 (多個文件可能同時分類，不可存放在共用的翻譯器上)
+        in_references = False
+        content_types: List[Optional[str]] = []
+        for item in content_list:
+            if item.get('type') != 'text' or not item.get('text'):
+                content_types.append(None)
+                continue
+            text = item['text'].lower()
+            # 參考文獻區域判斷
+            if 'abstract' not in text and 'reference' in text:
+                in_references = True
+            content_types.append(self._classify_content_type(item, in_references))
+        return content_types
 
-        try:
-            with open(input_path, "r", encoding="utf-8") as f:
-                progress_info = json.load(f)
-            return progress_info
-        except Exception as e:
-            logger.error(f"加載翻譯進度時出錯: {e}")
-            return None
+    def _classify_content_type(self, item: Dict, in_references: bool = False) -> str:
+        """分類內容類型 (in_references 表示段落位於參考文獻區域)"""
+        text = item.get('text', '').lower()
+        text_level = item.get('text_level', -1)
+        
+        # 摘要判斷
+        if 'abstract' in text:
+            return 'abstract'
+
+        # 參考文獻判斷
+        if in_references and any(ref in text for ref in ['[', 'doi:', 'http://', 'https://', '@']):
+            return 'reference'
+        
+        # 標題判斷
+        if text_level == 1:
+            return 'title'
+        
+        # 默認為正文
+        return 'body'
 
     def _check_translated_progress(self, content_list: list) -> int:
         """
@@ -419,7 +1128,7 @@ class Translator():
 
     def _clear_translated_progress(self, file_name: str) -> bool:
         """
-        清除翻譯進度檔案
+        清除翻譯進度檔案 (基底快照、附加紀錄及術語表)
 
         Args:
             file_name: 原始文件名
@@ -427,15 +1136,15 @@ class Translator():
         Returns:
             是否成功清除翻譯進度
         """
-        progress_path = os.path.join(self.progress_path, f"{file_name}_progress.json")
+        journal = self._create_journal(file_name)
 
         try:
-            if os.path.exists(progress_path):
-                os.remove(progress_path)
-                logger.info(f"成功清除翻譯進度檔案: {progress_path}")
+            DocumentGlossary(self.progress_path, file_name).clear()
+            if journal.clear():
+                logger.info(f"成功清除翻譯進度檔案: {journal.snapshot_path}")
             else:
-                logger.warning(f"翻譯進度檔案不存在: {progress_path}")
+                logger.warning(f"翻譯進度檔案不存在: {journal.snapshot_path}")
             return True
         except Exception as e:
             logger.error(f"清除翻譯進度時出錯: {e}")
-            return False
\ No newline at end of file
+            return False
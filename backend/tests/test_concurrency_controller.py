@@ -0,0 +1,145 @@
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# 確保測試環境使用 UTF-8 編碼（與 Electron 環境一致）
+os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
+
+def find_project_root(max_attempts: int = 5) -> Path:
+    current_dir = Path(__file__).resolve().parent
+    attempts = 0
+    while attempts < max_attempts:
+        backend_path = current_dir / 'backend'
+        frontend_path = current_dir / 'frontend'
+        if backend_path.is_dir() and frontend_path.is_dir():
+            return current_dir
+        if current_dir.parent == current_dir:
+            break
+        current_dir = current_dir.parent
+        attempts += 1
+    raise FileNotFoundError("找不到包含 'backend' 和 'frontend' 目錄的專案根目錄")
+
+project_root = find_project_root()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from backend.services.llm_service import concurrency_controller
+from backend.services.llm_service.concurrency_controller import AdaptiveConcurrencyController
+
+class FakeClock:
+    """取代 time 模組的假時鐘 (只提供 monotonic)，由測試手動推進時間"""
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+@contextmanager
+def fake_clock():
+    clock = FakeClock()
+    original = concurrency_controller.time
+    concurrency_controller.time = clock
+    try:
+        yield clock
+    finally:
+        concurrency_controller.time = original
+
+def succeed(controller: AdaptiveConcurrencyController, count: int, latency: float = 0.1):
+    for _ in range(count):
+        controller.acquire()
+        controller.release(success=True, latency=latency)
+
+def test_additive_increase():
+    print("📝 測試: 一輪成功請求後併發上限加1")
+    with fake_clock():
+        controller = AdaptiveConcurrencyController(initial_limit=4, max_limit=16)
+        succeed(controller, 4)      # 一輪 = 目前上限次數的成功請求
+        assert 4.9 < controller.limit < 5.0, f"一輪後上限應約為5，實際 {controller.limit:.3f}"
+        succeed(controller, 5)
+        assert 5.8 < controller.limit < 6.0, f"兩輪後上限應約為6，實際 {controller.limit:.3f}"
+        assert int(controller.limit) == controller.snapshot()["window"]
+        print(f"✅ 併發上限: {controller.limit:.2f}")
+
+def test_no_increase_when_latency_rises():
+    print("📝 測試: 延遲超過基準的容許倍數時不增加上限")
+    with fake_clock():
+        controller = AdaptiveConcurrencyController(initial_limit=4, latency_tolerance=2.0)
+        succeed(controller, 5, latency=0.1)     # 建立基準延遲
+        limit = controller.limit
+        succeed(controller, 3, latency=1.0)
+        assert controller.limit == limit, f"排隊時上限不應增加: {limit:.3f} → {controller.limit:.3f}"
+        controller.acquire()
+        controller.release(success=False)
+        assert controller.limit == limit, "失敗的請求不應增加上限"
+        print(f"✅ 併發上限維持 {controller.limit:.2f}")
+
+def test_multiplicative_decrease_with_cooldown():
+    print("📝 測試: 壅塞時上限減半，冷卻時間內只減少一次")
+    with fake_clock() as clock:
+        controller = AdaptiveConcurrencyController(initial_limit=8, decrease_factor=0.5, decrease_cooldown=2.0)
+        controller.on_congestion()
+        assert controller.limit == 4.0, f"第一次壅塞後上限應為4，實際 {controller.limit}"
+        clock.advance(1.0)
+        controller.on_congestion()      # 同一波限流回應
+        assert controller.limit == 4.0, f"冷卻時間內不應再次減少，實際 {controller.limit}"
+        clock.advance(1.5)
+        controller.on_congestion()
+        assert controller.limit == 2.0, f"冷卻時間後應再次減半，實際 {controller.limit}"
+        snapshot = controller.snapshot()
+        assert snapshot["congestion_count"] == 3 and snapshot["decrease_count"] == 2
+        print("✅ 併發上限: 8 → 4 → 4 → 2")
+
+def test_retry_after_blocks_slot():
+    print("📝 測試: Retry-After 期間暫停發出新請求")
+    with fake_clock() as clock:
+        controller = AdaptiveConcurrencyController(initial_limit=4)
+        controller.on_congestion(retry_after=30)
+        assert controller.snapshot()["blocked_seconds"] == 30
+
+        acquired = threading.Event()
+        def request():
+            with controller.slot():
+                acquired.set()
+        worker = threading.Thread(target=request, daemon=True)
+        worker.start()
+        assert not acquired.wait(0.3), "Retry-After 期間不應取得併發配額"
+
+        clock.advance(31)
+        with controller._condition:
+            controller._condition.notify_all()  # 喚醒依真實時間等待的執行緒，以推進後的假時鐘重新判斷
+        assert acquired.wait(2), "Retry-After 結束後應取得併發配額"
+        worker.join(2)
+        assert controller.in_flight == 0
+        print("✅ Retry-After 結束後恢復發出請求")
+
+def test_limit_stays_within_bounds():
+    print("📝 測試: 併發上限維持在 [min_limit, max_limit] 範圍內")
+    with fake_clock() as clock:
+        controller = AdaptiveConcurrencyController(initial_limit=3, min_limit=2, max_limit=6)
+        for _ in range(10):
+            clock.advance(5)
+            controller.on_congestion()
+            assert controller.limit >= controller.min_limit
+        assert controller.limit == 2.0, f"上限應停在 min_limit，實際 {controller.limit}"
+        succeed(controller, 200)
+        assert controller.limit == 6.0, f"上限應停在 max_limit，實際 {controller.limit}"
+
+        clamped = AdaptiveConcurrencyController(initial_limit=50, min_limit=2, max_limit=6)
+        assert clamped.limit == 6.0, f"初始上限應限制在 max_limit，實際 {clamped.limit}"
+        print(f"✅ 併發上限範圍: [{controller.min_limit}, {controller.max_limit}]")
+
+def main():
+    test_additive_increase()
+    test_no_increase_when_latency_rises()
+    test_multiplicative_decrease_with_cooldown()
+    test_retry_after_blocks_slot()
+    test_limit_stays_within_bounds()
+    print("\n✅ 自適應併發控制測試全部通過")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import sys
+from pathlib import Path
+
+# 確保測試環境使用 UTF-8 編碼（與 Electron 環境一致）
+os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
+
+def find_project_root(max_attempts: int = 5) -> Path:
+    current_dir = Path(__file__).resolve().parent
+    attempts = 0
+    while attempts < max_attempts:
+        backend_path = current_dir / 'backend'
+        frontend_path = current_dir / 'frontend'
+        if backend_path.is_dir() and frontend_path.is_dir():
+            return current_dir
+        if current_dir.parent == current_dir:
+            break
+        current_dir = current_dir.parent
+        attempts += 1
+    raise FileNotFoundError("找不到包含 'backend' 和 'frontend' 目錄的專案根目錄")
+
+project_root = find_project_root()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from backend.services.translation_service import ContentFilter
+
+# (段落原文, 預期的略過原因；None 表示需要送出翻譯)
+SKIPPED_CASES = [
+    ("12", "page_number"),
+    ("- 7 -", "page_number"),
+    ("Page 3 of 10", "page_number"),
+    ("https://github.com/opendatalab/MinerU", "identifier"),
+    ("doi:10.1109/TCE.2023.1234567", "identifier"),
+    ("https://doi.org/10.1038/nature14539", "identifier"),
+    ("arXiv:1412.6980v9", "identifier"),
+    ("author@example.edu", "identifier"),
+    ("$$E = mc^2$$", "math"),
+    ("$\\mathcal{L}(\\theta) = \\sum_i \\log p(x_i)$ (3)", "math"),
+    ("0.912 0.887 0.905 0.931", "symbolic"),
+    ("± 0.03 | 12.5 | 45%", "symbolic"),
+    ("本研究提出一種新的認知無線電頻譜分配方法。", "target_language"),
+]
+
+TRANSLATED_CASES = [
+    "1 Introduction",
+    "1. Introduction",
+    "Fig. 3",
+    "Table 2: Results on ImageNet",
+    "Machine learning algorithms enable autonomous decision-making in cognitive radio networks.",
+    "where $x$ denotes the input feature vector of the model",
+    "ResNet-50 achieves 76.1% top-1 accuracy.",
+    "本文提出了一种新方法",                       # 簡體中文仍需轉換為繁體
+    "本研究提出一种新的认知无线电频谱分配方法。",
+]
+
+def test_skipped_paragraphs():
+    print("📝 測試: 不需翻譯的段落")
+    content_filter = ContentFilter()
+    failures = []
+    for text, expected in SKIPPED_CASES:
+        reason = content_filter.classify(text)
+        passed = reason == expected
+        print(f"{'✅' if passed else '❌'} {text!r} → {reason}")
+        if not passed:
+            failures.append(f"{text!r}: 預期 {expected}，實際 {reason}")
+    assert not failures, "\n".join(failures)
+
+def test_translated_paragraphs():
+    print("📝 測試: 需要送出翻譯的段落")
+    content_filter = ContentFilter()
+    failures = []
+    for text in TRANSLATED_CASES:
+        reason = content_filter.classify(text)
+        passed = reason is None
+        print(f"{'✅' if passed else '❌'} {text!r} → {reason}")
+        if not passed:
+            failures.append(f"{text!r}: 不應略過，實際 {reason}")
+    assert not failures, "\n".join(failures)
+
+def test_chinese_source_not_skipped():
+    print("📝 測試: 來源語言為中文時不以目標語言略過 (仍需簡轉繁)")
+    reason = ContentFilter().classify("本研究提出一种新的认知无线电频谱分配方法。", source_lang="ch")
+    assert reason is None, f"不應略過，實際 {reason}"
+    print("✅ 中文來源段落送出翻譯")
+
+def main():
+    test_skipped_paragraphs()
+    test_translated_paragraphs()
+    test_chinese_source_not_skipped()
+    print("\n✅ 內容過濾測試全部通過")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# 確保測試環境使用 UTF-8 編碼（與 Electron 環境一致）
+os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
+
+def find_project_root(max_attempts: int = 5) -> Path:
+    current_dir = Path(__file__).resolve().parent
+    attempts = 0
+    while attempts < max_attempts:
+        backend_path = current_dir / 'backend'
+        frontend_path = current_dir / 'frontend'
+        if backend_path.is_dir() and frontend_path.is_dir():
+            return current_dir
+        if current_dir.parent == current_dir:
+            break
+        current_dir = current_dir.parent
+        attempts += 1
+    raise FileNotFoundError("找不到包含 'backend' 和 'frontend' 目錄的專案根目錄")
+
+project_root = find_project_root()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from backend.api import Config, DocumentRegistry
+from backend.api.pdf_helper import PDFHelper
+from backend.services.rag_service.document_processor import DocumentChunk
+
+def write_pdf(pdf_dir: str, name: str, content: bytes) -> str:
+    pdf_path = os.path.join(pdf_dir, name + ".pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(content)
+    stat = os.stat(pdf_path)
+    os.utime(pdf_path, (stat.st_atime, time.time() + len(content)))  # 確保覆蓋後修改時間不同
+    return pdf_path
+
+def make_registry(temp_dir: str):
+    changes = []
+    registry = DocumentRegistry(temp_dir, on_canonical_change=lambda old, new: changes.append((old, new)))
+    return registry, changes
+
+def test_overwrite_canonical_with_new_content():
+    print("📝 測試: 正式名稱以不同內容重新上傳後，舊內容不再解析至該名稱")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry, changes = make_registry(temp_dir)
+        registry.register("paper-a", write_pdf(temp_dir, "paper-a", b"%PDF-X"))
+        registry.register("paper-a", write_pdf(temp_dir, "paper-a", b"%PDF-YY"))
+        assert changes == [("paper-a", None)], f"舊內容已無別名，應刪除處理結果: {changes}"
+
+        canonical = registry.register("paper-b", write_pdf(temp_dir, "paper-b", b"%PDF-X"))
+        assert canonical == "paper-b", f"舊內容不應解析至已覆蓋的 paper-a，實際 {canonical}"
+        assert registry.resolve("paper-a") == "paper-a"
+        assert registry.stats()["documents"] == 2
+        print(f"✅ paper-b → {canonical}")
+
+def test_overwrite_canonical_hands_over_to_alias():
+    print("📝 測試: 正式名稱以不同內容重新上傳後，由別名接替舊內容")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry, changes = make_registry(temp_dir)
+        registry.register("paper-a", write_pdf(temp_dir, "paper-a", b"%PDF-X"))
+        assert registry.register("paper-b", write_pdf(temp_dir, "paper-b", b"%PDF-X")) == "paper-a"
+
+        assert registry.register("paper-a", write_pdf(temp_dir, "paper-a", b"%PDF-YY")) == "paper-a"
+        assert changes == [("paper-a", "paper-b")], f"應由 paper-b 接替: {changes}"
+        assert registry.register("paper-b", os.path.join(temp_dir, "paper-b.pdf")) == "paper-b"
+        assert registry.get_content_hash("paper-a") != registry.get_content_hash("paper-b")
+        print(f"✅ 正式名稱變更: {changes}")
+
+def test_unregister_canonical_promotes_alias():
+    print("📝 測試: 移除仍有別名的正式名稱時，由最早登記的別名接替")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        registry, changes = make_registry(temp_dir)
+        for name in ("paper-a", "paper-b", "paper-c"):
+            registry.register(name, write_pdf(temp_dir, name, b"%PDF-X"))
+
+        canonical, remaining = registry.unregister("paper-a")
+        assert canonical == "paper-a" and remaining == ["paper-b", "paper-c"], f"{canonical}, {remaining}"
+        assert changes == [("paper-a", "paper-b")], f"應由 paper-b 接替: {changes}"
+        assert registry.resolve("paper-c") == "paper-b"
+        assert registry.resolve("paper-a") == "paper-a", "已移除的檔名不應再解析至其他文件"
+
+        canonical, remaining = registry.unregister("paper-c")
+        assert canonical == "paper-b" and remaining == ["paper-b"]
+        assert len(changes) == 1, "移除別名不應變更正式名稱"
+        print(f"✅ paper-c → {registry.resolve('paper-b')}")
+
+def test_remove_canonical_with_alias():
+    print("📝 測試: 從系統移除正式名稱後，處理結果由別名接替")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_helper = PDFHelper(config=Config(instance_path=temp_dir), verbose=False)
+        pdf_dir = os.path.join(temp_dir, "pdfs")
+        os.makedirs(pdf_dir, exist_ok=True)
+        for name in ("paper-a", "paper-b"):
+            write_pdf(pdf_dir, name, b"%PDF-X")
+            assert pdf_helper._resolve_document_name(name + ".pdf") == "paper-a"
+
+        # 以正式名稱保存的處理結果
+        mineru_dir = os.path.join(temp_dir, "mineru_outputs", "paper-a", "auto")
+        os.makedirs(mineru_dir, exist_ok=True)
+        Path(mineru_dir, "paper-a_content_list.json").write_text("[]", encoding="utf-8")
+        Path(temp_dir, "translated_files").mkdir(exist_ok=True)
+        Path(temp_dir, "translated_files", "paper-a_translated.json").write_text("[]", encoding="utf-8")
+        chunks = [DocumentChunk(content="測試片段", document_name="paper-a", page_num=1, chunk_index=0, content_type="body")]
+        pdf_helper.rag_engine.vector_store.add_chunks(chunks, [[0.1, 0.2, 0.3]], collection_name="paper-a")
+
+        result = pdf_helper.remove_file_from_system("paper-a.pdf")
+        assert result.success and result.data["canonical_name"] == "paper-b", result.message
+
+        assert not os.path.exists(os.path.join(pdf_dir, "paper-a.pdf")), "已移除檔案的PDF應刪除"
+        assert os.path.exists(os.path.join(pdf_dir, "paper-b.pdf"))
+        assert os.path.exists(os.path.join(temp_dir, "mineru_outputs", "paper-b", "auto", "paper-b_content_list.json"))
+        assert os.path.exists(os.path.join(temp_dir, "translated_files", "paper-b_translated.json"))
+        assert not os.path.exists(os.path.join(temp_dir, "mineru_outputs", "paper-a"))
+
+        vector_store = pdf_helper.rag_engine.vector_store
+        assert not vector_store.has_collection("paper-a")
+        assert all(chunk_id.startswith("paper-b_chunk_") for chunk_id in vector_store.get_chunk_ids("paper-b"))
+
+        status = pdf_helper._check_progress_status("paper-b", "auto")
+        assert status.data["stage"] == 4, f"接替後應維持已加入RAG的階段，實際 {status.data}"
+
+        # 重新以原檔名上傳相同內容時成為別名，不會重新處理
+        write_pdf(pdf_dir, "paper-a", b"%PDF-X")
+        assert pdf_helper._resolve_document_name("paper-a") == "paper-b"
+        print(f"✅ 處理結果由 {result.data['canonical_name']} 接替")
+
+def main():
+    test_overwrite_canonical_with_new_content()
+    test_overwrite_canonical_hands_over_to_alias()
+    test_unregister_canonical_promotes_alias()
+    test_remove_canonical_with_alias()
+    print("\n✅ 文件登錄表測試全部通過")
+
+if __name__ == "__main__":
+    main()
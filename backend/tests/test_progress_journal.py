@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# 確保測試環境使用 UTF-8 編碼（與 Electron 環境一致）
+os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
+
+def find_project_root(max_attempts: int = 5) -> Path:
+    current_dir = Path(__file__).resolve().parent
+    attempts = 0
+    while attempts < max_attempts:
+        backend_path = current_dir / 'backend'
+        frontend_path = current_dir / 'frontend'
+        if backend_path.is_dir() and frontend_path.is_dir():
+            return current_dir
+        if current_dir.parent == current_dir:
+            break
+        current_dir = current_dir.parent
+        attempts += 1
+    raise FileNotFoundError("找不到包含 'backend' 和 'frontend' 目錄的專案根目錄")
+
+project_root = find_project_root()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from backend.services.translation_service.progress_journal import ProgressJournal
+
+def make_content_list(count: int = 6):
+    return [{"type": "text", "text": f"Paragraph {index}.", "page_idx": 0} for index in range(count)]
+
+def translate(journal: ProgressJournal, content_list, index: int):
+    content_list[index]["text_zh"] = f"段落 {index}。"
+    content_list[index]["translation_metadata"] = {"model": "test-model", "content_type": "body"}
+    journal.append(index)
+
+def translated_indices(content_list):
+    return {index for index, item in enumerate(content_list) if item.get("translation_metadata") is not None}
+
+def test_load_skips_torn_last_line():
+    print("📝 測試: 最後一行寫入途中中斷時，載入結果只包含完整的紀錄")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        content_list = make_content_list()
+        journal = ProgressJournal(temp_dir, "doc", fsync_batch=1, compact_threshold=0)
+        journal.start(content_list, "test-model")
+        for index in (0, 2, 3):
+            translate(journal, content_list, index)
+        journal.close()
+
+        # 模擬寫入途中中斷: 截斷最後一行
+        with open(journal.journal_path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.truncate(size - 10)
+
+        restored = ProgressJournal(temp_dir, "doc")
+        loaded = restored.load("test-model")
+        assert loaded is not None, "載入翻譯進度失敗"
+        assert translated_indices(loaded) == {0, 2}, f"已翻譯段落不符: {translated_indices(loaded)}"
+        assert loaded[2]["text_zh"] == "段落 2。"
+        assert not os.path.exists(restored.journal_path), "載入到損毀的紀錄後應重寫快照並清空附加紀錄"
+
+        # 恢復後繼續附加的紀錄不會接在不完整的行之後
+        translate(restored, loaded, 3)
+        restored.close()
+        reloaded = ProgressJournal(temp_dir, "doc").load("test-model")
+        assert translated_indices(reloaded) == {0, 2, 3}, f"恢復後的紀錄不符: {translated_indices(reloaded)}"
+        print(f"✅ 已翻譯段落: {sorted(translated_indices(reloaded))}")
+
+def test_compact_preserves_content():
+    print("📝 測試: 壓縮後基底快照保留所有譯文且清空附加紀錄")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        content_list = make_content_list()
+        journal = ProgressJournal(temp_dir, "doc", compact_threshold=3)
+        journal.start(content_list, "test-model")
+        for index in (1, 4, 5):
+            translate(journal, content_list, index)     # 第3筆觸發壓縮
+        assert not os.path.exists(journal.journal_path), "超過上限後應清空附加紀錄"
+        translate(journal, content_list, 0)
+        journal.compact()
+
+        with open(journal.snapshot_path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        assert snapshot["translator_type"] == "test-model"
+        assert snapshot["content_list"] == content_list, "壓縮後的快照與內容列表不符"
+
+        loaded = ProgressJournal(temp_dir, "doc").load("test-model")
+        assert loaded == content_list, "重新載入的內容列表不符"
+        assert translated_indices(loaded) == {0, 1, 4, 5}
+        print(f"✅ 已翻譯段落: {sorted(translated_indices(loaded))}")
+
+def test_clear():
+    print("📝 測試: 清除進度檔案")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        content_list = make_content_list()
+        journal = ProgressJournal(temp_dir, "doc", compact_threshold=0)
+        journal.start(content_list, "test-model")
+        translate(journal, content_list, 0)
+        assert journal.clear() is True
+        assert not journal.exists() and not os.path.exists(journal.journal_path)
+        assert journal.clear() is False
+        print("✅ 進度檔案已清除")
+
+def main():
+    test_load_skips_torn_last_line()
+    test_compact_preserves_content()
+    test_clear()
+    print("\n✅ 翻譯進度日誌測試全部通過")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+import sys
+from pathlib import Path
+
+# 確保測試環境使用 UTF-8 編碼（與 Electron 環境一致）
+os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
+
+def find_project_root(max_attempts: int = 5) -> Path:
+    current_dir = Path(__file__).resolve().parent
+    attempts = 0
+    while attempts < max_attempts:
+        backend_path = current_dir / 'backend'
+        frontend_path = current_dir / 'frontend'
+        if backend_path.is_dir() and frontend_path.is_dir():
+            return current_dir
+        if current_dir.parent == current_dir:
+            break
+        current_dir = current_dir.parent
+        attempts += 1
+    raise FileNotFoundError("找不到包含 'backend' 和 'frontend' 目錄的專案根目錄")
+
+project_root = find_project_root()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from backend.services.translation_service import ReferenceParser
+
+# (格式, 條目原文, 預期標題；None 表示無法確定標題，改為翻譯整個條目)
+REFERENCE_CASES = [
+    ("IEEE", '[1] A. Vaswani, N. Shazeer, and N. Parmar, “Attention is all you need,” in Proc. NeurIPS, 2017, pp. 5998–6008.',
+     "Attention is all you need"),
+    ("IEEE", '[2] K. He, X. Zhang, S. Ren, and J. Sun, "Deep residual learning for image recognition," in Proc. IEEE CVPR, 2016.',
+     "Deep residual learning for image recognition"),
+    ("APA", 'He, K., Zhang, X., Ren, S., & Sun, J. (2016). Deep residual learning for image recognition. In Proceedings of the IEEE CVPR (pp. 770-778).',
+     "Deep residual learning for image recognition"),
+    ("APA", 'Kingma, D. P., & Ba, J. (2015). Adam: A method for stochastic optimization. ICLR.',
+     "Adam: A method for stochastic optimization"),
+    ("Vancouver", '12. Smith J, Doe A. A survey of graph neural networks. Nature Reviews. 2020;12(3):45-67. doi:10.1038/xyz',
+     "A survey of graph neural networks"),
+    ("ACM", '[3] Jacob Devlin, Ming-Wei Chang, Kenton Lee, and Kristina Toutanova. 2019. BERT: Pre-training of deep bidirectional transformers for language understanding. In NAACL-HLT. 4171–4186.',
+     "BERT: Pre-training of deep bidirectional transformers for language understanding"),
+    ("ACM", '[5] Y. LeCun, Y. Bengio, and G. Hinton. Deep learning. Nature, 521(7553):436–444, 2015.',
+     "Deep learning"),
+    ("Springer (無法解析)", 'Kingma, D.P., Ba, J.: Adam: A method for stochastic optimization. arXiv preprint arXiv:1412.6980 (2014)',
+     None),
+    ("網址 (無法解析)", '[6] https://github.com/foo/bar',
+     None),
+]
+
+def test_parse_titles():
+    print("📝 測試: 各格式參考文獻的標題解析")
+    parser = ReferenceParser()
+    failures = []
+    for style, text, expected in REFERENCE_CASES:
+        reference = parser.parse(text)
+        title = reference.title if reference is not None else None
+        passed = title == expected
+        print(f"{'✅' if passed else '❌'} [{style}] {title!r}")
+        if not passed:
+            failures.append(f"[{style}] 預期 {expected!r}，實際 {title!r}: {text}")
+    assert not failures, "\n".join(failures)
+
+def test_reassemble_round_trip():
+    print("📝 測試: 標題譯文組回條目 (其餘部分保持原文)")
+    parser = ReferenceParser()
+    for style, text, expected in REFERENCE_CASES:
+        if expected is None:
+            continue
+        reference = parser.parse(text)
+        # 以原標題組回時條目完全不變
+        assert reference.reassemble(reference.title) == text, f"[{style}] 以原標題組回後條目改變"
+        # 以譯文組回時只有標題改變
+        translated = reference.reassemble("翻譯後的標題")
+        prefix, suffix = text[:reference.title_start], text[reference.title_end:]
+        assert translated == prefix + "翻譯後的標題" + suffix, f"[{style}] 組回的條目不符: {translated}"
+        print(f"✅ [{style}] {translated}")
+
+def main():
+    test_parse_titles()
+    test_reassemble_round_trip()
+    print("\n✅ 參考文獻解析測試全部通過")
+
+if __name__ == "__main__":
+    main()
@@ -25,10 +25,11 @@ if str(project_root) not in sys.path:
 instance_path = os.path.join(str(project_root), "backend", "instance")
 
 import argparse
+import tempfile
 import time
 import json
 
-from backend.services.translation_service import Translator
+from backend.services.translation_service import Translator, ReferenceParser
 import backend.services.llm_service as llm_services
 
 def test_single_sentence(translator):
@@ -119,25 +120,101 @@ def test_full_document(translator):
     print(f"⏱️  總耗時: {end_time - start_time:.1f}秒")
     print(f"📚 術語對照表: {len(translator.term_dictionary)} 個術語")
 
+def test_ollama_stateless(model_name):
+    print("🦙 測試模式 4: 本機 Ollama 獨立請求 (並行翻譯、術語表、參考文獻標題使用的傳輸路徑)")
+    print("=" * 50)
+    llm_service = llm_services.OllamaService(model_name=model_name, verbose=True)
+    if not llm_service.check_available():
+        print(f"❌ 無法連接本機 Ollama 服務 ({llm_service.base_url})，請先啟動 ollama serve 並下載模型 {model_name}")
+        return False
+
+    reply = llm_service.send_single_request("Reply with the single word: OK", system_prompt="You are a test assistant.")
+    print(f"獨立請求回覆: {reply}")
+    if not reply:
+        print("❌ send_single_request 未取得回覆")
+        return False
+
+    chunks = llm_service.send_single_request("Reply with the single word: OK", system_prompt="You are a test assistant.", stream=True)
+    streamed = "".join(chunk for chunk in chunks or [] if chunk)
+    print(f"流式回覆: {streamed}")
+    if not streamed:
+        print("❌ send_single_request (stream=True) 未取得回覆")
+        return False
+
+    translator = Translator(instance_path=instance_path, llm_service_obj=llm_service, verbose=True)
+    translated = translator.translate_single_text(
+        text="Machine learning algorithms enable autonomous decision-making in cognitive radio networks.",
+        target_lang="en",
+        stateless=True
+    )
+    print(f"獨立請求譯文: {translated}")
+    if not translated:
+        print("❌ translate_single_text (stateless=True) 翻譯失敗")
+        return False
+    print("✅ Ollama 獨立請求測試通過")
+    return True
+
+def test_reference_fast_path(llm_service):
+    print("📚 測試模式 5: 參考文獻快速翻譯 (僅翻譯標題)")
+    print("=" * 50)
+    references = [
+        '[1] A. Vaswani, N. Shazeer, and N. Parmar, “Attention is all you need,” in Proc. NeurIPS, 2017, pp. 5998–6008.',
+        'He, K., Zhang, X., Ren, S., & Sun, J. (2016). Deep residual learning for image recognition. In Proceedings of the IEEE CVPR (pp. 770-778). doi:10.1109/CVPR.2016.90',
+        '12. Smith J, Doe A. A survey of graph neural networks. Nature Reviews. 2020;12(3):45-67. doi:10.1038/xyz',
+    ]
+    # 參考文獻區域內的條目需含 "["、doi 或網址才會被分類為參考文獻
+    content_list = [{"type": "text", "text": "References", "page_idx": 0, "text_level": 1}]
+    content_list += [{"type": "text", "text": reference, "page_idx": 0} for reference in references]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        content_list_path = os.path.join(temp_dir, "reference_test_content_list.json")
+        with open(content_list_path, 'w', encoding='utf-8') as f:
+            json.dump(content_list, f, ensure_ascii=False)
+        translator = Translator(instance_path=temp_dir, llm_service_obj=llm_service, reference_parser=ReferenceParser(), verbose=True)
+        output_path = translator.translate_content_list(content_list_path=content_list_path, target_lang="en")
+        with open(output_path, 'r', encoding='utf-8') as f:
+            translated = json.load(f)
+
+    title_only = 0
+    for item in translated[1:]:
+        metadata = item.get('translation_metadata') or {}
+        title_only += bool(metadata.get('title_only'))
+        print(f"原文: {item['text']}")
+        print(f"譯文: {item.get('text_zh')} {'(僅翻譯標題)' if metadata.get('title_only') else ''}")
+        print("-" * 30)
+    if title_only != len(references):
+        print(f"❌ 僅 {title_only}/{len(references)} 條參考文獻使用快速翻譯")
+        return False
+    print("✅ 參考文獻快速翻譯測試通過")
+    return True
+
 def main():
     parser = argparse.ArgumentParser(description="翻譯服務測試工具")
-    parser.add_argument("--mode", type=str, choices=["single", "partial", "full"], default="single", help="測試模式: single/partial/full")
+    parser.add_argument("--mode", type=str, choices=["single", "partial", "full", "ollama", "reference"], default="single", help="測試模式: single/partial/full/ollama/reference")
     parser.add_argument("--provider", type=str, default="", help="LLM 服務提供者 (ollama, google, openai)")
     parser.add_argument("--model", type=str, default="", help="LLM 模型名稱 (例如: llama2, gemini-pro, gpt-4-turbo)")
     parser.add_argument("--apikey", type=str, default="", help="LLM API 金鑰")
+    parser.add_argument("--verbose", action="store_true", help="啟用詳細日誌")
     args = parser.parse_args()
 
-    # 初始化 LLM Service (Gemini)
-    llm_service = llm_services.GoogleService(
-        model_name=args.model,
-        api_key=args.apikey,
-        verbose=True
-    )
-    # llm_service = llm_services.OllamaService(
-    #     model_name=args.model,  # 可依實際 API Key 與模型調整
-    #     api_key=args.apikey,
-    #     verbose=True
-    # )
+    if args.mode == "ollama":
+        sys.exit(0 if test_ollama_stateless(args.model or "llama3.2") else 1)
+
+    if args.provider == "ollama":
+        llm_service = llm_services.OllamaService(
+            model_name=args.model or "llama3.2",
+            verbose=True
+        )
+    else:
+        # 初始化 LLM Service (Gemini)
+        llm_service = llm_services.GoogleService(
+            model_name=args.model,
+            api_key=args.apikey,
+            verbose=True
+        )
+    if args.mode == "reference":
+        sys.exit(0 if test_reference_fast_path(llm_service) else 1)
+
     translator = Translator(instance_path=instance_path, llm_service_obj=llm_service, verbose=args.verbose)
 
     if args.mode == "single":
@@ -26,6 +26,8 @@ export declare const API_ENDPOINTS: {
     readonly FULL_PROCESS: "api/full-process-async";
     readonly GET_PROGRESS: "api/get-progress";
     readonly REMOVE_FILE: "api/remove-file";
+    readonly REQUEST_TRANSLATION_PAGES: "api/request-translation-pages";
+    readonly TRANSLATION_PAGE_STATUS: "api/translation-page-status";
 };
 /**
  * 語言對應表
@@ -30,7 +30,9 @@ exports.API_ENDPOINTS = {
     UPDATE_API_KEY: "api/update-api-key",
     FULL_PROCESS: "api/full-process-async",
     GET_PROGRESS: "api/get-progress",
-    REMOVE_FILE: "api/remove-file"
+    REMOVE_FILE: "api/remove-file",
+    REQUEST_TRANSLATION_PAGES: "api/request-translation-pages",
+    TRANSLATION_PAGE_STATUS: "api/translation-page-status"
 };
 /**
  * 語言對應表
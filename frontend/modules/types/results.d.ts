@@ -99,6 +99,7 @@ export interface GetProgressResult {
     progress: number;
     stage: "idle" | "process-pdf" | "translating-json" | "adding-to-rag";
     message: string;
+    eta_seconds?: number | null;
     error?: string | null;
     result?: Record<string, any> | null;
 }